@@ -552,6 +552,190 @@ if SERVICE_NAME == "search_service":
                 detail="Invalid token"
             )
 
+# Mock LLM Service endpoints - stands in for the Gemini generateContent API
+if SERVICE_NAME == "llm_service":
+    import asyncio
+    import json
+    import random
+    import re
+    from fastapi.responses import JSONResponse
+
+    # Latency distribution: "fixed", "uniform" or "lognormal" around the median
+    LLM_LATENCY_DISTRIBUTION = os.getenv("LLM_LATENCY_DISTRIBUTION", "lognormal")
+    LLM_LATENCY_MEDIAN_MS = float(os.getenv("LLM_LATENCY_MEDIAN_MS", "800"))
+    # Spread: sigma of the lognormal, or +/- fraction of the median for uniform
+    LLM_LATENCY_SPREAD = float(os.getenv("LLM_LATENCY_SPREAD", "0.5"))
+    # Fraction of requests answered with 429, with 500/503, or left hanging past the client timeout
+    LLM_RATE_LIMIT_RATE = float(os.getenv("LLM_RATE_LIMIT_RATE", "0"))
+    LLM_ERROR_RATE = float(os.getenv("LLM_ERROR_RATE", "0"))
+    LLM_TIMEOUT_RATE = float(os.getenv("LLM_TIMEOUT_RATE", "0"))
+    LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "120"))
+    # Fraction of successful responses cut off mid-JSON, as happens when output hits the token limit
+    LLM_MALFORMED_RATE = float(os.getenv("LLM_MALFORMED_RATE", "0"))
+    # Set for reproducible latency and error sequences
+    LLM_SEED = os.getenv("LLM_SEED")
+
+    llm_random = random.Random(int(LLM_SEED) if LLM_SEED else None)
+    llm_stats = {"requests": 0, "rate_limited": 0, "errors": 0, "timeouts": 0, "malformed": 0}
+
+    SKILL_VOCABULARY = {
+        "technical_skills": [
+            "Python", "Java", "JavaScript", "TypeScript", "C++", "C#", "Go", "SQL", "React", "Angular",
+            "Node.js", "Django", "Flask", "FastAPI", "Spring Boot", "Docker", "Kubernetes", "AWS", "Azure",
+            "MongoDB", "PostgreSQL", "MySQL", "Git", "Linux", "TensorFlow", "PyTorch", "REST"
+        ],
+        "soft_skills": [
+            "Communication", "Teamwork", "Leadership", "Problem Solving", "Time Management", "Mentoring"
+        ],
+        "languages": ["English", "Sinhala", "Tamil", "French", "German", "Spanish"]
+    }
+    MONTH = r"(?:(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+)?"
+    DATE_RANGE = re.compile(
+        r"(" + MONTH + r"(?:19|20)\d{2})\s*(?:-|–|to)\s*(" + MONTH + r"(?:19|20)\d{2}|Present|Current)",
+        re.IGNORECASE
+    )
+
+    def _latency_seconds() -> float:
+        median = LLM_LATENCY_MEDIAN_MS / 1000.0
+        if LLM_LATENCY_DISTRIBUTION == "fixed":
+            return median
+        if LLM_LATENCY_DISTRIBUTION == "uniform":
+            return max(0.0, llm_random.uniform(median * (1 - LLM_LATENCY_SPREAD), median * (1 + LLM_LATENCY_SPREAD)))
+        return llm_random.lognormvariate(0, LLM_LATENCY_SPREAD) * median
+
+    def _find_skills(text: str, names: List[str]) -> List[str]:
+        lowered = text.lower()
+        return [
+            name for name in names
+            if re.search(r"(?<![\w+#.])" + re.escape(name.lower()) + r"(?![\w+#])", lowered)
+        ]
+
+    def _entries_with_dates(lines: List[str]) -> List[Dict[str, Any]]:
+        """Lines carrying a date range, with the previous line as title and the next ones as details."""
+        entries = []
+        for i, line in enumerate(lines):
+            match = DATE_RANGE.search(line)
+            if not match:
+                continue
+            title = line[:match.start()].strip(" |,-") or (lines[i - 1] if i > 0 else "")
+            parts = [part.strip() for part in re.split(r"\s*[|,@]\s*|\s+at\s+", title) if part.strip()]
+            details = []
+            for follow in lines[i + 1:i + 6]:
+                if DATE_RANGE.search(follow):
+                    break
+                details.append(follow.lstrip("•-* "))
+            entries.append({
+                "title": parts[0] if parts else title,
+                "organization": parts[1] if len(parts) > 1 else "",
+                "dates": f"{match.group(1)} - {match.group(2)}",
+                "details": details
+            })
+        return entries
+
+    def _fake_parse(cv_text: str) -> Dict[str, Any]:
+        """Heuristic extraction that returns the structure the parser prompt asks for."""
+        lines = [line.strip() for line in cv_text.splitlines() if line.strip()]
+        email = re.search(r"[\w.+-]+@[\w-]+\.[\w.-]+", cv_text)
+        phone = re.search(r"\+?\d[\d\s()-]{7,}\d", cv_text)
+        entries = _entries_with_dates(lines)
+        education_words = ("bsc", "msc", "bachelor", "master", "degree", "diploma", "phd", "g.c.e", "university")
+        education, work_experience = [], []
+        for entry in entries:
+            if any(word in entry["title"].lower() for word in education_words):
+                education.append({
+                    "degree": entry["title"],
+                    "institution": entry["organization"] or (entry["details"][0] if entry["details"] else ""),
+                    "dates": entry["dates"],
+                    "details": ""
+                })
+            else:
+                work_experience.append({
+                    "position": entry["title"],
+                    "company": entry["organization"],
+                    "location": "",
+                    "dates": entry["dates"],
+                    "description": entry["details"]
+                })
+        return {
+            "name": lines[0] if lines else "",
+            "email": email.group(0) if email else "",
+            "phone": phone.group(0).strip() if phone else "",
+            "location": "",
+            "education": education,
+            "work_experience": work_experience,
+            "skills": {kind: _find_skills(cv_text, names) for kind, names in SKILL_VOCABULARY.items()},
+            "summary": " ".join(lines[1:3]) if len(lines) > 2 else ""
+        }
+
+    def _llm_error(code: int, message: str, status_name: str) -> JSONResponse:
+        return JSONResponse(status_code=code, content={"error": {"code": code, "message": message, "status": status_name}})
+
+    @app.get("/config")
+    async def llm_config():
+        return {
+            "latency_distribution": LLM_LATENCY_DISTRIBUTION,
+            "latency_median_ms": LLM_LATENCY_MEDIAN_MS,
+            "latency_spread": LLM_LATENCY_SPREAD,
+            "rate_limit_rate": LLM_RATE_LIMIT_RATE,
+            "error_rate": LLM_ERROR_RATE,
+            "timeout_rate": LLM_TIMEOUT_RATE,
+            "malformed_rate": LLM_MALFORMED_RATE,
+            "seed": LLM_SEED,
+            "stats": llm_stats
+        }
+
+    @app.post("/v1beta/models/{model}:generateContent")
+    async def generate_content(model: str, request_data: Dict[str, Any]):
+        llm_stats["requests"] += 1
+        prompt = "".join(
+            part.get("text", "")
+            for content in request_data.get("contents", [])
+            for part in content.get("parts", [])
+        )
+
+        roll = llm_random.random()
+        if roll < LLM_RATE_LIMIT_RATE:
+            llm_stats["rate_limited"] += 1
+            return _llm_error(429, "Resource has been exhausted (e.g. check quota).", "RESOURCE_EXHAUSTED")
+        roll -= LLM_RATE_LIMIT_RATE
+        if roll < LLM_ERROR_RATE:
+            llm_stats["errors"] += 1
+            if llm_random.random() < 0.5:
+                return _llm_error(500, "An internal error has occurred.", "INTERNAL")
+            return _llm_error(503, "The model is overloaded. Please try again later.", "UNAVAILABLE")
+        roll -= LLM_ERROR_RATE
+        if roll < LLM_TIMEOUT_RATE:
+            llm_stats["timeouts"] += 1
+            await asyncio.sleep(LLM_TIMEOUT_SECONDS)
+            return _llm_error(504, "Deadline exceeded.", "DEADLINE_EXCEEDED")
+
+        await asyncio.sleep(_latency_seconds())
+
+        # The parser puts the CV after this marker; fall back to the whole prompt
+        cv_text = prompt.split("CV text to parse:", 1)[-1]
+        text = json.dumps(_fake_parse(cv_text), indent=2)
+        if request_data.get("generationConfig", {}).get("responseMimeType") != "application/json":
+            # Without a response schema Gemini tends to wrap JSON in a code fence
+            text = "```json\n" + text + "\n```"
+        if llm_random.random() < LLM_MALFORMED_RATE:
+            llm_stats["malformed"] += 1
+            text = text[:llm_random.randint(len(text) // 3, len(text) - 1)]
+        prompt_tokens = max(1, len(prompt) // 4)
+        output_tokens = max(1, len(text) // 4)
+        return {
+            "candidates": [{
+                "content": {"parts": [{"text": text}], "role": "model"},
+                "finishReason": "STOP",
+                "index": 0
+            }],
+            "usageMetadata": {
+                "promptTokenCount": prompt_tokens,
+                "candidatesTokenCount": output_tokens,
+                "totalTokenCount": prompt_tokens + output_tokens
+            },
+            "modelVersion": model
+        }
+
 # Run the server
 if __name__ == "__main__":
     print(f"Starting {SERVICE_NAME} on port {PORT}")
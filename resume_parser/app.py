@@ -1,20 +1,35 @@
 from fastapi import FastAPI, UploadFile, File, HTTPException, Request, Form
-import PyPDF2
-import io
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse
 import os
-from pymongo import MongoClient
+from pymongo import AsyncMongoClient, MongoClient
 from bson import ObjectId
 from dotenv import load_dotenv
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Union
 from enum import Enum
 from pydantic import BaseModel
 import certifi
 import dns.resolver
 from datetime import datetime
 from pathlib import Path
+import logging
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
 
 # Import HybridCVParser instead of ImprovedResumeParser
-from hybrid_cv_parser import HybridCVParser
+from hybrid_cv_parser import HybridCVParser, PARSER_VERSION
+from parser_pool import ParserPool
+from process_pool import ParserProcessPool
+from text_extraction import PDF_MAX_BYTES, SUPPORTED_EXTENSIONS, extract_text, shutdown_pdf_workers
+from batch_ingest import BatchIngestor, build_ranking_update, build_resume_record, iter_resume_files
+from job_queue import JobStatus, ParseJobQueue, ParseWorkerPool
+from bert_backends import BERT_BACKEND, cache_namespace
+from embedding_cache import EmbeddingCache
+from gemini_client import shared_client_stats
+from metrics import observe_parse_result, render_metrics, timed_stage
+from mongo_writer import MongoWriteBehind, mongo_pool_options
+from parse_cache import ParseResultCache, hash_bytes, hash_text
+from ranking_client import RankingClient, RankingServiceError
 
 # Load environment variables
 load_dotenv()
@@ -30,13 +45,133 @@ if not mongo_uri:
 dns.resolver.default_resolver = dns.resolver.Resolver(configure=False)
 dns.resolver.default_resolver.nameservers = ['8.8.8.8']  # Use Google's DNS
 
+DATABASE_NAME = os.getenv("DATABASE_NAME", "resume_rover_db")
+
+# Synchronous client, only used by the parse cache mirror
 mongo_client = MongoClient(
     mongo_uri,
     tlsCAFile=certifi.where(),
-    serverSelectionTimeoutMS=5000
+    serverSelectionTimeoutMS=5000,
+    **mongo_pool_options()
 )
-db = mongo_client[os.getenv("DATABASE_NAME", "resume_rover_db")]
-resumes_collection = db["parsed_resumes"]
+db = mongo_client[DATABASE_NAME]
+
+def open_resumes_collection():
+    # Runs on the write buffer's event loop, which the async client binds to
+    async_client = AsyncMongoClient(
+        mongo_uri,
+        tlsCAFile=certifi.where(),
+        serverSelectionTimeoutMS=5000,
+        **mongo_pool_options()
+    )
+    return async_client[DATABASE_NAME]["parsed_resumes"]
+
+# Resume inserts and ranking updates are batched and written in the background
+resume_writer = MongoWriteBehind.from_env(open_resumes_collection)
+
+# Pooled, retrying client of the candidate ranking service
+ranking_client = RankingClient.from_env()
+# Longest a parse worker waits for the scores of the resumes it stored, so one
+# hung ranking call cannot hold the worker indefinitely
+RANKING_WAIT_SECONDS = float(os.getenv("RANKING_WAIT_SECONDS", "180"))
+
+# Number of warm parsers, i.e. how many resumes can be parsed concurrently
+PARSER_WORKERS = int(os.getenv("PARSER_WORKERS", "1"))
+# "thread" keeps parsers in this process; "process" runs them in worker processes
+PARSER_EXECUTION_MODE = os.getenv("PARSER_EXECUTION_MODE", "thread").lower()
+# Parses a worker process handles before it is replaced (process mode only)
+PARSER_MAX_TASKS_PER_CHILD = int(os.getenv("PARSER_MAX_TASKS_PER_CHILD", "200"))
+PARSER_TORCH_THREADS = int(os.getenv("PARSER_TORCH_THREADS", "1"))
+# Seconds a request waits for a free parser before giving up
+PARSER_ACQUIRE_TIMEOUT = float(os.getenv("PARSER_ACQUIRE_TIMEOUT", "60"))
+# Load spaCy and BERT while warming up; "false" defers it to the first parse
+PARSER_PRELOAD_MODELS = os.getenv("PARSER_PRELOAD_MODELS", "true").lower() == "true"
+# Durable queue of uploads waiting to be parsed
+PARSE_QUEUE_DIR = os.getenv("PARSE_QUEUE_DIR", "parse_queue")
+PARSE_JOB_LEASE_SECONDS = float(os.getenv("PARSE_JOB_LEASE_SECONDS", "600"))
+# Claims of a job before it is failed, so a job that crashes its worker is not retried forever
+PARSE_JOB_MAX_ATTEMPTS = int(os.getenv("PARSE_JOB_MAX_ATTEMPTS", "3"))
+
+# Reuse parse results for repeat uploads of the same CV
+PARSE_CACHE_ENABLED = os.getenv("PARSE_CACHE_ENABLED", "true").lower() == "true"
+PARSE_CACHE_DIR = os.getenv("PARSE_CACHE_DIR", "parse_cache")
+# Also mirror cached results to MongoDB so other instances can use them
+PARSE_CACHE_MONGO_MIRROR = os.getenv("PARSE_CACHE_MONGO_MIRROR", "false").lower() == "true"
+# Cached results hold candidates' personal data: keep them for a limited time and number
+PARSE_CACHE_MAX_ENTRIES = int(os.getenv("PARSE_CACHE_MAX_ENTRIES", "10000"))
+PARSE_CACHE_TTL_DAYS = float(os.getenv("PARSE_CACHE_TTL_DAYS", "30"))
+
+# Files parsed and inserted together by /parse/batch
+BATCH_CHUNK_SIZE = int(os.getenv("BATCH_CHUNK_SIZE", "16"))
+
+
+logger = logging.getLogger(__name__)
+
+parse_cache = ParseResultCache(
+    PARSE_CACHE_DIR,
+    # Skill classification can differ slightly between BERT backends
+    parser_version=f"{PARSER_VERSION}+{BERT_BACKEND}",
+    mirror_collection=db["parse_cache"] if PARSE_CACHE_MONGO_MIRROR else None,
+    max_entries=PARSE_CACHE_MAX_ENTRIES,
+    ttl_seconds=PARSE_CACHE_TTL_DAYS * 24 * 3600
+) if PARSE_CACHE_ENABLED else None
+
+# BERT vectors are shared by every pooled parser
+embedding_cache = EmbeddingCache.from_env(cache_namespace(BERT_BACKEND))
+
+def build_parser() -> HybridCVParser:
+    parser = HybridCVParser(api_key=os.getenv("GOOGLE_API_KEY"), embedding_cache=embedding_cache)
+    if PARSER_PRELOAD_MODELS:
+        parser.load_models()
+    return parser
+
+if PARSER_EXECUTION_MODE == "process":
+    parser_pool = ParserProcessPool(
+        size=PARSER_WORKERS,
+        max_tasks_per_child=PARSER_MAX_TASKS_PER_CHILD or None,
+        torch_threads=PARSER_TORCH_THREADS,
+        preload_models=PARSER_PRELOAD_MODELS
+    )
+else:
+    parser_pool = ParserPool(factory=build_parser, size=PARSER_WORKERS)
+
+@app.on_event("startup")
+async def startup_event():
+    # Load spaCy, BERT and Gemini once, off the event loop
+    logger.info(f"Warming up {PARSER_WORKERS} parser instance(s) in {PARSER_EXECUTION_MODE} mode")
+    parser_pool.warm_up_in_background()
+
+@app.get("/health")
+async def health_check():
+    return {"status": "healthy", "service": "resume_parser"}
+
+@app.get("/ready")
+async def readiness_check():
+    if parser_pool.is_ready:
+        return {"status": "ready", "parsers": parser_pool.size, "mode": PARSER_EXECUTION_MODE}
+    if parser_pool.error is not None:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "failed", "detail": str(parser_pool.error)}
+        )
+    return JSONResponse(status_code=503, content={"status": "warming_up"})
+
+@app.get("/stats")
+async def service_stats():
+    return {
+        # In process mode each worker keeps its own counters
+        "embedding_cache": embedding_cache.stats() if PARSER_EXECUTION_MODE != "process" else None,
+        "gemini": shared_client_stats() if PARSER_EXECUTION_MODE != "process" else None,
+        "parse_cache": await run_in_threadpool(parse_cache.stats) if parse_cache is not None else None,
+        "parse_jobs": await run_in_threadpool(job_queue.counts),
+        "mongo_writes": resume_writer.stats(),
+        "ranking": ranking_client.stats()
+    }
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    # Prometheus text exposition format
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
 
 class StatusEnum(str, Enum):
     SAVED = "saved"
@@ -50,17 +185,6 @@ class ResumeData(BaseModel):
     ranking_score: Optional[int] = None
     status: StatusEnum = StatusEnum.SAVED
 
-# Extract text from PDF
-def extract_text_from_pdf(pdf_file: bytes) -> str:
-    try:
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_file))
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text()
-        return text
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Error processing PDF: {str(e)}")
-
 def convert_objectid_to_str(data: Dict[str, Any]) -> Dict[str, Any]:
     if isinstance(data, dict):
         return {k: convert_objectid_to_str(v) for k, v in data.items()}
@@ -70,112 +194,196 @@ def convert_objectid_to_str(data: Dict[str, Any]) -> Dict[str, Any]:
         return str(data)
     return data
 
-def extract_text_from_word(file_content: bytes) -> str:
+def update_response(resume_id: Union[str, ObjectId], ranking_score: int) -> None:
+    # Update the application with the ranking score; written in the background
+    resume_writer.update_one(*build_ranking_update(resume_id, ranking_score))
+
+def parse_with_pool(text: str) -> Dict[str, Any]:
     try:
-        from docx import Document
-        document = Document(io.BytesIO(file_content))
-        text = []
-        for para in document.paragraphs:
-            text.append(para.text)
-        return "\n".join(text)
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Error processing Word file: {str(e)}")
+        with parser_pool.acquire(timeout=PARSER_ACQUIRE_TIMEOUT) as parser:
+            return parser.parse(text)  # Note: The method is parse() not parse_resume()
+    except TimeoutError:
+        raise RuntimeError("All parsers are busy, try again later")
 
-def update_response(resume_id: str, ranking_score: int) -> None:
-    # Update the application with the ranking score
-    resumes_collection.update_one(
-        {"resume_id": resume_id},
-        {
-            "$set": {
-                "status": "in progress",
-                "notified": False,
-                "ranking_score": ranking_score
-            }
-        }
+# spaCy, BERT and PDF extraction are CPU-bound; in process mode they leave this process
+def extract_upload_text(contents: bytes, file_extension: str) -> str:
+    with timed_stage("text_extraction"):
+        if isinstance(parser_pool, ParserProcessPool):
+            return parser_pool.extract_text(contents, file_extension)
+        return extract_text(contents, file_extension)
+
+def parse_text(text: str) -> Dict[str, Any]:
+    if isinstance(parser_pool, ParserProcessPool):
+        parsed_data = parser_pool.parse(text)
+    else:
+        parsed_data = parse_with_pool(text)
+    # Timings travel in the result, so this also works for worker processes
+    observe_parse_result(parsed_data)
+    return parsed_data
+
+def parse_upload_cached(contents: bytes, file_extension: str) -> Dict[str, Any]:
+    """Parse an upload, reusing an earlier result for identical bytes or text."""
+    if parse_cache is None:
+        return parse_text(extract_upload_text(contents, file_extension))
+    
+    file_hash = hash_bytes(contents)
+    parsed_data = parse_cache.get(file_hash=file_hash)
+    if parsed_data is not None:
+        logger.info("Reusing cached parse result for identical file")
+        return parsed_data
+    
+    text = extract_upload_text(contents, file_extension)
+    text_hash = hash_text(text)
+    parsed_data = parse_cache.get(text_hash=text_hash)
+    if parsed_data is not None:
+        logger.info("Reusing cached parse result for identical text")
+        # Remember this file too so the next upload skips extraction
+        parse_cache.put(parsed_data, file_hash=file_hash)
+        return parsed_data
+    
+    parsed_data = parse_text(text)
+    parse_cache.put(parsed_data, file_hash=file_hash, text_hash=text_hash)
+    return parsed_data
+
+def parse_texts(cv_texts: List[str]) -> List[Union[Dict[str, Any], Exception]]:
+    if isinstance(parser_pool, ParserProcessPool):
+        results = parser_pool.parse_batch(cv_texts)
+    else:
+        with parser_pool.acquire(timeout=PARSER_ACQUIRE_TIMEOUT) as parser:
+            results = parser.parse_batch(cv_texts)
+    for result in results:
+        if not isinstance(result, Exception):
+            observe_parse_result(result)
+    return results
+
+def rank_resumes(resume_ids: List[ObjectId]) -> List[Optional[str]]:
+    """
+    Ask the ranking service to score stored resumes and record their scores.
+    Returns a warning per resume that could not be ranked, else None.
+    """
+    # Queued together so the client can batch them when batching is enabled
+    futures = ranking_client.rank_many(resume_ids)
+    deadline = time.monotonic() + RANKING_WAIT_SECONDS
+    warnings = []
+    for resume_id, future in zip(resume_ids, futures):
+        try:
+            update_response(resume_id, future.result(timeout=max(0.0, deadline - time.monotonic())))
+            warnings.append(None)
+        except RankingServiceError as e:
+            logger.error(f"Request to ranking service failed: {str(e)}")
+            warnings.append("Failed to connect to the ranking service")
+        except FutureTimeoutError:
+            logger.error(f"Ranking service did not score resume {resume_id} within {RANKING_WAIT_SECONDS}s")
+            warnings.append("The ranking service timed out")
+    return warnings
+
+def process_parse_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Run the full pipeline for one queued upload: extract, parse, store, rank."""
+    payload = job["payload"]
+    if payload.get("kind") == "batch":
+        return process_batch_job(job)
+    
+    contents = job_queue.read_data(job)
+    parsed_data = parse_upload_cached(contents, payload["file_extension"])
+    
+    # Create complete record
+    resume_record = build_resume_record(parsed_data, payload["job_id"], payload["filename"])
+
+    # Save to database; the ranking service reads it back, so wait until it is stored
+    with timed_stage("db_write"):
+        resume_id = resume_writer.insert(resume_record).result()
+    job_result = {"resume_id": str(resume_id)}
+
+    warning = rank_resumes([resume_id])[0]
+    if warning:
+        job_result["warning"] = warning
+
+    return job_result
+
+def process_batch_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Ingest every CV of an uploaded ZIP archive, reporting progress on the job."""
+    payload = job["payload"]
+
+    ingestor = BatchIngestor(
+        parse_texts,
+        resume_writer,
+        chunk_size=BATCH_CHUNK_SIZE,
+        cache=parse_cache,
+        extract_text=extract_upload_text,
+        on_progress=lambda report: job_queue.update_progress(job["id"], report),
+        after_insert=rank_resumes
     )
+    return ingestor.ingest(iter_resume_files(job["spool_path"]), payload["job_id"])
+
+job_queue = ParseJobQueue(PARSE_QUEUE_DIR, lease_seconds=PARSE_JOB_LEASE_SECONDS,
+                          max_attempts=PARSE_JOB_MAX_ATTEMPTS)
+parse_workers = ParseWorkerPool(
+    job_queue,
+    process_parse_job,
+    workers=PARSER_WORKERS,
+    ready=lambda: parser_pool.is_ready
+)
+
+@app.on_event("startup")
+async def start_parse_workers():
+    parse_workers.start()
 
-@app.post("/parse")
+@app.on_event("shutdown")
+async def stop_parse_workers():
+    parse_workers.stop(timeout=5)
+    ranking_client.close()
+    resume_writer.close()
+    if isinstance(parser_pool, ParserProcessPool):
+        parser_pool.shutdown()
+    shutdown_pdf_workers()
+
+@app.post("/parse", status_code=202)
 async def parse_resume_endpoint(
     file: UploadFile = File(...),
     job_id: str = Form(...)
 ):
     try:
-        # Create all necessary data internally
-        resume_data = {
-            "job_id": job_id,
-            "is_verified": False,  # Default value
-            "status": "saved",     # Default status
-            "ranking_score": None
-        }
-
         # Validate file extension
         file_extension = Path(file.filename).suffix.lower()
         if not file_extension:
             raise HTTPException(status_code=400, detail="File has no extension")
+        if file_extension not in SUPPORTED_EXTENSIONS:
+            raise HTTPException(
+                status_code=400, 
+                detail=f"Unsupported file format: {file_extension}"
+            )
             
         # Process file
         contents = await file.read()
         if not contents:
             raise HTTPException(status_code=400, detail="File is empty")
-        
-        # Extract text based on file type
-        if file_extension == '.pdf':
-            text = extract_text_from_pdf(contents)
-        elif file_extension in ['.docx', '.doc']:
-            text = extract_text_from_word(contents)
-        elif file_extension == '.txt':
-            text = contents.decode('utf-8')
-        else:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Unsupported file format: {file_extension}"
-            )
+        if file_extension == ".pdf" and len(contents) > PDF_MAX_BYTES:
+            raise HTTPException(status_code=413, detail=f"PDF is larger than {PDF_MAX_BYTES} bytes")
         
         # Get API key from environment
         api_key = os.getenv("GOOGLE_API_KEY")
         if not api_key:
             raise HTTPException(status_code=500, detail="GOOGLE_API_KEY environment variable is not set")
         
-        # Use HybridCVParser instead of ImprovedResumeParser
-        parser = HybridCVParser(api_key=api_key)
-        parsed_data = parser.parse(text)  # Note: The method is parse() not parse_resume()
+        if parser_pool.error is not None:
+            raise HTTPException(status_code=503, detail=f"Parser models failed to load: {parser_pool.error}")
         
-        # Create complete record
-        resume_record = {
-            **resume_data,
-            **parsed_data,
-            "original_filename": file.filename,
-            "upload_date": datetime.now()
-        }
-
-        # Save to database
-        result = await resumes_collection.insert_one(resume_record)
-
-        try:
-            import requests
-
-            ranking_score = requests.post(
-                "https://aicandidaterankingcs3023.azurewebsites.net/api/ranking",
-                json={
-                    "resumeID": result.inserted_id
-                }
-            )
-
-            update_response(result.inserted_id, ranking_score.json().get("ranking_score"))
-            
-        except requests.exceptions.RequestException as e:
-            logging.error(f"Request to ranking service failed: {str(e)}")
-            return func.HttpResponse(
-                json.dumps({"error": "Failed to connect to the ranking service"}),
-                mimetype="application/json",
-                status_code=500
-            )
-
+        # Hand the upload to the background workers
+        parse_job_id = await run_in_threadpool(
+            job_queue.enqueue,
+            {
+                "job_id": job_id,
+                "filename": file.filename,
+                "file_extension": file_extension
+            },
+            contents
+        )
         
         return {
             "success": True,
-            "message": "Resume processed successfully",
-            "resume_id": str(result.inserted_id)
+            "message": "Resume queued for processing",
+            "parse_job_id": parse_job_id,
+            "status": JobStatus.QUEUED.value
         }
         
     except HTTPException:
@@ -186,6 +394,52 @@ async def parse_resume_endpoint(
             status_code=500,
             detail=f"Processing failed: {str(e)}"
         )
+
+@app.post("/parse/batch", status_code=202)
+async def parse_batch_endpoint(
+    file: UploadFile = File(...),
+    job_id: str = Form(...)
+):
+    if Path(file.filename).suffix.lower() != ".zip":
+        raise HTTPException(status_code=400, detail="Batch uploads must be a .zip archive")
+    if parser_pool.error is not None:
+        raise HTTPException(status_code=503, detail=f"Parser models failed to load: {parser_pool.error}")
+    
+    # Stream the archive straight from the upload spool into the queue spool
+    parse_job_id = await run_in_threadpool(
+        job_queue.enqueue,
+        {
+            "kind": "batch",
+            "job_id": job_id,
+            "filename": file.filename
+        },
+        file.file
+    )
+    
+    return {
+        "success": True,
+        "message": "Resume archive queued for processing",
+        "parse_job_id": parse_job_id,
+        "status": JobStatus.QUEUED.value
+    }
+
+@app.get("/status/{parse_job_id}")
+async def parse_job_status(parse_job_id: str):
+    job = await run_in_threadpool(job_queue.get, parse_job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Parse job not found")
+    
+    response = {
+        "parse_job_id": job["id"],
+        "status": job["status"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"]
+    }
+    if job["result"]:
+        response.update(job["result"])
+    if job["error"]:
+        response["error"] = job["error"]
+    return response
     
 if __name__ == "__main__":
     import uvicorn
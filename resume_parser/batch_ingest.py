@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Bulk resume ingestion from a ZIP archive or a directory of CVs.
+
+Files are streamed through text extraction, parsed in chunks with
+HybridCVParser.parse_batch and written to MongoDB with one insert_many per
+chunk. A file that fails is reported and skipped; it never aborts the batch.
+
+Usage:
+    python batch_ingest.py campus_drive.zip --job-id <job id>
+    python batch_ingest.py ./cvs/ --job-id <job id> --chunk-size 32
+"""
+import argparse
+import logging
+import os
+import time
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from bson import ObjectId
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from metrics import observe_stage, timed_stage
+from parse_cache import ParseResultCache, hash_bytes, hash_text
+from text_extraction import SUPPORTED_EXTENSIONS, TextExtractionError, extract_text
+
+logger = logging.getLogger(__name__)
+
+# Files larger than this inside an archive are rejected (protects against zip bombs)
+MAX_FILE_BYTES = int(os.getenv("BATCH_MAX_FILE_BYTES", str(10 * 1024 * 1024)))
+MAX_FILES = int(os.getenv("BATCH_MAX_FILES", "1000"))
+
+ResumeFile = Tuple[str, Union[bytes, Exception]]
+
+
+def extract_resume_text(contents: bytes, file_extension: str) -> str:
+    """Extract the text of a CV in this process, recording the text_extraction stage."""
+    with timed_stage("text_extraction"):
+        return extract_text(contents, file_extension)
+
+
+def build_resume_record(parsed_data: Dict[str, Any], job_id: str, filename: str) -> Dict[str, Any]:
+    """Create the document stored in parsed_resumes for one parsed CV."""
+    return {
+        "job_id": job_id,
+        "is_verified": False,  # Default value
+        "status": "saved",     # Default status
+        "ranking_score": None,
+        **parsed_data,
+        "original_filename": filename,
+        "upload_date": datetime.now()
+    }
+
+
+def build_ranking_update(resume_id: Any, ranking_score: Any) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Filter and update that store the ranking score of a resume created with
+    build_resume_record. Resumes are keyed by their `_id`; the ranking service
+    knows them by its string form.
+    """
+    return (
+        {"_id": resume_id if isinstance(resume_id, ObjectId) else ObjectId(resume_id)},
+        {
+            "$set": {
+                "status": "in progress",
+                "notified": False,
+                "ranking_score": ranking_score
+            }
+        }
+    )
+
+
+def _check_file(name: str, size: int) -> Optional[Exception]:
+    extension = Path(name).suffix.lower()
+    if extension not in SUPPORTED_EXTENSIONS:
+        return TextExtractionError(f"Unsupported file format: {extension or 'none'}")
+    if size > MAX_FILE_BYTES:
+        return TextExtractionError(f"File is larger than {MAX_FILE_BYTES} bytes")
+    if size == 0:
+        return TextExtractionError("File is empty")
+    return None
+
+
+def _is_hidden(name: str) -> bool:
+    return any(part.startswith(".") or part == "__MACOSX" for part in Path(name).parts)
+
+
+def iter_resume_files(source: str, max_files: int = MAX_FILES) -> Iterator[ResumeFile]:
+    """
+    Yield (name, contents) for every CV in a ZIP archive or directory.
+
+    Files are read one at a time. Rejected files are yielded with the
+    exception as contents so they show up in the batch report.
+
+    Args:
+        source: Path to a .zip file or a directory
+        max_files: Stop after this many files
+
+    Raises:
+        ValueError: If source is neither a ZIP archive nor a directory
+    """
+    count = 0
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for filename in sorted(files):
+                path = os.path.join(root, filename)
+                name = os.path.relpath(path, source)
+                if _is_hidden(name):
+                    continue
+                if count >= max_files:
+                    logger.warning(f"Stopping after {max_files} files")
+                    return
+                count += 1
+                error = _check_file(name, os.path.getsize(path))
+                if error is not None:
+                    yield name, error
+                    continue
+                with open(path, "rb") as f:
+                    yield name, f.read()
+    elif zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for info in archive.infolist():
+                if info.is_dir() or _is_hidden(info.filename):
+                    continue
+                if count >= max_files:
+                    logger.warning(f"Stopping after {max_files} files")
+                    return
+                count += 1
+                error = _check_file(info.filename, info.file_size)
+                if error is not None:
+                    yield info.filename, error
+                    continue
+                yield info.filename, archive.read(info)
+    else:
+        raise ValueError(f"{source} is neither a ZIP archive nor a directory")
+
+
+class BatchIngestor:
+    """Streams resume files through extraction, batched parsing and chunked inserts."""
+
+    def __init__(self, parse_batch: Callable[[List[str]], List[Union[Dict[str, Any], Exception]]], collection,
+                 chunk_size: int = 16, on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 after_insert: Optional[Callable[[List[Any]], None]] = None,
+                 cache: Optional[ParseResultCache] = None,
+                 extract_text: Callable[[bytes, str], str] = extract_resume_text):
+        """
+        Initialize the ingestor.
+
+        Args:
+            parse_batch: Parses a list of CV texts, e.g. HybridCVParser.parse_batch.
+            collection: MongoDB collection to insert parsed resumes into, or anything
+                with a compatible `insert_many` such as MongoWriteBehind.
+            chunk_size: Files parsed and inserted together.
+            on_progress: Called with the running report after every chunk.
+            after_insert: Called with the inserted ids after every chunk, e.g. to rank them.
+            cache: Optional parse result cache; duplicate CVs are not parsed again.
+            extract_text: Extracts the text of a file from its bytes and extension and
+                records the text_extraction stage, e.g. app.extract_upload_text, which
+                extracts in the worker processes of the process execution mode.
+        """
+        self.parse_batch = parse_batch
+        self.collection = collection
+        self.chunk_size = chunk_size
+        self.on_progress = on_progress
+        self.after_insert = after_insert
+        self.cache = cache
+        self.extract_text = extract_text
+
+    def ingest(self, files: Iterable[ResumeFile], job_id: str) -> Dict[str, Any]:
+        """
+        Ingest every file for the given job posting.
+
+        Returns:
+            Report with processed/succeeded/failed counts, inserted resume ids
+            and a per-file error list
+        """
+        report = {"processed": 0, "succeeded": 0, "failed": 0, "resume_ids": [], "errors": []}
+        chunk: List[ResumeFile] = []
+        for resume_file in files:
+            chunk.append(resume_file)
+            if len(chunk) >= self.chunk_size:
+                self._ingest_chunk(chunk, job_id, report)
+                chunk = []
+        if chunk:
+            self._ingest_chunk(chunk, job_id, report)
+        return report
+
+    def _ingest_chunk(self, chunk: List[ResumeFile], job_id: str, report: Dict[str, Any]) -> None:
+        def record_error(name: str, error: Any) -> None:
+            report["failed"] += 1
+            report["errors"].append({"file": name, "error": str(error)})
+            logger.warning(f"Skipping {name}: {error}")
+
+        records = []
+        record_names = []
+
+        def add_record(name: str, parsed_data: Dict[str, Any]) -> None:
+            records.append(build_resume_record(parsed_data, job_id, Path(name).name))
+            record_names.append(name)
+
+        names, texts, hashes = [], [], []
+        for name, contents in chunk:
+            if isinstance(contents, Exception):
+                record_error(name, contents)
+                continue
+
+            file_hash = hash_bytes(contents) if self.cache is not None else None
+            cached = self.cache.get(file_hash=file_hash) if self.cache is not None else None
+            if cached is not None:
+                add_record(name, cached)
+                continue
+
+            try:
+                text = self.extract_text(contents, Path(name).suffix.lower())
+            except Exception as e:
+                # Besides unreadable files, e.g. a worker process that died while extracting
+                record_error(name, e)
+                continue
+
+            text_hash = hash_text(text) if self.cache is not None else None
+            cached = self.cache.get(text_hash=text_hash) if self.cache is not None else None
+            if cached is not None:
+                self.cache.put(cached, file_hash=file_hash)
+                add_record(name, cached)
+                continue
+
+            names.append(name)
+            texts.append(text)
+            hashes.append((file_hash, text_hash))
+
+        if texts:
+            try:
+                results = self.parse_batch(texts)
+            except Exception as e:
+                # parse_batch reports failing CVs in its results; anything it raises,
+                # e.g. from a crashed worker process, fails this chunk but not the batch
+                logger.error(f"Error parsing a chunk of {len(texts)} files: {e}")
+                results = [e] * len(texts)
+            for name, (file_hash, text_hash), result in zip(names, hashes, results):
+                if isinstance(result, Exception):
+                    record_error(name, result)
+                    continue
+                if self.cache is not None:
+                    self.cache.put(result, file_hash=file_hash, text_hash=text_hash)
+                add_record(name, result)
+
+        if records:
+            start = time.perf_counter()
+            failed: Dict[int, str] = {}
+            try:
+                self.collection.insert_many(records, ordered=False)
+            except BulkWriteError as e:
+                # Unordered: the documents without a write error are stored
+                failed = {error["index"]: error.get("errmsg", "write failed")
+                          for error in e.details.get("writeErrors", [])}
+                if not failed:
+                    # e.g. a write concern error: no document is known to be stored
+                    failed = {index: str(e) for index in range(len(records))}
+            except PyMongoError as e:
+                failed = {index: str(e) for index in range(len(records))}
+            observe_stage("db_write", (time.perf_counter() - start) / len(records), count=len(records))
+
+            for index, name in enumerate(record_names):
+                if index in failed:
+                    record_error(name, f"Database write failed: {failed[index]}")
+            # insert_many sets the _id of every document it is given
+            inserted_ids = [record["_id"] for index, record in enumerate(records) if index not in failed]
+            report["succeeded"] += len(inserted_ids)
+            report["resume_ids"].extend(str(inserted_id) for inserted_id in inserted_ids)
+            if inserted_ids and self.after_insert is not None:
+                self.after_insert(inserted_ids)
+
+        report["processed"] += len(chunk)
+        logger.info(f"Batch progress: {report['processed']} processed, {report['failed']} failed")
+        if self.on_progress is not None:
+            self.on_progress(report)
+
+
+def main():
+    import certifi
+    from dotenv import load_dotenv
+    from pymongo import MongoClient
+    from hybrid_cv_parser import HybridCVParser
+
+    load_dotenv()
+
+    arg_parser = argparse.ArgumentParser(description="Bulk-ingest a ZIP archive or directory of resumes")
+    arg_parser.add_argument("source", help="ZIP archive or directory containing CVs")
+    arg_parser.add_argument("--job-id", required=True, help="Job posting the resumes apply to")
+    arg_parser.add_argument("--chunk-size", type=int, default=16, help="Files parsed and inserted together")
+    args = arg_parser.parse_args()
+
+    mongo_uri = os.getenv("MONGO_URI")
+    if not mongo_uri:
+        raise SystemExit("Error: MONGO_URI environment variable is not set")
+
+    mongo_client = MongoClient(mongo_uri, tlsCAFile=certifi.where(), serverSelectionTimeoutMS=5000)
+    collection = mongo_client[os.getenv("DATABASE_NAME", "resume_rover_db")]["parsed_resumes"]
+    cv_parser = HybridCVParser(api_key=os.getenv("GOOGLE_API_KEY"))
+
+    def print_progress(report: Dict[str, Any]) -> None:
+        print(f"Processed {report['processed']} files: {report['succeeded']} stored, {report['failed']} failed")
+
+    ingestor = BatchIngestor(cv_parser.parse_batch, collection, chunk_size=args.chunk_size, on_progress=print_progress)
+    report = ingestor.ingest(iter_resume_files(args.source), args.job_id)
+
+    print(f"\nIngested {report['succeeded']} of {report['processed']} files")
+    for error in report["errors"]:
+        print(f"- {error['file']}: {error['error']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Benchmark text extraction and both resume parsers on a synthetic CV corpus.
+
+Runs three phases, each in a fresh process so its peak RSS is its own:
+    extraction   extract_text() on the TXT, DOCX and PDF rendering of every CV
+    rule_based   ImprovedResumeParser.parse_resume()
+    hybrid       HybridCVParser.parse() against a local LLM stub, per pipeline stage
+
+The stub answers each prompt with the data the CV was generated from, after
+--llm-latency-ms. Use --llm-url to call a Gemini-compatible server such as
+the llm_service mock instead. Results are written as JSON with sorted keys,
+so two runs can be diffed.
+
+Usage:
+    python benchmarks/bench_parsers.py [--resumes 27] [--phases extraction,rule_based,hybrid]
+                                       [--spacy-model en_core_web_sm] [--output results.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import resource
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+
+from synthetic_cv import FORMATS, make_corpus
+
+PHASES = ("extraction", "rule_based", "hybrid")
+EMAIL = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of this process in MB."""
+    # VmHWM starts afresh at exec; ru_maxrss would include the parent's peak
+    try:
+        with open("/proc/self/status", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss is in KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def summarize(samples: Dict[str, List[float]]) -> Dict[str, Dict[str, float]]:
+    """Throughput and latency percentiles of each stage's samples, given in seconds."""
+    summary = {}
+    for stage, seconds in samples.items():
+        latencies_ms = np.asarray(seconds) * 1000
+        p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99])
+        summary[stage] = {
+            "count": len(seconds),
+            "per_second": round(len(seconds) / sum(seconds), 2) if sum(seconds) else None,
+            "mean_ms": round(float(latencies_ms.mean()), 3),
+            "p50_ms": round(float(p50), 3),
+            "p95_ms": round(float(p95), 3),
+            "p99_ms": round(float(p99), 3),
+        }
+    return summary
+
+
+class StubGenerativeModel:
+    """
+    Local stand-in for `genai.GenerativeModel`: answers with the structured
+    data of the CV whose email appears in the prompt.
+    """
+
+    model_name = "benchmark-stub"
+
+    def __init__(self, records_by_email: Dict[str, Dict[str, Any]], latency: float = 0.0):
+        self.records_by_email = records_by_email
+        self.latency = latency
+
+    async def generate_content_async(self, prompt: str, **kwargs) -> Any:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        record = next((self.records_by_email[email] for email in EMAIL.findall(prompt)
+                       if email in self.records_by_email), {})
+        text = json.dumps(record)
+        return SimpleNamespace(
+            text=text,
+            usage_metadata=SimpleNamespace(prompt_token_count=len(prompt) // 4, candidates_token_count=len(text) // 4)
+        )
+
+
+def run_extraction(corpus: List[Dict[str, Any]], args) -> Dict[str, Any]:
+    from text_extraction import extract_text
+
+    samples: Dict[str, List[float]] = {f"text_extraction.{fmt}": [] for fmt in args.formats}
+    for fmt in args.formats:
+        extract_text(corpus[0]["files"][fmt], f".{fmt}", pdf_workers=1)  # Warm-up
+        for cv in corpus:
+            start = time.perf_counter()
+            extract_text(cv["files"][fmt], f".{fmt}", pdf_workers=1)
+            samples[f"text_extraction.{fmt}"].append(time.perf_counter() - start)
+    return {"stages": summarize(samples)}
+
+
+def run_rule_based(corpus: List[Dict[str, Any]], args) -> Dict[str, Any]:
+    start = time.perf_counter()
+    from main import ImprovedResumeParser
+
+    parser = ImprovedResumeParser(model_name=args.spacy_model)
+    parser.parse_resume(corpus[0]["text"])  # Warm-up
+    load_seconds = time.perf_counter() - start
+
+    samples: Dict[str, List[float]] = {"rule_based.parse_resume": []}
+    for cv in corpus:
+        start = time.perf_counter()
+        parser.parse_resume(cv["text"])
+        samples["rule_based.parse_resume"].append(time.perf_counter() - start)
+    return {"load_seconds": round(load_seconds, 2), "stages": summarize(samples)}
+
+
+def run_hybrid(corpus: List[Dict[str, Any]], args) -> Dict[str, Any]:
+    start = time.perf_counter()
+    from embedding_cache import EmbeddingCache
+    from gemini_client import GeminiClient, RestGenerativeModel
+    from hybrid_cv_parser import HybridCVParser
+
+    # In-memory embedding cache only, so a leftover disk cache cannot skew runs
+    parser = HybridCVParser(api_key=os.getenv("GOOGLE_API_KEY", "benchmark"), spacy_model=args.spacy_model,
+                            embedding_cache=EmbeddingCache())
+    if args.llm_url:
+        model = RestGenerativeModel("gemini-2.0-flash", args.llm_url, api_key=parser.api_key)
+    else:
+        model = StubGenerativeModel({cv["record"]["email"]: cv["record"] for cv in corpus},
+                                    latency=args.llm_latency_ms / 1000)
+    # No rate limit: the benchmark measures the parser, not the quota
+    parser.gemini_model = model
+    parser.gemini_client = GeminiClient(model, requests_per_minute=1e9)
+    parser.load_models()
+    parser.parse(corpus[0]["text"])  # Warm-up
+    load_seconds = time.perf_counter() - start
+
+    samples: Dict[str, List[float]] = {"hybrid.total": []}
+    for cv in corpus:
+        start = time.perf_counter()
+        result = parser.parse(cv["text"])
+        samples["hybrid.total"].append(time.perf_counter() - start)
+        for stage, milliseconds in result["metadata"]["stage_timings_ms"].items():
+            samples.setdefault(f"hybrid.{stage}", []).append(milliseconds / 1000)
+    parser.gemini_client.close()
+    return {"load_seconds": round(load_seconds, 2), "stages": summarize(samples)}
+
+
+PHASE_RUNNERS = {"extraction": run_extraction, "rule_based": run_rule_based, "hybrid": run_hybrid}
+
+
+def run_phase(phase: str, args) -> Dict[str, Any]:
+    corpus = make_corpus(args.resumes, seed=args.seed, formats=args.formats)
+    start = time.perf_counter()
+    result = PHASE_RUNNERS[phase](corpus, args)
+    result["wall_seconds"] = round(time.perf_counter() - start, 2)
+    result["peak_rss_mb"] = round(peak_rss_mb(), 1)
+    return result
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        return ""
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--resumes", type=int, default=27, help="Corpus size; 9 covers every layout and length")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--phases", default=",".join(PHASES))
+    arg_parser.add_argument("--formats", default=",".join(FORMATS))
+    arg_parser.add_argument("--spacy-model", default="en_core_web_sm")
+    arg_parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="Simulated latency of the LLM stub")
+    arg_parser.add_argument("--llm-url", help="Gemini-compatible endpoint to use instead of the stub")
+    arg_parser.add_argument("--output", help="Write the JSON results to this file as well")
+    arg_parser.add_argument("--phase", choices=PHASES, help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+    args.formats = [fmt for fmt in args.formats.split(",") if fmt]
+
+    if args.phase:
+        print(json.dumps(run_phase(args.phase, args)))
+        return
+
+    forwarded = [
+        "--resumes", str(args.resumes), "--seed", str(args.seed), "--formats", ",".join(args.formats),
+        "--spacy-model", args.spacy_model, "--llm-latency-ms", str(args.llm_latency_ms),
+    ] + (["--llm-url", args.llm_url] if args.llm_url else [])
+    phases = {}
+    for phase in [phase for phase in args.phases.split(",") if phase]:
+        completed = subprocess.run([sys.executable, __file__, "--phase", phase] + forwarded,
+                                   capture_output=True, text=True)
+        if completed.returncode != 0:
+            print(f"{phase} phase failed:\n{completed.stderr[-2000:]}", file=sys.stderr)
+            phases[phase] = {"error": completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else ""}
+            continue
+        phases[phase] = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    report = {
+        "revision": git_revision(),
+        "config": {
+            "resumes": args.resumes, "seed": args.seed, "formats": args.formats, "spacy_model": args.spacy_model,
+            "llm": args.llm_url or f"stub ({args.llm_latency_ms:g} ms)",
+        },
+        "phases": phases,
+    }
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+
+    print(f"{'stage':<28} {'n':>5} {'per s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}", file=sys.stderr)
+    for phase, result in phases.items():
+        for stage, stats in sorted(result.get("stages", {}).items()):
+            print(f"{stage:<28} {stats['count']:>5} {stats['per_second'] or 0:>9.1f} {stats['p50_ms']:>9.2f} "
+                  f"{stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f}", file=sys.stderr)
+        if "peak_rss_mb" in result:
+            print(f"{phase + ' peak RSS MB':<28} {result['peak_rss_mb']:>5.0f}", file=sys.stderr)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
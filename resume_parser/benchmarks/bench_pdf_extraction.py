@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Compare the streaming, page-parallel PDF extractor with the original one.
+
+Usage:
+    python benchmarks/bench_pdf_extraction.py [--repeat 5] [--workers 4]
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import PyPDF2
+
+from synthetic_pdf import make_pdf
+from text_extraction import extract_text_from_pdf, shutdown_pdf_workers
+
+PAGE_COUNTS = [1, 5, 50]
+LINES_PER_PAGE = 55
+
+
+def original_extract_text_from_pdf(pdf_file: bytes) -> str:
+    """The extractor as it was before: whole upload in memory, string += per page."""
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_file))
+    text = ""
+    for page in pdf_reader.pages:
+        text += page.extract_text()
+    return text
+
+
+def build_cv(page_count: int) -> bytes:
+    pages = []
+    for p in range(page_count):
+        pages.append([
+            f"Page {p + 1} - Senior Software Engineer at Example Corp (2019 - 2023): "
+            f"built Python services, line {i}"
+            for i in range(LINES_PER_PAGE)
+        ])
+    return make_pdf(pages)
+
+
+def time_it(func, pdf: bytes, repeat: int) -> float:
+    func(pdf)  # Warm-up, also starts worker processes
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(pdf)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1))
+    args = arg_parser.parse_args()
+
+    candidates = [
+        ("original", original_extract_text_from_pdf),
+        ("inline", lambda pdf: extract_text_from_pdf(pdf, workers=1)),
+        (f"parallel x{args.workers}", lambda pdf: extract_text_from_pdf(pdf, workers=args.workers)),
+    ]
+
+    print(f"{'pages':>5} {'size KB':>8} " + " ".join(f"{name:>16}" for name, _ in candidates) + "   (pages/s)")
+    for page_count in PAGE_COUNTS:
+        pdf = build_cv(page_count)
+        assert extract_text_from_pdf(pdf, workers=args.workers) == original_extract_text_from_pdf(pdf)
+        rates = [page_count / time_it(func, pdf, args.repeat) for _, func in candidates]
+        print(f"{page_count:>5} {len(pdf) / 1024:>8.1f} " + " ".join(f"{rate:>16.1f}" for rate in rates))
+
+    shutdown_pdf_workers()
+
+
+if __name__ == "__main__":
+    main()
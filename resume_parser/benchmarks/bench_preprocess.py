@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Compare the precompiled ImprovedResumeParser._preprocess_text with the original
+chain of substitutions.
+
+Usage:
+    python benchmarks/bench_preprocess.py [--repeat 20]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from main import ImprovedResumeParser
+from synthetic_cv import LAYOUTS, make_record, render_lines
+
+COPIES = [1, 4, 16]
+
+
+def original_preprocess_text(parser, text):
+    """The preprocessing as it was before: one re.sub per header, then one per rule."""
+    text = re.sub(r'([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,})(Phone|Tel|Mobile|Contact|Cell)', r'\1\n\2', text)
+    for headers in parser.section_headers.values():
+        for header in headers:
+            pattern = r'(?<!\n)(' + re.escape(header) + r')(?:[\s:]*)(?:\n|$)'
+            text = re.sub(pattern, r'\n\1\n', text, flags=re.IGNORECASE)
+    text = re.sub(r'([a-z])([A-Z])', r'\1 \2', text)
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'\n+', '\n', text)
+    text = re.sub(r'([.:])([A-Z])', r'\1\n\2', text)
+    text = re.sub(r'(\S)(\d{4}\s*[-–—]\s*(?:\d{4}|Present|Current))', r'\1\n\2', text)
+    text = ''.join(ch for ch in text if ch not in {'​', '﻿', '‎'})
+    text = re.sub(r'[–—]', '-', text)
+    return text.strip()
+
+
+def time_it(func, text: str, repeat: int) -> float:
+    func(text)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(text)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--repeat", type=int, default=20)
+    args = arg_parser.parse_args()
+
+    # Only the section tables are needed, not the spaCy model
+    parser = ImprovedResumeParser.__new__(ImprovedResumeParser)
+    parser._initialize_section_headers()
+
+    print(f"{'layout':>8} {'copies':>6} {'KB':>7} {'original ms':>12} {'precompiled ms':>15} {'speedup':>8}")
+    for layout in LAYOUTS:
+        base = "\n".join(render_lines(make_record(0, layout, "long"), layout))
+        for copies in COPIES:
+            text = "\n\n".join([base] * copies)
+            assert parser._preprocess_text(text) == original_preprocess_text(parser, text)
+            before = time_it(lambda t: original_preprocess_text(parser, t), text, args.repeat)
+            after = time_it(parser._preprocess_text, text, args.repeat)
+            print(f"{layout:>8} {copies:>6} {len(text) / 1024:>7.1f} {before * 1000:>12.3f} "
+                  f"{after * 1000:>15.3f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
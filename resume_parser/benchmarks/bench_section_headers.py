@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Compare the single-pass section header scan of ImprovedResumeParser._extract_sections
+with the original one regex per header.
+
+Usage:
+    python benchmarks/bench_section_headers.py [--repeat 20]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from main import ImprovedResumeParser
+from synthetic_cv import LAYOUTS, make_record, render_lines
+
+# Long CVs repeated to this many copies, e.g. a CV with appendices or a merged upload
+COPIES = [1, 4, 16]
+
+
+def original_extract_sections(parser, text):
+    """The section extraction as it was before: one finditer pass per header, then two more searches."""
+    sections = {}
+    header_patterns = {}
+    for section_name, headers in parser.section_headers.items():
+        header_patterns[section_name] = [
+            r'(?:\n|^)(' + re.escape(header) + r')(?:[\s:]*)(?:\n|$)' for header in headers
+        ]
+    section_positions = []
+    for section_name, patterns in header_patterns.items():
+        for pattern in patterns:
+            for match in re.finditer(pattern, text, re.IGNORECASE):
+                section_positions.append({'start': match.start(), 'end': match.end(), 'name': section_name})
+    section_positions.sort(key=lambda x: x['start'])
+    for i, section in enumerate(section_positions):
+        end_pos = section_positions[i + 1]['start'] if i < len(section_positions) - 1 else len(text)
+        sections[section['name']] = text[section['end']:end_pos].strip()
+    if 'contact' not in sections and text:
+        first_section_pos = section_positions[0]['start'] if section_positions else len(text)
+        first_part = text[:first_section_pos].strip()
+        if first_part:
+            sections['contact'] = first_part
+    for section_name, pattern in (
+        ('experience', r'(?:\n|^)(Career History|Professional Experience)(?:[\s:]*)(?:\n|$)'),
+        ('skills', r'(?:\n|^)(Technical Competencies)(?:[\s:]*)(?:\n|$)'),
+    ):
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            next_section_pos = next((s['start'] for s in section_positions if s['start'] > match.end()), len(text))
+            sections[section_name] = text[match.end():next_section_pos].strip()
+    return sections
+
+
+def time_it(func, text: str, repeat: int) -> float:
+    func(text)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(text)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--repeat", type=int, default=20)
+    args = arg_parser.parse_args()
+
+    # Only the section tables are needed, not the spaCy model
+    parser = ImprovedResumeParser.__new__(ImprovedResumeParser)
+    parser._initialize_section_headers()
+
+    print(f"{'layout':>8} {'copies':>6} {'KB':>7} {'original ms':>12} {'single-pass ms':>15} {'speedup':>8}")
+    for layout in LAYOUTS:
+        base = "\n".join(render_lines(make_record(0, layout, "long"), layout))
+        for copies in COPIES:
+            text = "\n\n".join([base] * copies)
+            assert parser._extract_sections(text) == original_extract_sections(parser, text)
+            before = time_it(lambda t: original_extract_sections(parser, t), text, args.repeat)
+            after = time_it(parser._extract_sections, text, args.repeat)
+            print(f"{layout:>8} {copies:>6} {len(text) / 1024:>7.1f} {before * 1000:>12.3f} "
+                  f"{after * 1000:>15.3f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
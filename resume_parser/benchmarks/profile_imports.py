@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Import-time profile of the resume parser service, for tracking cold start in CI.
+
+Each module is imported in a fresh interpreter with `-X importtime`. The
+report gives the total import time, the slowest imports and any heavy
+library (torch, spaCy, ...) that was imported eagerly. The exit status is 1
+if a budget is exceeded or a heavy library was imported.
+
+Usage:
+    python benchmarks/profile_imports.py [--modules hybrid_cv_parser app] [--budget-ms 2000] [--json report.json]
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+PARSER_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+DEFAULT_MODULES = ["hybrid_cv_parser", "app"]
+# Libraries that must only be imported when a model is first used
+HEAVY_MODULES = ["torch", "transformers", "spacy", "onnxruntime", "google.generativeai"]
+
+# "import time: self [us] | cumulative | imported package", nesting shown by indentation
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def profile_module(module: str) -> Dict[str, Any]:
+    """Import `module` in a fresh interpreter and collect its import timings."""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    # app.py refuses to start without these; nothing connects during import
+    env.setdefault("GOOGLE_API_KEY", "import-profile")
+    env.setdefault("MONGO_URI", "mongodb://localhost:27017")
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PARSER_DIR, env=env, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr[-2000:]}")
+
+    imports: List[Dict[str, Any]] = []
+    for line in completed.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            imports.append({
+                "module": match.group(4),
+                "self_ms": int(match.group(1)) / 1000,
+                "cumulative_ms": int(match.group(2)) / 1000,
+                "depth": len(match.group(3)) // 2
+            })
+
+    total = next((entry["cumulative_ms"] for entry in reversed(imports) if entry["module"] == module), 0.0)
+    imported = {entry["module"] for entry in imports}
+    return {
+        "module": module,
+        "total_ms": round(total, 1),
+        "imported_modules": len(imports),
+        "heavy_imports": [name for name in HEAVY_MODULES if name in imported],
+        "slowest": [
+            {"module": entry["module"], "cumulative_ms": round(entry["cumulative_ms"], 1)}
+            for entry in sorted(imports, key=lambda entry: entry["cumulative_ms"], reverse=True)[1:11]
+        ]
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES)
+    arg_parser.add_argument("--budget-ms", type=float, default=None, help="Fail if any module takes longer to import")
+    arg_parser.add_argument("--allow-heavy", action="store_true", help="Do not fail on eager heavy imports")
+    arg_parser.add_argument("--json", dest="json_path", help="Also write the report to this file")
+    args = arg_parser.parse_args()
+
+    reports = [profile_module(module) for module in args.modules]
+
+    failed = False
+    for report in reports:
+        print(f"{report['module']}: {report['total_ms']:.1f} ms, {report['imported_modules']} modules")
+        for entry in report["slowest"]:
+            print(f"    {entry['cumulative_ms']:>9.1f} ms  {entry['module']}")
+        if report["heavy_imports"]:
+            print(f"    eagerly imports: {', '.join(report['heavy_imports'])}")
+            failed = failed or not args.allow_heavy
+        if args.budget_ms is not None and report["total_ms"] > args.budget_ms:
+            print(f"    over the {args.budget_ms:.0f} ms budget")
+            failed = True
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=2)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""
+Synthetic CV corpus for benchmarks: deterministic resumes shaped like the
+parser's sample CV, in several layouts and lengths, as TXT, DOCX and PDF.
+
+Every resume comes with the structured data it was generated from, in the
+shape the Gemini prompt asks for, so an LLM stub can answer with it.
+"""
+import io
+import random
+from typing import Any, Dict, List
+
+from synthetic_pdf import make_pdf
+
+LAYOUTS = ("table", "classic", "compact")
+# Work experience entries, education entries and bullets per job
+LENGTHS = {
+    "short": (1, 1, 2),
+    "medium": (3, 2, 4),
+    "long": (8, 3, 6),
+}
+FORMATS = ("txt", "docx", "pdf")
+PDF_LINES_PER_PAGE = 55
+
+FIRST_NAMES = ["Nimal", "Kasun", "Ayesha", "Tharushi", "Dilan", "Sachini", "Ravi", "Priya", "John", "Maria"]
+LAST_NAMES = ["Wijesinghe", "Perera", "Fernando", "Silva", "Jayasuriya", "Bandara", "Smith", "Garcia"]
+CITIES = ["Colombo, Sri Lanka", "Kandy, Sri Lanka", "Galle, Sri Lanka", "London, UK", "Berlin, Germany"]
+COMPANIES = [
+    "Nexlify IT Solutions", "IFS R&D International", "WSO2", "Virtusa", "99x Technology",
+    "Sysco LABS", "CodeGen International", "Pearson Lanka", "Dialog Axiata", "Calcey Technologies",
+]
+POSITIONS = [
+    "Junior Software Developer", "Software Engineer", "Senior Software Engineer", "Associate Tech Lead",
+    "QA Engineer", "DevOps Engineer", "Data Engineer", "Internship - Software Development",
+]
+DEGREES = [
+    ("BSc (Hons) in Software Engineering", "University of Kelaniya, Sri Lanka"),
+    ("BSc in Computer Science", "University of Colombo School of Computing"),
+    ("MSc in Data Science", "University of Moratuwa, Sri Lanka"),
+    ("G.C.E. Advanced Level (Technology Stream)", "Mahinda College, Galle"),
+    ("Diploma in Information Technology", "SLIIT, Malabe"),
+]
+DETAILS = ["CGPA: 3.5/4.0", "First Class Honours", "Dean's List 2021", "2 A's (ICT, Engineering Technology), B (SFT)"]
+TECHNICAL_SKILLS = [
+    "Python", "JavaScript", "TypeScript", "Java", "C#", "PHP", "SQL", "React", "Vue.js", "Angular",
+    "Node.js", "Django", "Flask", ".NET Core", "CodeIgniter", "Docker", "Kubernetes", "AWS", "Azure",
+    "Git", "PostgreSQL", "MongoDB", "SQLite", "SQL Server", "Redis", "Jenkins", "Terraform", "Linux",
+]
+SOFT_SKILLS = ["Communication", "Teamwork", "Leadership", "Problem Solving", "Time Management", "Mentoring"]
+LANGUAGES = ["English", "Sinhala", "Tamil", "German"]
+BULLETS = [
+    "Built web apps using {a} and {b} for {n}K+ users",
+    "Optimized {a} queries, improving data retrieval by {n}%",
+    "Assisted in API integration with third-party services using {a}",
+    "Contributed to {n}+ sprint cycles in Agile teams",
+    "Wrote unit tests with {a}, achieving {n}% coverage",
+    "Migrated legacy services to {a} and {b}, cutting hosting costs by {n}%",
+    "Mentored {n} junior developers and ran weekly code reviews",
+    "Automated deployments with {a}, reducing release time by {n}%",
+]
+MONTHS = ["January", "February", "March", "April", "May", "June", "July",
+          "August", "September", "October", "November", "December"]
+
+
+def _dates(rng: random.Random, end_year: int, current: bool) -> str:
+    start_year = end_year - rng.randint(1, 3)
+    start = f"{rng.choice(MONTHS)} {start_year}"
+    end = "Present" if current else f"{rng.choice(MONTHS)} {end_year}"
+    return f"{start} - {end}"
+
+
+def make_record(index: int, layout: str, length: str, seed: int = 0) -> Dict[str, Any]:
+    """Structured data of one synthetic resume, in the shape of CV_RESPONSE_SCHEMA."""
+    rng = random.Random(f"{seed}-{index}")
+    job_count, education_count, bullet_count = LENGTHS[length]
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+
+    technical = rng.sample(TECHNICAL_SKILLS, min(len(TECHNICAL_SKILLS), 4 + 2 * job_count))
+    work_experience = []
+    year = 2024
+    for j in range(job_count):
+        bullets = [
+            rng.choice(BULLETS).format(a=rng.choice(technical), b=rng.choice(technical), n=rng.randint(2, 90))
+            for _ in range(bullet_count)
+        ]
+        work_experience.append({
+            "position": rng.choice(POSITIONS),
+            "company": rng.choice(COMPANIES),
+            "location": rng.choice(CITIES),
+            "dates": _dates(rng, year, current=j == 0),
+            "description": bullets,
+        })
+        year -= rng.randint(1, 3)
+
+    education = []
+    for degree, institution in rng.sample(DEGREES, education_count):
+        education.append({
+            "degree": degree,
+            "institution": institution,
+            "dates": f"{year - 4} - {year}",
+            "details": rng.choice(DETAILS),
+        })
+        year -= 4
+
+    return {
+        "name": f"{first} {last}",
+        "email": f"{first.lower()}.{last.lower()}{index}@example.com",
+        "phone": f"+94 7{rng.randint(0, 9)} {rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+        "location": rng.choice(CITIES),
+        "education": education,
+        "work_experience": work_experience,
+        "skills": {
+            "technical_skills": technical,
+            "soft_skills": rng.sample(SOFT_SKILLS, 3),
+            "languages": rng.sample(LANGUAGES, 2),
+        },
+        "summary": f"{work_experience[0]['position']} with experience in {', '.join(technical[:3])}.",
+    }
+
+
+def _table_lines(record: Dict[str, Any]) -> List[str]:
+    """Layout of the sample CV: column headers per section, contact fields run together."""
+    lines = [
+        "Resume", "Candidate Profile",
+        f"Name: {record['name']}Email: {record['email']}Phone: {record['phone']}Address: {record['location']}",
+        "", "Education", "", "Qualification", "Institution", "Period", "Details", "",
+    ]
+    for entry in record["education"]:
+        lines += [entry["degree"], entry["institution"], entry["dates"], entry["details"], ""]
+    lines += ["Professional Experience", "", "Role", "Company", "Period", "Responsibilities", ""]
+    for job in record["work_experience"]:
+        lines += [job["position"], f"{job['company']}, {job['location']}", job["dates"],
+                  "".join(f"- {bullet}" for bullet in job["description"]), ""]
+    skills = record["skills"]
+    lines += ["Skills", "", f"Technical: {', '.join(skills['technical_skills'])}",
+              f"Soft skills: {', '.join(skills['soft_skills'])}",
+              f"Languages: {', '.join(skills['languages'])}"]
+    return lines
+
+
+def _classic_lines(record: Dict[str, Any]) -> List[str]:
+    """Upper-case section headers, one fact per line, bullet points."""
+    lines = [record["name"], record["email"], record["phone"], record["location"], "",
+             "PROFESSIONAL SUMMARY", record["summary"], "", "WORK EXPERIENCE"]
+    for job in record["work_experience"]:
+        lines += [f"{job['position']} | {job['company']} | {job['dates']}"]
+        lines += [f"* {bullet}" for bullet in job["description"]]
+        lines.append("")
+    lines.append("EDUCATION")
+    for entry in record["education"]:
+        lines += [entry["degree"], f"{entry['institution']} | {entry['dates']}", entry["details"], ""]
+    skills = record["skills"]
+    lines += ["TECHNICAL SKILLS", ", ".join(skills["technical_skills"]), "",
+              "SOFT SKILLS", ", ".join(skills["soft_skills"]), "", "LANGUAGES", ", ".join(skills["languages"])]
+    return lines
+
+
+def _compact_lines(record: Dict[str, Any]) -> List[str]:
+    """Dense one-liners with inline headers, as exported from online CV builders."""
+    lines = [f"{record['name']} - {record['email']} - {record['phone']}", f"Summary: {record['summary']}",
+             "Experience:"]
+    for job in record["work_experience"]:
+        lines.append(f"{job['position']} at {job['company']} ({job['dates']}): {'; '.join(job['description'])}")
+    lines.append("Education:")
+    for entry in record["education"]:
+        lines.append(f"{entry['degree']}, {entry['institution']}, {entry['dates']}, {entry['details']}")
+    skills = record["skills"]
+    lines.append(f"Skills: {', '.join(skills['technical_skills'] + skills['soft_skills'])}")
+    lines.append(f"Languages: {', '.join(skills['languages'])}")
+    return lines
+
+
+_RENDERERS = {"table": _table_lines, "classic": _classic_lines, "compact": _compact_lines}
+
+
+def render_lines(record: Dict[str, Any], layout: str) -> List[str]:
+    return _RENDERERS[layout](record)
+
+
+def to_docx(lines: List[str]) -> bytes:
+    from docx import Document
+
+    document = Document()
+    for line in lines:
+        document.add_paragraph(line)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def to_pdf(lines: List[str]) -> bytes:
+    pages = [lines[i:i + PDF_LINES_PER_PAGE] for i in range(0, len(lines), PDF_LINES_PER_PAGE)]
+    return make_pdf(pages or [[]])
+
+
+def make_corpus(count: int, seed: int = 0, formats=FORMATS) -> List[Dict[str, Any]]:
+    """
+    Build `count` resumes, cycling through every layout and length.
+
+    Returns:
+        One dict per resume with its id, layout, length, structured `record`,
+        plain `text` and the file contents by format
+    """
+    corpus = []
+    combinations = [(layout, length) for length in LENGTHS for layout in LAYOUTS]
+    for index in range(count):
+        layout, length = combinations[index % len(combinations)]
+        record = make_record(index, layout, length, seed)
+        lines = render_lines(record, layout)
+        text = "\n".join(lines)
+        files = {}
+        if "txt" in formats:
+            files["txt"] = text.encode("utf-8")
+        if "docx" in formats:
+            files["docx"] = to_docx(lines)
+        if "pdf" in formats:
+            files["pdf"] = to_pdf(lines)
+        corpus.append({
+            "id": f"cv-{index:04d}-{layout}-{length}",
+            "layout": layout,
+            "length": length,
+            "record": record,
+            "text": text,
+            "files": files,
+        })
+    return corpus
@@ -0,0 +1,124 @@
+"""
+Batched DistilBERT embedding engine used by HybridCVParser.
+"""
+import logging
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from bert_backends import OnnxBertEncoder
+from embedding_cache import EmbeddingCache
+
+logger = logging.getLogger(__name__)
+
+
+class BertEmbedder:
+    """
+    Embeds many strings per forward pass and scores them against a fixed set of
+    reference prototypes with a single matrix product.
+
+    Texts are de-duplicated and sorted by length before batching so each padded
+    batch wastes as little compute as possible. Texts found in the optional
+    embedding cache never reach the model.
+    """
+
+    def __init__(self, tokenizer, model, batch_size: int = 32, max_length: int = 512,
+                 cache: Optional[EmbeddingCache] = None):
+        """
+        Initialize the embedder around an already loaded tokenizer and model.
+
+        Args:
+            tokenizer: Hugging Face tokenizer matching `model`.
+            model: Transformer model in evaluation mode, or an OnnxBertEncoder.
+            batch_size: Maximum number of strings per forward pass.
+            max_length: Maximum number of tokens kept per string.
+            cache: Optional embedding cache shared between embedders.
+        """
+        self.tokenizer = tokenizer
+        self.model = model
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.cache = cache
+        self.prototype_names: List[str] = []
+        self._prototype_matrix = np.empty((0, 0), dtype=np.float32)
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Generate [CLS] embeddings for a list of texts.
+
+        Args:
+            texts: Texts to encode
+
+        Returns:
+            Array of shape (len(texts), hidden_size)
+        """
+        if not texts:
+            return np.empty((0, self.model.config.hidden_size), dtype=np.float32)
+
+        unique_texts = list(dict.fromkeys(texts))
+        vectors: Dict[str, np.ndarray] = {}
+        if self.cache is not None:
+            vectors, unique_texts = self.cache.get_many(unique_texts)
+
+        # Encode each remaining string once, shortest first to keep padding small
+        unique_texts.sort(key=len)
+        for start in range(0, len(unique_texts), self.batch_size):
+            batch = unique_texts[start:start + self.batch_size]
+            batch_vectors = self._forward(batch)
+            if self.cache is not None:
+                self.cache.put_many(batch, batch_vectors)
+            for text, vector in zip(batch, batch_vectors):
+                vectors[text] = vector
+
+        return np.stack([vectors[text] for text in texts])
+
+    def embed_normalized(self, texts: Sequence[str]) -> np.ndarray:
+        """Generate L2-normalized embeddings so dot products are cosine similarities."""
+        embeddings = self.embed(texts)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.maximum(norms, 1e-12)
+
+    def set_prototypes(self, prototypes: Dict[str, str]) -> None:
+        """
+        Precompute and cache the reference vectors that texts are scored against.
+
+        Args:
+            prototypes: Mapping of prototype name to reference text.
+        """
+        self.prototype_names = list(prototypes)
+        self._prototype_matrix = self.embed_normalized([prototypes[name] for name in self.prototype_names])
+        logger.info(f"Cached {len(self.prototype_names)} BERT reference prototypes")
+
+    def score(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Cosine similarity of every text against every cached prototype.
+
+        Args:
+            texts: Texts to score
+
+        Returns:
+            Array of shape (len(texts), len(prototype_names)); column order
+            follows `prototype_names`.
+        """
+        if not texts:
+            return np.empty((0, len(self.prototype_names)), dtype=np.float32)
+        return self.embed_normalized(texts) @ self._prototype_matrix.T
+
+    def _forward(self, batch: List[str]) -> np.ndarray:
+        """Run one padded forward pass and return the [CLS] vectors."""
+        onnx = isinstance(self.model, OnnxBertEncoder)
+        tokens = self.tokenizer(
+            batch,
+            return_tensors="np" if onnx else "pt",
+            padding=True,
+            truncation=True,
+            max_length=self.max_length
+        )
+        if onnx:
+            return self.model.cls_embeddings(tokens)
+
+        import torch
+
+        with torch.inference_mode():
+            outputs = self.model(**tokens)
+        return outputs.last_hidden_state[:, 0, :].float().numpy()
@@ -0,0 +1,301 @@
+"""
+Two-tier embedding cache for BERT vectors keyed by normalized text.
+
+Tier one is an in-process LRU bounded by a byte budget. Tier two is an
+append-only float16 store on disk that is memory-mapped for reads, so vectors
+survive restarts and are shared by every worker process on the host.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+KEY_SIZE = 16
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text before hashing.
+
+    DistilBERT is uncased and splits on whitespace, so case and whitespace
+    differences produce the same tokens and can safely share a cache entry.
+    """
+    return " ".join(text.split()).lower()
+
+
+def text_key(text: str) -> bytes:
+    """Stable 16-byte hash of the normalized text."""
+    return hashlib.blake2b(normalize_text(text).encode("utf-8"), digest_size=KEY_SIZE).digest()
+
+
+class LRUEmbeddingCache:
+    """In-memory LRU of embedding vectors bounded by total bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+            return vector
+
+    def put(self, key: bytes, vector: np.ndarray) -> None:
+        if vector.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous.nbytes
+            self._entries[key] = vector
+            self.current_bytes += vector.nbytes
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= evicted.nbytes
+
+
+class DiskEmbeddingStore:
+    """
+    Append-only float16 vector store with a memory-mapped read path.
+
+    Layout inside `directory`:
+        meta.json    - vector dimension
+        keys.bin     - 16-byte text hashes, one per row; its length defines the row count
+        vectors.f16  - row-major float16 vectors, row i belongs to key i
+
+    Rows are written before their key, so a crash can only leave an orphan
+    vector that the next writer overwrites.
+    """
+
+    def __init__(self, directory: str, max_bytes: Optional[int] = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.dim: Optional[int] = None
+        self._index: Dict[bytes, int] = {}
+        self._keys_offset = 0
+        self._mmap: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+        self._full_logged = False
+
+        os.makedirs(directory, exist_ok=True)
+        self._meta_path = os.path.join(directory, "meta.json")
+        self._keys_path = os.path.join(directory, "keys.bin")
+        self._vectors_path = os.path.join(directory, "vectors.f16")
+
+        if self._load_dim():
+            self._refresh_index()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        with self._lock:
+            row = self._index.get(key)
+            if row is None:
+                # Another process may have appended since we last looked, or
+                # written the first vector after this store was opened
+                if self.dim is None and not self._load_dim():
+                    return None
+                self._refresh_index()
+                row = self._index.get(key)
+                if row is None:
+                    return None
+            return np.asarray(self._rows()[row], dtype=np.float32)
+
+    def put(self, key: bytes, vector: np.ndarray) -> None:
+        with self._lock:
+            if self.dim is None and not self._load_dim():
+                self._init_dim(vector.shape[-1])
+            if vector.shape[-1] != self.dim:
+                raise ValueError(f"Expected {self.dim}-dimensional vector, got {vector.shape[-1]}")
+
+            with open(self._keys_path, "ab") as keys_file:
+                self._lock_file(keys_file)
+                try:
+                    self._refresh_index()
+                    if key in self._index:
+                        return
+
+                    row = len(self._index)
+                    row_bytes = self.dim * 2
+                    if self.max_bytes is not None and (row + 1) * row_bytes > self.max_bytes:
+                        if not self._full_logged:
+                            logger.warning(f"Embedding store {self.directory} is full; not persisting new vectors")
+                            self._full_logged = True
+                        return
+
+                    with open(self._vectors_path, "r+b" if os.path.exists(self._vectors_path) else "wb") as vectors_file:
+                        vectors_file.seek(row * row_bytes)
+                        vectors_file.write(vector.astype(np.float16).tobytes())
+                        vectors_file.flush()
+
+                    keys_file.write(key)
+                    keys_file.flush()
+                    self._index[key] = row
+                    self._keys_offset += KEY_SIZE
+                finally:
+                    self._unlock_file(keys_file)
+
+    def _load_dim(self) -> bool:
+        """Read the vector dimension from meta.json; False if no vector was stored yet."""
+        if not os.path.exists(self._meta_path):
+            return False
+        with open(self._meta_path, "r", encoding="utf-8") as f:
+            self.dim = int(json.load(f)["dim"])
+        return True
+
+    def _init_dim(self, dim: int) -> None:
+        self.dim = dim
+        # Written to a temporary file and renamed, so other processes never read half of it
+        temp_path = f"{self._meta_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"dim": dim, "dtype": "float16"}, f)
+        os.replace(temp_path, self._meta_path)
+
+    def _refresh_index(self) -> None:
+        """Read keys appended since the last refresh."""
+        if not os.path.exists(self._keys_path):
+            return
+        size = os.path.getsize(self._keys_path)
+        if size <= self._keys_offset:
+            return
+        with open(self._keys_path, "rb") as f:
+            f.seek(self._keys_offset)
+            data = f.read(size - self._keys_offset)
+        complete = len(data) - len(data) % KEY_SIZE
+        for start in range(0, complete, KEY_SIZE):
+            self._index.setdefault(data[start:start + KEY_SIZE], len(self._index))
+        self._keys_offset += complete
+
+    def _rows(self) -> np.memmap:
+        """Memory-map the vector file, remapping when it has grown."""
+        rows = len(self._index)
+        if self._mmap is None or self._mmap.shape[0] < rows:
+            self._mmap = np.memmap(self._vectors_path, dtype=np.float16, mode="r", shape=(rows, self.dim))
+        return self._mmap
+
+    @staticmethod
+    def _lock_file(f) -> None:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+    @staticmethod
+    def _unlock_file(f) -> None:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class EmbeddingCache:
+    """
+    LRU in front of an optional disk store, with hit-rate counters.
+
+    Lookups that hit either tier skip the model entirely; disk hits are
+    promoted into the LRU.
+    """
+
+    def __init__(self, memory_bytes: int = 64 * 1024 * 1024, disk_store: Optional[DiskEmbeddingStore] = None):
+        self.memory = LRUEmbeddingCache(memory_bytes)
+        self.disk = disk_store
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._counter_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, namespace: str = "distilbert-base-uncased") -> "EmbeddingCache":
+        """
+        Build a cache from EMBEDDING_CACHE_MB, EMBEDDING_CACHE_DIR and EMBEDDING_CACHE_DISK_MB.
+
+        Args:
+            namespace: Subdirectory for the disk tier; vectors from different
+                models or backends must not share a store.
+        """
+        memory_bytes = int(float(os.getenv("EMBEDDING_CACHE_MB", "64")) * 1024 * 1024)
+        disk_store = None
+        cache_dir = os.getenv("EMBEDDING_CACHE_DIR")
+        if cache_dir:
+            disk_mb = os.getenv("EMBEDDING_CACHE_DISK_MB")
+            disk_store = DiskEmbeddingStore(
+                os.path.join(cache_dir, namespace),
+                max_bytes=int(float(disk_mb) * 1024 * 1024) if disk_mb else None
+            )
+        return cls(memory_bytes=memory_bytes, disk_store=disk_store)
+
+    def get_many(self, texts: Sequence[str]) -> Tuple[Dict[str, np.ndarray], List[str]]:
+        """
+        Look up several texts.
+
+        Returns:
+            Tuple of (found vectors by text, texts that missed both tiers)
+        """
+        found: Dict[str, np.ndarray] = {}
+        missing: List[str] = []
+        memory_hits = disk_hits = 0
+
+        for text in texts:
+            key = text_key(text)
+            vector = self.memory.get(key)
+            if vector is not None:
+                memory_hits += 1
+            elif self.disk is not None:
+                vector = self.disk.get(key)
+                if vector is not None:
+                    disk_hits += 1
+                    self.memory.put(key, vector)
+            if vector is None:
+                missing.append(text)
+            else:
+                found[text] = vector
+
+        with self._counter_lock:
+            self.memory_hits += memory_hits
+            self.disk_hits += disk_hits
+            self.misses += len(missing)
+        return found, missing
+
+    def put_many(self, texts: Sequence[str], vectors: np.ndarray) -> None:
+        """Store freshly computed vectors in both tiers."""
+        for text, vector in zip(texts, vectors):
+            key = text_key(text)
+            vector = np.asarray(vector, dtype=np.float32)
+            self.memory.put(key, vector)
+            if self.disk is not None:
+                try:
+                    self.disk.put(key, vector)
+                except OSError as e:
+                    logger.warning(f"Failed to persist embedding: {e}")
+
+    def stats(self) -> Dict[str, float]:
+        """Hit-rate counters and occupancy of both tiers."""
+        with self._counter_lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            hit_rate = (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+            return {
+                "lookups": lookups,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(hit_rate, 4),
+                "memory_entries": len(self.memory),
+                "memory_bytes": self.memory.current_bytes,
+                "disk_entries": len(self.disk) if self.disk is not None else 0
+            }
@@ -0,0 +1,361 @@
+"""
+Rate-limited, retrying Gemini client with a circuit breaker.
+
+Calls run as coroutines on one background event loop per process, so the
+limits below are shared by every parser thread. Synchronous callers use
+`generate()` / `generate_many()`, which block on that loop.
+
+Setting GEMINI_BASE_URL points the parser at a server speaking the Gemini
+REST API instead of Google, e.g. the `llm_service` mock for load tests.
+"""
+import asyncio
+import logging
+import os
+import random
+import re
+import threading
+import time
+from concurrent.futures import Future
+from types import SimpleNamespace
+from typing import Any, Awaitable, Dict, List, Optional, Tuple, Union
+
+from google.api_core import exceptions as google_exceptions
+
+logger = logging.getLogger(__name__)
+
+# Errors worth retrying: quota, overload and transient server or network failures
+RETRYABLE_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.TooManyRequests,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.GatewayTimeout,
+    asyncio.TimeoutError,
+    ConnectionError,
+)
+
+# One client per model and process, see GeminiClient.from_env
+_shared_clients: Dict[str, "GeminiClient"] = {}
+_shared_clients_lock = threading.Lock()
+
+
+class GeminiUnavailableError(RuntimeError):
+    """Raised when Gemini cannot be reached within the retry budget"""
+    pass
+
+
+class CircuitOpenError(GeminiUnavailableError):
+    """Raised without calling Gemini while the circuit breaker is open"""
+    pass
+
+
+def token_counts(response: Any) -> Tuple[int, int]:
+    """Prompt and output token counts reported with a Gemini response."""
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return 0, 0
+    return getattr(usage, "prompt_token_count", 0) or 0, getattr(usage, "candidates_token_count", 0) or 0
+
+
+def shared_client_stats() -> Dict[str, Dict[str, Any]]:
+    """Usage of every shared client in this process, by model name."""
+    with _shared_clients_lock:
+        clients = dict(_shared_clients)
+    return {model_name: client.stats() for model_name, client in clients.items()}
+
+
+class RestGenerativeModel:
+    """
+    Minimal stand-in for `genai.GenerativeModel` that posts to a Gemini-compatible
+    REST endpoint. Only what the parser uses is implemented.
+    """
+
+    def __init__(self, model_name: str, base_url: str, api_key: Optional[str] = None):
+        import httpx
+
+        self.model_name = model_name
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        # Created lazily: it must belong to the client's event loop
+        self._http_client: Optional["httpx.AsyncClient"] = None
+
+    async def generate_content_async(self, prompt: str, request_options: Optional[Dict[str, Any]] = None,
+                                     generation_config: Optional[Dict[str, Any]] = None, **kwargs) -> Any:
+        import httpx
+
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient()
+
+        body: Dict[str, Any] = {"contents": [{"role": "user", "parts": [{"text": prompt}]}]}
+        if generation_config:
+            # The REST API spells the generation config fields in camelCase
+            body["generationConfig"] = {
+                re.sub(r"_([a-z])", lambda m: m.group(1).upper(), key): value
+                for key, value in generation_config.items()
+            }
+        timeout = (request_options or {}).get("timeout")
+        try:
+            response = await self._http_client.post(
+                f"{self.base_url}/v1beta/models/{self.model_name}:generateContent",
+                params={"key": self.api_key} if self.api_key else None,
+                json=body,
+                timeout=timeout
+            )
+        except httpx.TimeoutException as e:
+            raise asyncio.TimeoutError(str(e))
+        except httpx.TransportError as e:
+            raise ConnectionError(str(e))
+
+        if response.status_code >= 400:
+            try:
+                message = response.json()["error"]["message"]
+            except (ValueError, KeyError, TypeError):
+                message = response.text
+            raise google_exceptions.from_http_status(response.status_code, message)
+
+        data = response.json()
+        usage = data.get("usageMetadata", {})
+        return SimpleNamespace(
+            text="".join(part.get("text", "") for part in data["candidates"][0]["content"]["parts"]),
+            usage_metadata=SimpleNamespace(
+                prompt_token_count=usage.get("promptTokenCount", 0),
+                candidates_token_count=usage.get("candidatesTokenCount", 0),
+                total_token_count=usage.get("totalTokenCount", 0)
+            )
+        )
+
+
+class TokenBucket:
+    """Async token bucket: `rate` requests per second with bursts of up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and stays open for
+    `reset_timeout` seconds. After that one trial call is let through
+    (half-open): success closes the circuit, failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go out now."""
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info("Gemini circuit breaker closed")
+            self.state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """
+        End a call that neither succeeded nor failed in a way that counts, e.g.
+        a rejected request or a cancelled task, so the next call can be the trial.
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"Gemini circuit breaker opened after {self._failures} failure(s)")
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class GeminiClient:
+    """
+    Wraps a `genai.GenerativeModel` with a token-bucket rate limit, a bound on
+    in-flight requests, jittered exponential backoff and a circuit breaker.
+    """
+
+    def __init__(self, model, requests_per_minute: float = 60, max_concurrency: int = 8,
+                 max_retries: int = 3, base_delay: float = 1.0, max_delay: float = 20.0,
+                 timeout: float = 30.0, breaker: Optional[CircuitBreaker] = None):
+        """
+        Initialize the client. The event loop thread starts on first use.
+
+        Args:
+            model: `genai.GenerativeModel` to call.
+            requests_per_minute: Sustained request rate; bursts up to max_concurrency.
+            max_concurrency: Maximum requests in flight at once.
+            max_retries: Retries of a transient failure before giving up.
+            base_delay: Backoff before the first retry, doubled each attempt.
+            max_delay: Upper bound of a single backoff.
+            timeout: Seconds a single request may take.
+            breaker: Circuit breaker; a default one is created if None.
+        """
+        self.model = model
+        self.requests_per_minute = requests_per_minute
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.breaker = breaker or CircuitBreaker()
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+        self._bucket: Optional[TokenBucket] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        self._usage_lock = threading.Lock()
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+
+    @classmethod
+    def from_env(cls, model) -> "GeminiClient":
+        """
+        Get the process-wide client for this model, configured by the GEMINI_*
+        environment variables. Parsers share it so the limits apply to all of them.
+        """
+        model_name = getattr(model, "model_name", repr(model))
+        with _shared_clients_lock:
+            if model_name not in _shared_clients:
+                _shared_clients[model_name] = cls(
+                    model,
+                    requests_per_minute=float(os.getenv("GEMINI_RPM", "60")),
+                    max_concurrency=int(os.getenv("GEMINI_MAX_CONCURRENCY", "8")),
+                    max_retries=int(os.getenv("GEMINI_MAX_RETRIES", "3")),
+                    timeout=float(os.getenv("GEMINI_TIMEOUT", "30")),
+                    breaker=CircuitBreaker(
+                        failure_threshold=int(os.getenv("GEMINI_BREAKER_THRESHOLD", "5")),
+                        reset_timeout=float(os.getenv("GEMINI_BREAKER_RESET_SECONDS", "30"))
+                    )
+                )
+            return _shared_clients[model_name]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._usage_lock:
+            return {
+                "requests": self.requests,
+                "prompt_tokens": self.prompt_tokens,
+                "output_tokens": self.output_tokens,
+                "circuit": self.breaker.state
+            }
+
+    async def generate_async(self, prompt: str, **kwargs) -> Any:
+        """
+        Call `generate_content_async` under the rate limit and retry policy.
+
+        Raises:
+            CircuitOpenError: If the circuit breaker is open.
+            GeminiUnavailableError: If every attempt failed with a transient error.
+        """
+        if self._semaphore is None:
+            self._bucket = TokenBucket(self.requests_per_minute / 60.0, self.max_concurrency)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.allow():
+                raise CircuitOpenError("Gemini circuit breaker is open")
+
+            try:
+                await self._bucket.acquire()
+                async with self._semaphore:
+                    response = await asyncio.wait_for(
+                        self.model.generate_content_async(
+                            prompt, request_options={"timeout": self.timeout}, **kwargs
+                        ),
+                        timeout=self.timeout
+                    )
+            except RETRYABLE_ERRORS as e:
+                self.breaker.record_failure()
+                if attempt == self.max_retries:
+                    raise GeminiUnavailableError(f"Gemini request failed after {attempt + 1} attempt(s): {e}")
+                # Full jitter keeps retrying workers from hitting the quota in lockstep
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+                logger.warning(f"Gemini request failed ({e!r}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                # A request Gemini rejected or a cancelled call says nothing about an outage,
+                # but it must not leave the half-open trial flagged forever
+                self.breaker.release_trial()
+                raise
+
+            self.breaker.record_success()
+            prompt_tokens, output_tokens = token_counts(response)
+            with self._usage_lock:
+                self.requests += 1
+                self.prompt_tokens += prompt_tokens
+                self.output_tokens += output_tokens
+            return response
+
+    def generate(self, prompt: str, **kwargs) -> Any:
+        """Blocking version of `generate_async` for use from worker threads."""
+        return self._submit(self.generate_async(prompt, **kwargs)).result()
+
+    def generate_many(self, prompts: List[str], **kwargs) -> List[Union[Any, Exception]]:
+        """
+        Send several prompts concurrently, still within the limits.
+
+        Returns:
+            One entry per prompt, in order: the response or the exception raised
+        """
+        async def _gather():
+            return await asyncio.gather(
+                *(self.generate_async(prompt, **kwargs) for prompt in prompts),
+                return_exceptions=True
+            )
+
+        return self._submit(_gather()).result()
+
+    def close(self) -> None:
+        with self._loop_lock:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._loop = None
+
+    def _submit(self, coroutine: Awaitable) -> Future:
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="gemini-client", daemon=True).start()
+            return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
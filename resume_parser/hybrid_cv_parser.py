@@ -3,15 +3,23 @@ Advanced CV Parser combining Gemini AI with spaCy NLP and BERT transformers.
 """
 import os
 import json
+import re
 import logging
-import google.generativeai as genai
-import spacy
-from typing import Dict, Any, List, Optional
+import threading
+from typing import Dict, Any, List, Optional, Tuple, Union
 from dotenv import load_dotenv
-import torch
-from transformers import DistilBertTokenizer, DistilBertModel
 import numpy as np
 
+from bert_backends import BERT_BACKEND, BERT_MODEL_NAME, cache_namespace, load_bert
+from bert_embeddings import BertEmbedder
+from embedding_cache import EmbeddingCache
+from gemini_client import GeminiClient, GeminiUnavailableError, RestGenerativeModel, token_counts
+from json_repair import parse_json_tolerant
+from model_artifacts import check_bert_model, check_spacy_model
+from nlp_pipeline import load_spacy_pipeline
+from prompt_compaction import compact_cv_text
+from timing import stage_timer, to_milliseconds
+
 # Load environment variables
 load_dotenv()
 
@@ -19,47 +27,188 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+PARSER_VERSION = "3.0-hybrid"
+
+# Estimated tokens of CV text sent to Gemini; longer CVs are trimmed section by section
+GEMINI_CV_TOKEN_BUDGET = int(os.getenv("GEMINI_CV_TOKEN_BUDGET", "6000"))
+
+# Ask Gemini for schema-constrained JSON instead of describing the shape in the prompt
+GEMINI_STRUCTURED_OUTPUT = os.getenv("GEMINI_STRUCTURED_OUTPUT", "true").lower() == "true"
+
+_STRING = {"type": "STRING"}
+_STRING_LIST = {"type": "ARRAY", "items": _STRING}
+CV_RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "name": _STRING,
+        "email": _STRING,
+        "phone": _STRING,
+        "location": _STRING,
+        "education": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {"degree": _STRING, "institution": _STRING, "dates": _STRING, "details": _STRING}
+            }
+        },
+        "work_experience": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "position": _STRING, "company": _STRING, "location": _STRING,
+                    "dates": _STRING, "description": _STRING_LIST
+                }
+            }
+        },
+        "skills": {
+            "type": "OBJECT",
+            "properties": {"technical_skills": _STRING_LIST, "soft_skills": _STRING_LIST, "languages": _STRING_LIST}
+        },
+        "summary": _STRING
+    },
+    "required": ["name", "email", "phone", "education", "work_experience", "skills"]
+}
+
+GEMINI_SHAPE_HINT = """Reply with JSON in exactly this shape:
+{"name":"","email":"","phone":"","location":"","education":[{"degree":"","institution":"","dates":"","details":""}],"work_experience":[{"position":"","company":"","location":"","dates":"","description":[""]}],"skills":{"technical_skills":[""],"soft_skills":[""],"languages":[""]},"summary":""}"""
+
+GEMINI_INSTRUCTIONS = """You are an expert CV parser. Extract the CV below into JSON.
+- dates: "YYYY - YYYY", "YYYY - Present" or "Month YYYY - Month YYYY"
+- details: GPA, honours and similar; description: responsibilities and achievements
+- languages: spoken language proficiencies; summary: professional summary or objective
+Extract as much as possible; use "" or [] for missing fields. Output ONLY the JSON, no other text."""
+
+# spaCy worker processes used by verify_many for bulk ingestion
+SPACY_N_PROCESS = int(os.getenv("SPACY_N_PROCESS", "1"))
+
+# Reference texts that BERT compares candidate strings against
+BERT_REFERENCES = {
+    "technical": "programming languages frameworks libraries technical tools Python Java JavaScript",
+    "soft": "communication teamwork leadership time management organization interpersonal",
+    "summary": "professional summary profile about me overview career objective",
+    "responsibility": "responsible for managed developed created implemented led designed",
+}
+
+# Pattern used to recover an email address Gemini missed
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+
+# Entity labels read by _verify_with_spacy, grouped into the buckets it uses
+_ENTITY_BUCKETS = {"PERSON": "PERSON", "GPE": "LOCATION", "LOC": "LOCATION", "ORG": "ORG", "DATE": "DATE"}
+
+
+def _index_entities(doc) -> Dict[str, List[str]]:
+    """
+    Bucket the entity texts of a spaCy doc by label in a single pass over `doc.ents`.
+
+    DATE entities that look like a range ("2019 - 2021") are also collected
+    under DATE_RANGE, in document order.
+    """
+    index: Dict[str, List[str]] = {"PERSON": [], "LOCATION": [], "ORG": [], "DATE": [], "DATE_RANGE": []}
+    for ent in doc.ents:
+        bucket = _ENTITY_BUCKETS.get(ent.label_)
+        if bucket is None:
+            continue
+        text = ent.text
+        index[bucket].append(text)
+        if bucket == "DATE" and ("-" in text or "\u2013" in text):
+            index["DATE_RANGE"].append(text)
+    return index
+
+
 class HybridCVParser:
     """
     Advanced CV Parser that combines Gemini AI with spaCy NLP and BERT-based verification
     for extracting structured data from CVs.
     """
     
-    def __init__(self, api_key: Optional[str] = None, spacy_model: str = "en_core_web_sm"):
+    def __init__(self, api_key: Optional[str] = None, spacy_model: str = "en_core_web_sm",
+                 embedding_cache: Optional[EmbeddingCache] = None, bert_backend: str = BERT_BACKEND):
         """
         Initialize the hybrid CV parser with Gemini AI, spaCy, and BERT.
         
+        spaCy and BERT are loaded on first use, or up front by `load_models()`;
+        construction only checks that their files are installed.
+        
         Args:
             api_key: Google API key for Gemini. If None, tries to get from environment.
             spacy_model: Name of the spaCy model to use for NLP tasks.
+            embedding_cache: Cache for BERT vectors. If None, one is built from the
+                EMBEDDING_CACHE_* environment variables.
+            bert_backend: BERT inference backend, "torch" or "onnx-int8".
+            
+        Raises:
+            ValueError: If no API key is available.
+            MissingModelError: If the spaCy or BERT model is not installed.
         """
         # Initialize Gemini API
         self.api_key = api_key or os.environ.get("GOOGLE_API_KEY")
         if not self.api_key:
             raise ValueError("No API key provided. Set GOOGLE_API_KEY environment variable or pass api_key parameter.")
         
-        genai.configure(api_key=self.api_key)
-        self.gemini_model = genai.GenerativeModel('gemini-2.0-flash')
-        logger.info("Gemini AI initialized successfully")
+        # Fail at start-up rather than on the first request
+        check_spacy_model(spacy_model)
+        check_bert_model(BERT_MODEL_NAME)
         
-        # Initialize spaCy
-        try:
-            self.nlp = spacy.load(spacy_model)
-            logger.info(f"Loaded spaCy model: {spacy_model}")
-        except Exception as e:
-            logger.warning(f"Failed to load spaCy model {spacy_model}: {e}. Downloading...")
-            os.system(f"python -m spacy download {spacy_model}")
-            self.nlp = spacy.load(spacy_model)
+        gemini_base_url = os.environ.get("GEMINI_BASE_URL")
+        if gemini_base_url:
+            # Local Gemini-compatible server, e.g. the llm_service mock used for load tests
+            self.gemini_model = RestGenerativeModel('gemini-2.0-flash', gemini_base_url, api_key=self.api_key)
+            logger.info(f"Using Gemini-compatible endpoint at {gemini_base_url}")
+        else:
+            import google.generativeai as genai
+            
+            genai.configure(api_key=self.api_key)
+            self.gemini_model = genai.GenerativeModel('gemini-2.0-flash')
+        self.gemini_client = GeminiClient.from_env(self.gemini_model)
+        self.gemini_structured_output = GEMINI_STRUCTURED_OUTPUT
+        self.gemini_request_options = {
+            "generation_config": {"response_mime_type": "application/json", "response_schema": CV_RESPONSE_SCHEMA}
+        } if GEMINI_STRUCTURED_OUTPUT else {}
+        logger.info("Gemini AI initialized successfully")
         
-        # Initialize BERT
-        try:
-            self.bert_tokenizer = DistilBertTokenizer.from_pretrained('distilbert-base-uncased')
-            self.bert_model = DistilBertModel.from_pretrained('distilbert-base-uncased')
-            self.bert_model.eval()  # Set the model to evaluation mode
-            logger.info("Loaded BERT model successfully")
-        except Exception as e:
-            logger.error(f"Failed to load BERT model: {e}")
-            raise
+        # Rule-based parser used while Gemini is unavailable, loaded on first use
+        self.spacy_model = spacy_model
+        self._local_parser = None
+        self._local_parser_lock = threading.Lock()
+        
+        # spaCy and BERT, loaded on first use
+        self.spacy_n_process = SPACY_N_PROCESS
+        self.bert_backend = bert_backend
+        self.embedding_cache = embedding_cache
+        self._nlp = None
+        self._embedder = None
+        self._models_lock = threading.Lock()
+    
+    @property
+    def nlp(self):
+        """The spaCy pipeline, loaded on first access."""
+        if self._nlp is None:
+            with self._models_lock:
+                if self._nlp is None:
+                    self._nlp = load_spacy_pipeline(self.spacy_model)
+                    logger.info(f"Loaded spaCy model: {self.spacy_model}")
+        return self._nlp
+    
+    @property
+    def embedder(self) -> BertEmbedder:
+        """The BERT embedder with its reference prototypes, loaded on first access."""
+        if self._embedder is None:
+            with self._models_lock:
+                if self._embedder is None:
+                    tokenizer, model = load_bert(self.bert_backend)
+                    if self.embedding_cache is None:
+                        self.embedding_cache = EmbeddingCache.from_env(cache_namespace(self.bert_backend))
+                    embedder = BertEmbedder(tokenizer, model, cache=self.embedding_cache)
+                    embedder.set_prototypes(BERT_REFERENCES)
+                    self._embedder = embedder
+                    logger.info("Loaded BERT model successfully")
+        return self._embedder
+    
+    def load_models(self) -> None:
+        """Load spaCy and BERT now instead of on the first parse."""
+        self.nlp
+        self.embedder
     
     def parse(self, cv_text: str) -> Dict[str, Any]:
         """
@@ -75,34 +224,190 @@ class HybridCVParser:
         if not cv_text or not isinstance(cv_text, str):
             raise ValueError("CV text must be a non-empty string")
         
+        timings: Dict[str, float] = {}
         try:
-            logger.info("Starting CV parsing process...")
+            logger.debug("Starting CV parsing process...")
             
             # STEP 1: Initial parsing with Gemini AI
-            logger.info("Performing initial parsing with Gemini AI")
-            initial_data = self._parse_with_gemini(cv_text)
+            logger.debug("Performing initial parsing with Gemini AI")
+            try:
+                with stage_timer(timings, "gemini"):
+                    initial_data, gemini_metadata = self._parse_with_gemini(cv_text)
+                used_fallback = False
+            except GeminiUnavailableError as e:
+                logger.warning(f"Gemini unavailable, using local parser: {e}")
+                with stage_timer(timings, "local_parser"):
+                    initial_data, gemini_metadata = self._parse_with_local_parser(cv_text), None
+                used_fallback = True
             
             # STEP 2: Process with spaCy for NER verification
-            logger.info("Verifying entities with spaCy NLP")
-            spacy_doc = self.nlp(cv_text)
-            spacy_verified_data = self._verify_with_spacy(initial_data, spacy_doc)
+            logger.debug("Verifying entities with spaCy NLP")
+            with stage_timer(timings, "spacy"):
+                spacy_doc = self.nlp(cv_text)
+                spacy_verified_data = self._verify_with_spacy(initial_data, spacy_doc)
             
             # STEP 3: Enhance with BERT for higher-level semantic understanding
-            logger.info("Enhancing data with BERT transformer models")
-            enhanced_data = self._enhance_with_bert(spacy_verified_data, cv_text)
+            logger.debug("Enhancing data with BERT transformer models")
+            with stage_timer(timings, "bert"):
+                enhanced_data = self._enhance_with_bert(spacy_verified_data, cv_text)
             
             # STEP 4: Post-process and finalize the data
-            logger.info("Post-processing and finalizing data")
-            final_data = self._post_process_data(enhanced_data)
+            logger.debug("Post-processing and finalizing data")
+            with stage_timer(timings, "post_process"):
+                final_data = self._post_process_data(
+                    enhanced_data, used_fallback=used_fallback, gemini_metadata=gemini_metadata
+                )
+            stage_timings = to_milliseconds(timings)
+            final_data["metadata"]["stage_timings_ms"] = stage_timings
             
-            logger.info("Successfully parsed CV using hybrid approach")
+            logger.info(f"Parsed CV using hybrid approach, stage timings (ms): {stage_timings}")
             return final_data
             
         except Exception as e:
             logger.error(f"Error parsing CV: {e}")
             raise RuntimeError(f"Failed to parse CV: {e}")
     
-    def _parse_with_gemini(self, cv_text: str) -> Dict[str, Any]:
+    def parse_batch(self, cv_texts: List[str], batch_size: int = 16) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Parse many CVs at once.
+        
+        Gemini requests for all CVs are sent concurrently within the client's
+        limits, spaCy runs over all texts with nlp.pipe and BERT scores the
+        candidate strings of every CV together. The stage timings stored with
+        each result are the batch totals shared out evenly over its CVs.
+        
+        Args:
+            cv_texts: CV texts to parse
+            batch_size: Number of texts spaCy processes per batch
+            
+        Returns:
+            One entry per input, in order: the parsed data, or the exception
+            that made that CV fail. A failing CV never aborts the batch.
+        """
+        results: List[Union[Dict[str, Any], Exception]] = [None] * len(cv_texts)
+        timings: Dict[str, float] = {}
+        
+        # STEP 1: Initial parsing with Gemini AI
+        indices = []
+        for i, cv_text in enumerate(cv_texts):
+            if not cv_text or not isinstance(cv_text, str):
+                results[i] = ValueError("CV text must be a non-empty string")
+            else:
+                indices.append(i)
+        
+        initial_data = {}
+        gemini_metadata = {}
+        fallback_indices = set()
+        with stage_timer(timings, "gemini"):
+            prompts = [self._build_gemini_prompt(cv_texts[i]) for i in indices]
+            responses = self.gemini_client.generate_many([prompt for prompt, _ in prompts], **self.gemini_request_options)
+        for i, (_, compaction_stats), response in zip(indices, prompts, responses):
+            try:
+                if isinstance(response, GeminiUnavailableError):
+                    logger.warning(f"Gemini unavailable for CV {i + 1} of batch, using local parser: {response}")
+                    with stage_timer(timings, "local_parser"):
+                        initial_data[i] = self._parse_with_local_parser(cv_texts[i])
+                    fallback_indices.add(i)
+                elif isinstance(response, Exception):
+                    raise response
+                else:
+                    initial_data[i], gemini_metadata[i] = self._read_gemini_response(response, compaction_stats)
+            except Exception as e:
+                logger.error(f"Error parsing CV {i + 1} of batch: {e}")
+                results[i] = RuntimeError(f"Failed to parse CV: {e}")
+        
+        # STEP 2: Process with spaCy for NER verification, batched
+        indices = list(initial_data)
+        logger.info(f"Verifying entities of {len(indices)} CVs with spaCy NLP")
+        verified_data = {}
+        with stage_timer(timings, "spacy"):
+            verified = self.verify_many([initial_data[i] for i in indices], [cv_texts[i] for i in indices],
+                                        batch_size=batch_size)
+        for i, result in zip(indices, verified):
+            if isinstance(result, Exception):
+                logger.error(f"Error verifying CV {i + 1} of batch: {result}")
+                results[i] = RuntimeError(f"Failed to parse CV: {result}")
+            else:
+                verified_data[i] = result
+        
+        # STEP 3: Score the BERT candidates of every CV in one go
+        candidates = {}
+        scores = {}
+        with stage_timer(timings, "bert"):
+            for i in verified_data:
+                try:
+                    candidates[i] = self._collect_bert_candidates(verified_data[i], cv_texts[i])
+                except Exception as e:
+                    logger.error(f"Error collecting BERT candidates of CV {i + 1} of batch: {e}")
+                    results[i] = RuntimeError(f"Failed to parse CV: {e}")
+            try:
+                batch_scores = self.embedder.score([text for i in candidates for text in candidates[i]["texts"]])
+                offset = 0
+                for i in candidates:
+                    count = len(candidates[i]["texts"])
+                    scores[i] = batch_scores[offset:offset + count]
+                    offset += count
+            except Exception as e:
+                # Score the CVs one by one so that only those the embedder fails on are lost
+                logger.warning(f"Error scoring the BERT candidates of the batch, scoring each CV alone: {e}")
+                for i in candidates:
+                    try:
+                        scores[i] = self.embedder.score(candidates[i]["texts"])
+                    except Exception as e:
+                        logger.error(f"Error scoring BERT candidates of CV {i + 1} of batch: {e}")
+                        results[i] = RuntimeError(f"Failed to parse CV: {e}")
+        
+        # STEP 4: Post-process and finalize each CV
+        finished = []
+        for i in scores:
+            try:
+                with stage_timer(timings, "post_process"):
+                    enhanced_data = self._apply_bert_scores(verified_data[i], candidates[i], scores[i])
+                    results[i] = self._post_process_data(
+                        enhanced_data, used_fallback=i in fallback_indices, gemini_metadata=gemini_metadata.get(i)
+                    )
+                finished.append(i)
+            except Exception as e:
+                logger.error(f"Error post-processing CV {i + 1} of batch: {e}")
+                results[i] = RuntimeError(f"Failed to parse CV: {e}")
+        
+        stage_timings = to_milliseconds(timings, divisor=max(1, len(finished)))
+        for i in finished:
+            results[i]["metadata"]["stage_timings_ms"] = dict(stage_timings)
+        
+        logger.info(f"Parsed batch of {len(cv_texts)} CVs using hybrid approach, stage timings (ms per CV): {stage_timings}")
+        return results
+    
+    def verify_many(self, data: List[Dict[str, Any]], cv_texts: List[str], batch_size: int = 16,
+                    n_process: Optional[int] = None) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Verify many parses with spaCy, streaming the texts through nlp.pipe.
+        
+        Args:
+            data: Initially parsed data, one per CV
+            cv_texts: The matching CV texts
+            batch_size: Number of texts spaCy processes per batch
+            n_process: spaCy worker processes; defaults to SPACY_N_PROCESS
+            
+        Returns:
+            One entry per input, in order: the verified data, or the exception
+            raised while verifying it
+        """
+        n_process = n_process or self.spacy_n_process
+        # Extra processes only pay off once there is enough text to split
+        if len(cv_texts) < 2 * batch_size:
+            n_process = 1
+        
+        results: List[Union[Dict[str, Any], Exception]] = []
+        docs = self.nlp.pipe(cv_texts, batch_size=batch_size, n_process=n_process)
+        for item, doc in zip(data, docs):
+            try:
+                results.append(self._verify_with_spacy(item, doc))
+            except Exception as e:
+                results.append(e)
+        return results
+    
+    def _parse_with_gemini(self, cv_text: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         """
         Perform initial parsing with Gemini AI.
         
@@ -110,104 +415,139 @@ class HybridCVParser:
             cv_text: The CV text to parse
             
         Returns:
-            Initial parsed data from Gemini
-        """
-        # Create prompt for Gemini
-        prompt = f"""
-        You are an expert CV/resume parser that extracts structured data from curriculum vitae or resumes.
-        
-        Extract the following information from the CV text and return it in valid JSON format:
-        
-        1. name: Full name of the person
-        2. email: Email address
-        3. phone: Phone number
-        4. location: Physical location/address
-        5. education: List of education entries, each with:
-           - degree: The obtained degree or qualification
-           - institution: Name of the institution
-           - dates: Date range in format "YYYY - YYYY" or "YYYY - Present"
-           - details: Any additional details like GPA, honors, etc.
-        6. work_experience: List of work experiences, each with:
-           - position: Job title/position
-           - company: Company name
-           - location: Job location
-           - dates: Employment period in format "YYYY - YYYY" or "YYYY - Present" or "Month YYYY - Month YYYY"
-           - description: List of responsibilities and achievements
-        7. skills: List of skills, categorized if possible into:
-           - technical_skills: Technical abilities, programming languages, etc.
-           - soft_skills: Communication, teamwork, etc.
-           - languages: Language proficiencies
-        8. summary: Brief professional summary or objective if present
-        
-        CRITICAL: Output ONLY valid JSON without any explanation, preamble or other text. Follow this exact format:
-        
-        {{
-          "name": "...",
-          "email": "...",
-          "phone": "...",
-          "location": "...",
-          "education": [
-            {{
-              "degree": "...",
-              "institution": "...",
-              "dates": "...",
-              "details": "..."
-            }}
-          ],
-          "work_experience": [
-            {{
-              "position": "...",
-              "company": "...",
-              "location": "...",
-              "dates": "...",
-              "description": ["...", "...", "..."]
-            }}
-          ],
-          "skills": {{
-            "technical_skills": ["...", "...", "..."],
-            "soft_skills": ["...", "...", "..."],
-            "languages": ["...", "...", "..."]
-          }},
-          "summary": "..."
-        }}
-        
-        Extract as much relevant information as possible from the CV. If a field is not found, use an empty string or array as appropriate.
-        
-        Here's the CV text to parse:
-        
-        {cv_text}
+            Initial parsed data from Gemini and metadata about the request
+            
+        Raises:
+            GeminiUnavailableError: If Gemini failed repeatedly or the circuit is open
         """
+        prompt, compaction_stats = self._build_gemini_prompt(cv_text)
         
         # Call Gemini API
-        response = self.gemini_model.generate_content(prompt)
+        response = self.gemini_client.generate(prompt, **self.gemini_request_options)
         
-        # Extract JSON
-        json_data = self._extract_json_from_response(response.text)
-        return json_data
+        return self._read_gemini_response(response, compaction_stats)
     
-    def _extract_json_from_response(self, response_text: str) -> Dict[str, Any]:
-        """Extract JSON data from Gemini response."""
-        try:
-            # Clean up the response to extract just the JSON part
-            json_text = response_text.strip()
-            
-            # If response is wrapped in code blocks, extract just the JSON
-            if json_text.startswith("```json"):
-                json_text = json_text.split("```json", 1)[1]
-                if "```" in json_text:
-                    json_text = json_text.split("```", 1)[0]
-            elif json_text.startswith("```"):
-                json_text = json_text.split("```", 1)[1]
-                if "```" in json_text:
-                    json_text = json_text.split("```", 1)[0]
-            
-            # Parse JSON
-            data = json.loads(json_text)
-            return data
+    def _read_gemini_response(self, response, compaction_stats: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Extract the parsed data from a Gemini response.
+        
+        Returns:
+            The parsed data and metadata with the token usage and, if the JSON
+            had to be repaired, which fields were dropped
+        """
+        json_data, repaired = self._extract_json_from_response(response.text)
+        gemini_metadata = {"token_usage": self._token_usage(compaction_stats, response)}
+        if repaired:
+            json_data, dropped_fields = self._salvage_fields(json_data)
+            gemini_metadata["response_repaired"] = True
+            gemini_metadata["dropped_fields"] = dropped_fields
+            logger.warning(f"Repaired malformed Gemini response, dropped fields: {dropped_fields or 'none'}")
+        return json_data, gemini_metadata
+    
+    def _token_usage(self, compaction_stats: Dict[str, Any], response) -> Dict[str, Any]:
+        """Combine the compaction stats with the token counts Gemini reported."""
+        prompt_tokens, output_tokens = token_counts(response)
+        logger.info(
+            f"Gemini tokens: {prompt_tokens} in, {output_tokens} out "
+            f"(CV compacted from ~{compaction_stats['cv_tokens_estimated']} to ~{compaction_stats['cv_tokens_sent']})"
+        )
+        return {**compaction_stats, "prompt_tokens": prompt_tokens, "output_tokens": output_tokens}
+    
+    def _parse_with_local_parser(self, cv_text: str) -> Dict[str, Any]:
+        """
+        Initial parsing with the rule-based ImprovedResumeParser, used when
+        Gemini is degraded so that parses still finish in bounded time.
+        """
+        with self._local_parser_lock:
+            if self._local_parser is None:
+                from main import ImprovedResumeParser
+                self._local_parser = ImprovedResumeParser(model_name=self.spacy_model)
+        return self._local_parser.parse_resume(cv_text)
+    
+    def _build_gemini_prompt(self, cv_text: str) -> Tuple[str, Dict[str, Any]]:
+        """
+        Create the extraction prompt for Gemini from the compacted CV text.
+        
+        Returns:
+            The prompt and the compaction stats (estimated CV tokens before and after)
+        """
+        compacted_text, compaction_stats = compact_cv_text(cv_text, GEMINI_CV_TOKEN_BUDGET)
+        instructions = GEMINI_INSTRUCTIONS if self.gemini_structured_output else f"{GEMINI_INSTRUCTIONS}\n{GEMINI_SHAPE_HINT}"
+        return f"{instructions}\n\nCV text to parse:\n{compacted_text}", compaction_stats
+    
+    def _extract_json_from_response(self, response_text: str) -> Tuple[Dict[str, Any], bool]:
+        """
+        Extract JSON data from Gemini response.
+        
+        Malformed or truncated JSON is repaired as far as possible rather than
+        failing the whole parse.
+        
+        Returns:
+            The parsed data and whether it had to be repaired
             
-        except json.JSONDecodeError as e:
+        Raises:
+            ValueError: If the response holds no JSON object at all
+        """
+        try:
+            data, repaired = parse_json_tolerant(response_text)
+        except ValueError as e:
             logger.error(f"Failed to parse JSON from Gemini response: {e}")
             raise ValueError(f"Invalid JSON response from Gemini: {e}")
+        
+        if not isinstance(data, dict):
+            raise ValueError("Invalid JSON response from Gemini: expected an object")
+        return data, repaired
+    
+    def _salvage_fields(self, data: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Keep the fields of a repaired response that have the expected types.
+        
+        Returns:
+            The usable data and the names of the fields that were dropped
+            
+        Raises:
+            ValueError: If no usable field is left
+        """
+        salvaged: Dict[str, Any] = {}
+        dropped = []
+        
+        for field in ("name", "email", "phone", "location", "summary"):
+            value = data.get(field)
+            if isinstance(value, (str, int, float)) and not isinstance(value, bool):
+                salvaged[field] = str(value)
+            elif value is not None:
+                dropped.append(field)
+        
+        for field in ("education", "work_experience"):
+            value = data.get(field)
+            if isinstance(value, list):
+                # A null field is empty and a number is text; other types are dropped
+                entries = [
+                    {k: "" if v is None else v if isinstance(v, (str, list)) else str(v)
+                     for k, v in entry.items()
+                     if v is None or isinstance(v, (str, list, int, float)) and not isinstance(v, bool)}
+                    for entry in value if isinstance(entry, dict) and entry
+                ]
+                if len(entries) < len(value):
+                    dropped.append(f"{field}[partial]")
+                salvaged[field] = entries
+            elif value is not None:
+                dropped.append(field)
+        
+        skills = data.get("skills")
+        if isinstance(skills, dict):
+            salvaged["skills"] = {
+                kind: [s for s in values if isinstance(s, str)]
+                for kind, values in skills.items() if isinstance(values, list)
+            }
+        elif isinstance(skills, list):
+            salvaged["skills"] = [s for s in skills if isinstance(s, str)]
+        elif skills is not None:
+            dropped.append("skills")
+        
+        if not any(salvaged.values()):
+            raise ValueError("Gemini response contained no usable fields")
+        return salvaged, dropped
     
     def _verify_with_spacy(self, data: Dict[str, Any], doc) -> Dict[str, Any]:
         """
@@ -221,63 +561,53 @@ class HybridCVParser:
             Verified data with spaCy
         """
         verified_data = data.copy()
+        entities = _index_entities(doc)
         
         # Verify name using PERSON entity
         if not verified_data.get("name"):
-            person_entities = [ent.text for ent in doc.ents if ent.label_ == "PERSON"]
+            person_entities = entities["PERSON"]
             if person_entities:
                 verified_data["name"] = person_entities[0]
-                logger.info(f"spaCy identified name: {person_entities[0]}")
+                logger.debug(f"spaCy identified name: {person_entities[0]}")
         
         # Verify email using pattern recognition in spaCy
         if not verified_data.get("email"):
-            import re
-            email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-            emails = re.findall(email_pattern, doc.text)
-            if emails:
-                verified_data["email"] = emails[0]
-                logger.info(f"spaCy pattern matching identified email: {emails[0]}")
+            match = EMAIL_PATTERN.search(doc.text)
+            if match:
+                verified_data["email"] = match.group(0)
+                logger.debug(f"spaCy pattern matching identified email: {match.group(0)}")
         
         # Verify location using GPE entities
         if not verified_data.get("location"):
-            locations = [ent.text for ent in doc.ents if ent.label_ in ["GPE", "LOC"]]
+            locations = entities["LOCATION"]
             if locations:
                 verified_data["location"] = ", ".join(locations[:2])
-                logger.info(f"spaCy identified location: {verified_data['location']}")
+                logger.debug(f"spaCy identified location: {verified_data['location']}")
         
         # Verify organizations for education and work experience
-        orgs = [ent.text for ent in doc.ents if ent.label_ == "ORG"]
+        orgs = entities["ORG"]
         if orgs:
             # Check if any organizations are missing in education
             for i, edu in enumerate(verified_data.get("education", [])):
                 if not edu.get("institution") and i < len(orgs):
                     verified_data["education"][i]["institution"] = orgs[i]
-                    logger.info(f"spaCy identified educational institution: {orgs[i]}")
+                    logger.debug(f"spaCy identified educational institution: {orgs[i]}")
             
             # Check if any organizations are missing in work experience
             for i, work in enumerate(verified_data.get("work_experience", [])):
                 if not work.get("company") and i < len(orgs):
                     verified_data["work_experience"][i]["company"] = orgs[i]
-                    logger.info(f"spaCy identified company: {orgs[i]}")
-        
-        # Verify dates
-        dates = [ent.text for ent in doc.ents if ent.label_ == "DATE"]
-        if dates:
-            # Try to match date patterns for experience and education
-            for date in dates:
-                if "-" in date or "–" in date:  # Looks like a date range
-                    # Find entries without dates
-                    for exp in verified_data.get("work_experience", []):
-                        if not exp.get("dates"):
-                            exp["dates"] = date
-                            logger.info(f"spaCy identified work date range: {date}")
-                            break
-                    
-                    for edu in verified_data.get("education", []):
-                        if not edu.get("dates"):
-                            edu["dates"] = date
-                            logger.info(f"spaCy identified education date range: {date}")
-                            break
+                    logger.debug(f"spaCy identified company: {orgs[i]}")
+        
+        # Verify dates: the n-th date range found goes to the n-th undated work
+        # entry and the n-th undated education entry, in document order
+        date_ranges = entities["DATE_RANGE"]
+        if date_ranges:
+            for section, label in (("work_experience", "work"), ("education", "education")):
+                undated = [entry for entry in verified_data.get(section, []) if not entry.get("dates")]
+                for entry, date in zip(undated, date_ranges):
+                    entry["dates"] = date
+                    logger.debug(f"spaCy identified {label} date range: {date}")
         
         return verified_data
     
@@ -291,14 +621,7 @@ class HybridCVParser:
         Returns:
             NumPy array of embeddings
         """
-        # Tokenize and get BERT embeddings
-        tokens = self.bert_tokenizer(text, return_tensors="pt", padding=True, truncation=True, max_length=512)
-        with torch.no_grad():
-            outputs = self.bert_model(**tokens)
-        
-        # Get the [CLS] token embedding (represents the entire sequence)
-        embeddings = outputs.last_hidden_state[:, 0, :].numpy()
-        return embeddings[0]  # Return as a 1D array
+        return self.embedder.embed([text])[0]  # Return as a 1D array
     
     def _compute_similarity(self, text1: str, text2: str) -> float:
         """
@@ -311,48 +634,97 @@ class HybridCVParser:
         Returns:
             Similarity score (0-1)
         """
-        # Get embeddings
-        emb1 = self._get_bert_embeddings(text1)
-        emb2 = self._get_bert_embeddings(text2)
-        
-        # Compute cosine similarity
-        similarity = np.dot(emb1, emb2) / (np.linalg.norm(emb1) * np.linalg.norm(emb2))
-        return similarity
+        # Embed both texts in a single forward pass
+        emb1, emb2 = self.embedder.embed_normalized([text1, text2])
+        return float(np.dot(emb1, emb2))
     
     def _enhance_with_bert(self, data: Dict[str, Any], cv_text: str) -> Dict[str, Any]:
         """
         Enhance parsed data using BERT for semantic understanding.
         
+        All candidate strings of the resume are embedded together in padded batches
+        and scored against the cached reference prototypes in one matrix product.
+        
+        Args:
+            data: Verified data from spaCy
+            cv_text: Original CV text
+            
+        Returns:
+            Enhanced data with BERT
+        """
+        candidates = self._collect_bert_candidates(data, cv_text)
+        scores = self.embedder.score(candidates["texts"])
+        return self._apply_bert_scores(data, candidates, scores)
+    
+    def _collect_bert_candidates(self, data: Dict[str, Any], cv_text: str) -> Dict[str, Any]:
+        """
+        Collect every string of a resume that BERT needs to score.
+        
         Args:
             data: Verified data from spaCy
             cv_text: Original CV text
             
+        Returns:
+            Dict with the skills, summary paragraphs and (position, bullet, text)
+            descriptions, plus all of them flattened under "texts"
+        """
+        skills = []
+        if "skills" in data and isinstance(data["skills"], list):
+            skills = list(data["skills"])
+        
+        paragraphs = []
+        if not data.get("summary"):
+            # Find paragraphs that might be summaries
+            paragraphs = [para for para in cv_text.split("\n\n") if 20 < len(para) < 500]
+        
+        descriptions = []
+        for i, exp in enumerate(data.get("work_experience", [])):
+            # Check if descriptions are in first person or bullets
+            if isinstance(exp.get("description"), list) and exp["description"]:
+                for j, desc in enumerate(exp["description"]):
+                    descriptions.append((i, j, desc))
+        
+        return {
+            "skills": skills,
+            "paragraphs": paragraphs,
+            "descriptions": descriptions,
+            "texts": skills + paragraphs + [desc for _, _, desc in descriptions]
+        }
+    
+    def _apply_bert_scores(self, data: Dict[str, Any], candidates: Dict[str, Any], scores: np.ndarray) -> Dict[str, Any]:
+        """
+        Apply prototype similarity scores to the parsed data.
+        
+        Args:
+            data: Verified data from spaCy
+            candidates: Output of _collect_bert_candidates for the same data
+            scores: Rows of embedder.score() for candidates["texts"]
+            
         Returns:
             Enhanced data with BERT
         """
         enhanced_data = data.copy()
+        skills = candidates["skills"]
+        paragraphs = candidates["paragraphs"]
+        columns = {name: k for k, name in enumerate(self.embedder.prototype_names)}
+        skill_scores = scores[:len(skills)]
+        paragraph_scores = scores[len(skills):len(skills) + len(paragraphs)]
+        description_scores = scores[len(skills) + len(paragraphs):]
         
         # Use BERT to classify skills into technical vs soft skills if not already classified
         if "skills" in enhanced_data and isinstance(enhanced_data["skills"], list):
-            logger.info("Using BERT to classify skills")
+            logger.debug("Using BERT to classify skills")
             technical_skills = []
             soft_skills = []
             
-            # Example technical and soft skill references for comparison
-            tech_reference = "programming languages frameworks libraries technical tools Python Java JavaScript"
-            soft_reference = "communication teamwork leadership time management organization interpersonal"
-            
-            for skill in enhanced_data["skills"]:
+            for skill, row in zip(skills, skill_scores):
                 # Compare skill to technical and soft skill references
-                tech_similarity = self._compute_similarity(skill, tech_reference)
-                soft_similarity = self._compute_similarity(skill, soft_reference)
-                
-                if tech_similarity > soft_similarity:
+                if row[columns["technical"]] > row[columns["soft"]]:
                     technical_skills.append(skill)
-                    logger.info(f"BERT classified '{skill}' as technical skill")
+                    logger.debug(f"BERT classified '{skill}' as technical skill")
                 else:
                     soft_skills.append(skill)
-                    logger.info(f"BERT classified '{skill}' as soft skill")
+                    logger.debug(f"BERT classified '{skill}' as soft skill")
             
             # Replace flat list with categorized skills
             enhanced_data["skills"] = {
@@ -363,48 +735,36 @@ class HybridCVParser:
         
         # Use BERT to extract or verify summary if missing
         if not enhanced_data.get("summary"):
-            logger.info("Using BERT to identify professional summary")
-            
-            # Find paragraphs that might be summaries
-            paragraphs = cv_text.split("\n\n")
-            summary_reference = "professional summary profile about me overview career objective"
+            logger.debug("Using BERT to identify professional summary")
             
-            best_score = 0
-            best_summary = ""
-            
-            for para in paragraphs:
-                if 20 < len(para) < 500:  # Reasonable summary length
-                    similarity = self._compute_similarity(para, summary_reference)
-                    if similarity > best_score:
-                        best_score = similarity
-                        best_summary = para
-            
-            if best_score > 0.5:  # Only use if reasonably confident
-                enhanced_data["summary"] = best_summary
-                logger.info(f"BERT identified summary with confidence {best_score:.2f}")
+            if paragraphs:
+                summary_similarity = paragraph_scores[:, columns["summary"]]
+                best = int(np.argmax(summary_similarity))
+                best_score = float(summary_similarity[best])
+                
+                if best_score > 0.5:  # Only use if reasonably confident
+                    enhanced_data["summary"] = paragraphs[best]
+                    logger.debug(f"BERT identified summary with confidence {best_score:.2f}")
         
         # Use BERT to verify job descriptions
-        for i, exp in enumerate(enhanced_data.get("work_experience", [])):
-            # Check if descriptions are in first person or bullets
-            if isinstance(exp.get("description"), list) and exp["description"]:
-                for j, desc in enumerate(exp["description"]):
-                    # Verify if it's a likely job responsibility
-                    resp_reference = "responsible for managed developed created implemented led designed"
-                    similarity = self._compute_similarity(desc, resp_reference)
-                    
-                    if similarity > 0.5:
-                        logger.info(f"BERT verified job description {j+1} for position {i+1}")
-                    else:
-                        logger.info(f"BERT flagged job description {j+1} for position {i+1} as suspicious")
+        for (i, j, _), row in zip(candidates["descriptions"], description_scores):
+            # Verify if it's a likely job responsibility
+            if row[columns["responsibility"]] > 0.5:
+                logger.debug(f"BERT verified job description {j+1} for position {i+1}")
+            else:
+                logger.debug(f"BERT flagged job description {j+1} for position {i+1} as suspicious")
         
         return enhanced_data
     
-    def _post_process_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def _post_process_data(self, data: Dict[str, Any], used_fallback: bool = False,
+                           gemini_metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Post-process and finalize the data.
         
         Args:
             data: Enhanced data from BERT
+            used_fallback: Whether the initial parse came from the local parser
+            gemini_metadata: Token usage and repair details of the Gemini request
             
         Returns:
             Final processed data
@@ -412,11 +772,15 @@ class HybridCVParser:
         # Initialize result with metadata
         result = {
             "metadata": {
-                "parser_version": "3.0-hybrid",
-                "parsing_method": "gemini-spacy-bert",
+                "parser_version": PARSER_VERSION,
+                "parsing_method": "local-spacy-bert" if used_fallback else "gemini-spacy-bert",
                 "processed_at": self._get_current_timestamp()
             }
         }
+        if used_fallback:
+            result["metadata"]["gemini_fallback"] = True
+        if gemini_metadata:
+            result["metadata"].update(gemini_metadata)
         
         # Clean and process contact information
         result["name"] = self._clean_text(data.get("name", ""))
@@ -489,7 +853,7 @@ class HybridCVParser:
         # Add model usage information
         result["metadata"]["model_usage"] = {
             "spacy_model": self.nlp.meta["name"],
-            "bert_model": "bert-base-uncased",
+            "bert_model": BERT_MODEL_NAME,
             "gemini_model": "gemini-1.5-pro"
         }
         
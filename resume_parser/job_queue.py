@@ -0,0 +1,286 @@
+"""
+Durable SQLite-backed queue of parse jobs and the background workers that drain it.
+
+Uploads are spooled to disk and only a row is written per job, so `/parse` can
+return as soon as the file is stored while the heavy pipeline runs elsewhere.
+"""
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from enum import Enum
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ParseJobQueue:
+    """
+    Job table plus a spool directory for the raw upload bytes.
+
+    Claiming uses `BEGIN IMMEDIATE`, so several service processes can share the
+    same database file without handing one job to two workers.
+    """
+
+    def __init__(self, directory: str, lease_seconds: float = 600, max_attempts: int = 3):
+        """
+        Initialize the queue, creating the database and spool directory if needed.
+
+        Args:
+            directory: Directory holding `jobs.db` and the `uploads/` spool.
+            lease_seconds: How long a running job may go without finishing before
+                it is considered abandoned and handed out again.
+            max_attempts: How often a job may be claimed. An abandoned job that
+                used them all, e.g. because it crashes its worker, fails instead.
+        """
+        self.directory = directory
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.spool_dir = os.path.join(directory, "uploads")
+        os.makedirs(self.spool_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            os.path.join(directory, "jobs.db"),
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=30
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS parse_jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                spool_path TEXT,
+                result TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_parse_jobs_status ON parse_jobs (status, created_at)")
+        self._new_job = threading.Event()
+
+    def enqueue(self, payload: Dict[str, Any], data: Union[bytes, BinaryIO]) -> str:
+        """
+        Spool the upload and add a queued job.
+
+        Args:
+            payload: JSON-serialisable job parameters (filename, job_id, ...)
+            data: Raw upload bytes, or a binary file object that is streamed to disk
+
+        Returns:
+            The new parse job id
+        """
+        job_id = uuid.uuid4().hex
+        spool_path = os.path.join(self.spool_dir, job_id)
+        with open(spool_path, "wb") as f:
+            if isinstance(data, bytes):
+                f.write(data)
+            else:
+                shutil.copyfileobj(data, f)
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO parse_jobs (id, status, payload, spool_path, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, JobStatus.QUEUED.value, json.dumps(payload), spool_path, now, now)
+            )
+        self._new_job.set()
+        return job_id
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """
+        Atomically take the oldest queued job, or an abandoned running one.
+        Abandoned jobs out of attempts are marked failed on the way.
+
+        Returns:
+            The claimed job, or None if nothing is waiting
+        """
+        now = time.time()
+        exhausted = []
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                while True:
+                    row = self._conn.execute(
+                        "SELECT * FROM parse_jobs WHERE status = ? OR (status = ? AND updated_at < ?) "
+                        "ORDER BY created_at LIMIT 1",
+                        (JobStatus.QUEUED.value, JobStatus.RUNNING.value, now - self.lease_seconds)
+                    ).fetchone()
+                    if row is None or row["attempts"] < self.max_attempts:
+                        break
+                    self._conn.execute(
+                        "UPDATE parse_jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?",
+                        (JobStatus.FAILED.value, f"Abandoned after {row['attempts']} attempts", now, row["id"])
+                    )
+                    exhausted.append(row["id"])
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE parse_jobs SET status = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                        (JobStatus.RUNNING.value, now, row["id"])
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        for job_id in exhausted:
+            logger.error(f"Parse job {job_id} failed: abandoned after {self.max_attempts} attempts")
+            self._discard_spool(job_id)
+        if row is None:
+            return None
+        job = self._row_to_job(row)
+        job["status"] = JobStatus.RUNNING.value
+        job["attempts"] += 1
+        return job
+
+    def read_data(self, job: Dict[str, Any]) -> bytes:
+        """Load the spooled upload bytes of a job."""
+        with open(job["spool_path"], "rb") as f:
+            return f.read()
+
+    def update_progress(self, job_id: str, progress: Dict[str, Any]) -> None:
+        """Store intermediate results of a running job; also renews its lease."""
+        self._update(job_id, JobStatus.RUNNING, result=progress)
+
+    def complete(self, job_id: str, result: Dict[str, Any]) -> None:
+        self._update(job_id, JobStatus.COMPLETED, result=result)
+        self._discard_spool(job_id)
+
+    def fail(self, job_id: str, error: str) -> None:
+        self._update(job_id, JobStatus.FAILED, error=error)
+        self._discard_spool(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a job by id."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM parse_jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row is not None else None
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs per status."""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM parse_jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def wait_for_job(self, timeout: float) -> None:
+        """Block until a job is enqueued in this process or `timeout` elapses."""
+        self._new_job.wait(timeout)
+        self._new_job.clear()
+
+    def wake(self) -> None:
+        """Wake any worker blocked in `wait_for_job`."""
+        self._new_job.set()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _update(self, job_id: str, status: JobStatus, result: Optional[Dict[str, Any]] = None,
+                error: Optional[str] = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE parse_jobs SET status = ?, result = COALESCE(?, result), error = ?, updated_at = ? WHERE id = ?",
+                (status.value, json.dumps(result, default=str) if result is not None else None, error, time.time(), job_id)
+            )
+
+    def _discard_spool(self, job_id: str) -> None:
+        try:
+            os.remove(os.path.join(self.spool_dir, job_id))
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "id": row["id"],
+            "status": row["status"],
+            "payload": json.loads(row["payload"]),
+            "spool_path": row["spool_path"],
+            "result": json.loads(row["result"]) if row["result"] else None,
+            "error": row["error"],
+            "attempts": row["attempts"],
+            "created_at": datetime.fromtimestamp(row["created_at"]).isoformat(),
+            "updated_at": datetime.fromtimestamp(row["updated_at"]).isoformat()
+        }
+
+
+class ParseWorkerPool:
+    """Background threads that claim jobs from a ParseJobQueue and run a handler on them."""
+
+    def __init__(self, job_queue: ParseJobQueue, handler: Callable[[Dict[str, Any]], Dict[str, Any]],
+                 workers: int = 1, poll_interval: float = 1.0, ready: Optional[Callable[[], bool]] = None):
+        """
+        Initialize the worker pool.
+
+        Args:
+            job_queue: Queue to drain.
+            handler: Called with the claimed job; returns the job result. The
+                upload is available through `job_queue.read_data(job)` or
+                directly at `job["spool_path"]`.
+            workers: Number of worker threads.
+            poll_interval: Seconds between polls when the queue is empty.
+            ready: Optional check that must pass before jobs are claimed,
+                e.g. that the parser models are loaded.
+        """
+        self.job_queue = job_queue
+        self.handler = handler
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.ready = ready or (lambda: True)
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        self._stop.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"parse-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Started {self.workers} parse worker(s)")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        self.job_queue.wake()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if not self.ready():
+                self._stop.wait(self.poll_interval)
+                continue
+
+            job = self.job_queue.claim()
+            if job is None:
+                self.job_queue.wait_for_job(self.poll_interval)
+                continue
+
+            try:
+                result = self.handler(job)
+                self.job_queue.complete(job["id"], result)
+                logger.info(f"Parse job {job['id']} completed")
+            except Exception as e:
+                error = getattr(e, "detail", None) or str(e)
+                logger.error(f"Parse job {job['id']} failed: {error}")
+                self.job_queue.fail(job["id"], str(error))
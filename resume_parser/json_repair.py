@@ -0,0 +1,259 @@
+"""
+Tolerant JSON parsing for LLM responses.
+
+A response that is truncated, wrapped in prose or code fences, or slightly
+malformed (trailing commas, single quotes, missing commas, Python literals)
+is parsed as far as it is readable instead of failing outright. Whatever
+cannot be read is dropped, so the caller can keep the valid fields.
+"""
+import json
+import re
+from typing import Any, Tuple
+
+_CODE_FENCE = re.compile(r"```(?:json|JSON)?\s*(.*?)(?:```|$)", re.DOTALL)
+_NUMBER = re.compile(r"-?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+_BARE_WORD = re.compile(r"[A-Za-z_$][\w$-]*")
+_LITERALS = {"true": True, "false": False, "null": None, "True": True, "False": False, "None": None}
+_ESCAPES = {'"': '"', "'": "'", "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class _Incomplete(Exception):
+    """The input ended inside a value"""
+    pass
+
+
+class _LenientParser:
+    """Recursive-descent JSON parser that recovers from common LLM mistakes."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.pos = 0
+        self.repaired = False
+
+    def parse(self) -> Any:
+        self._skip_space()
+        value = self._value()
+        self._skip_space()
+        if self.pos < len(self.text):
+            # Trailing prose after the JSON document
+            self.repaired = True
+        return value
+
+    def _skip_space(self) -> None:
+        text, pos = self.text, self.pos
+        while pos < len(text):
+            if text[pos].isspace():
+                pos += 1
+            elif text.startswith("//", pos):
+                end = text.find("\n", pos)
+                pos = len(text) if end == -1 else end
+                self.repaired = True
+            else:
+                break
+        self.pos = pos
+
+    def _peek(self) -> str:
+        if self.pos >= len(self.text):
+            raise _Incomplete()
+        return self.text[self.pos]
+
+    def _value(self) -> Any:
+        self._skip_space()
+        char = self._peek()
+        if char == "{":
+            return self._object()
+        if char == "[":
+            return self._array()
+        if char in "\"'":
+            return self._string()
+        match = _NUMBER.match(self.text, self.pos)
+        if match:
+            self.pos = match.end()
+            number = match.group(0)
+            return float(number) if any(c in number for c in ".eE") else int(number)
+        match = _BARE_WORD.match(self.text, self.pos)
+        if match:
+            self.pos = match.end()
+            word = match.group(0)
+            if word in _LITERALS:
+                if word not in ("true", "false", "null"):
+                    self.repaired = True
+                return _LITERALS[word]
+            # Unquoted string value
+            self.repaired = True
+            return word
+        raise ValueError(f"Unexpected character {char!r} at position {self.pos}")
+
+    def _string(self) -> str:
+        quote = self.text[self.pos]
+        if quote != '"':
+            self.repaired = True
+        self.pos += 1
+        chars = []
+        text = self.text
+        while self.pos < len(text):
+            char = text[self.pos]
+            if char == quote:
+                self.pos += 1
+                return "".join(chars)
+            if char == "\\":
+                if self.pos + 1 >= len(text):
+                    break
+                escape = text[self.pos + 1]
+                if escape == "u" and self.pos + 6 <= len(text):
+                    try:
+                        chars.append(chr(int(text[self.pos + 2:self.pos + 6], 16)))
+                        self.pos += 6
+                        continue
+                    except ValueError:
+                        pass
+                chars.append(_ESCAPES.get(escape, escape))
+                self.pos += 2
+                continue
+            if char == "\n" and quote == '"':
+                # Raw newline inside a string
+                self.repaired = True
+            chars.append(char)
+            self.pos += 1
+        raise _Incomplete()
+
+    def _key(self) -> str:
+        char = self._peek()
+        if char in "\"'":
+            return self._string()
+        match = _BARE_WORD.match(self.text, self.pos)
+        if not match:
+            raise ValueError(f"Expected an object key at position {self.pos}")
+        self.repaired = True
+        self.pos = match.end()
+        return match.group(0)
+
+    def _object(self) -> dict:
+        self.pos += 1
+        result = {}
+        while True:
+            self._skip_space()
+            try:
+                char = self._peek()
+                if char == "}":
+                    self.pos += 1
+                    return result
+                if char == ",":
+                    # Leading, doubled or trailing comma
+                    self.repaired = True
+                    self.pos += 1
+                    continue
+                key = self._key()
+                self._skip_space()
+                if self._peek() != ":":
+                    raise ValueError(f"Expected ':' at position {self.pos}")
+                self.pos += 1
+                value = self._value()
+            except _Incomplete:
+                # Truncated: keep the complete members, drop the partial one
+                self.repaired = True
+                self.pos = len(self.text)
+                return result
+            except ValueError:
+                # Unreadable member: keep what was read and skip to the end of this object
+                self.repaired = True
+                self._skip_to_close("}")
+                return result
+            result[key] = value
+            self._expect_separator("}")
+
+    def _array(self) -> list:
+        self.pos += 1
+        result = []
+        while True:
+            self._skip_space()
+            try:
+                char = self._peek()
+                if char == "]":
+                    self.pos += 1
+                    return result
+                if char == ",":
+                    self.repaired = True
+                    self.pos += 1
+                    continue
+                value = self._value()
+            except _Incomplete:
+                self.repaired = True
+                self.pos = len(self.text)
+                return result
+            except ValueError:
+                self.repaired = True
+                self._skip_to_close("]")
+                return result
+            result.append(value)
+            self._expect_separator("]")
+
+    def _expect_separator(self, closing: str) -> None:
+        self._skip_space()
+        if self.pos >= len(self.text):
+            return
+        char = self.text[self.pos]
+        if char == ",":
+            self.pos += 1
+        elif char != closing:
+            # Missing comma between members
+            self.repaired = True
+
+    def _skip_to_close(self, closing: str) -> None:
+        """Move past the bracket closing the current container, honouring nesting and strings."""
+        depth = 0
+        in_string = None
+        text = self.text
+        while self.pos < len(text):
+            char = text[self.pos]
+            self.pos += 1
+            if in_string:
+                if char == "\\":
+                    self.pos += 1
+                elif char == in_string:
+                    in_string = None
+            elif char in "\"'":
+                in_string = char
+            elif char in "{[":
+                depth += 1
+            elif char in "}]":
+                if depth == 0:
+                    return
+                depth -= 1
+
+
+def parse_json_tolerant(text: str) -> Tuple[Any, bool]:
+    """
+    Parse a JSON document out of an LLM response, repairing it where needed.
+
+    Args:
+        text: Raw response text, possibly with code fences or surrounding prose
+
+    Returns:
+        The parsed value and whether any repair was needed
+
+    Raises:
+        ValueError: If no JSON object or array can be found at all
+    """
+    stripped = text.strip()
+    try:
+        return json.loads(stripped), False
+    except json.JSONDecodeError:
+        pass
+
+    fenced = _CODE_FENCE.search(stripped)
+    candidate = fenced.group(1) if fenced else stripped
+    try:
+        return json.loads(candidate), False
+    except json.JSONDecodeError:
+        pass
+
+    starts = [i for i in (candidate.find("{"), candidate.find("[")) if i != -1]
+    if not starts:
+        raise ValueError("No JSON object found in response")
+    parser = _LenientParser(candidate[min(starts):])
+    try:
+        value = parser.parse()
+    except _Incomplete:
+        raise ValueError("Response ended before any JSON value was complete")
+    return value, True
@@ -1,11 +1,14 @@
 import re
+import string
 import spacy
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, List, Any, Optional, Tuple
 import json
 import logging
 from datetime import datetime
 from pathlib import Path
 
+from skill_taxonomy import SkillTaxonomy
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -17,6 +20,246 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Whitespace and colons after a section header, up to the end of its line
+SECTION_HEADER_TAIL = re.compile(r'[\s:]*(?:\n|$)')
+
+# Headers that always mark their section, wherever they first occur
+PINNED_SECTION_HEADERS = {
+    "experience": ("CAREER HISTORY", "PROFESSIONAL EXPERIENCE"),
+    "skills": ("TECHNICAL COMPETENCIES",)
+}
+
+
+def compile_section_headers(section_headers: Dict[str, List[str]]):
+    """
+    Compile every section header into one case-insensitive alternation.
+    
+    A header only counts on a line of its own, trailing whitespace and colons
+    aside, so at most one alternative can match at any position and one scan
+    finds every header. Headers listed under several sections (e.g. PROFILE)
+    map to all of them, in table order.
+    
+    Returns:
+        The compiled pattern and, by group name, the canonical header and its sections
+    """
+    sections_by_header: Dict[str, List[str]] = {}
+    for section_name, headers in section_headers.items():
+        for header in headers:
+            sections_by_header.setdefault(header.upper(), []).append(section_name)
+    
+    headers = sorted(sections_by_header, key=len, reverse=True)
+    alternation = '|'.join(f'(?P<h{i}>{re.escape(header)})' for i, header in enumerate(headers))
+    pattern = re.compile(r'(?<![^\n])(?:' + alternation + r')(?=[\s:]*(?:\n|$))', re.IGNORECASE)
+    groups = {f'h{i}': (header, sections_by_header[header]) for i, header in enumerate(headers)}
+    return pattern, groups
+
+
+# Patterns of _preprocess_text, compiled once
+EMAIL_BEFORE_PHONE_LABEL = re.compile(r'([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,})(Phone|Tel|Mobile|Contact|Cell)')
+# Whitespace runs, and the gaps in CamelCase-like transitions; both become one space
+WHITESPACE_OR_CASE_CHANGE = re.compile(r'\s+|(?<=[a-z])(?=[A-Z])')
+# Fields run together after "." or ":", and dates glued to the text before them; both get a line break
+FIELD_OR_DATE_BOUNDARY = re.compile(r'([.:])(?=[A-Z])|(\S)(\d{4}\s*[-–—]\s*(?:\d{4}|Present|Current))')
+# Zero-width and byte order marks are dropped, en and em dashes become hyphens
+INVISIBLE_CHARACTERS = {'\u200b': None, '\ufeff': None, '\u200e': None}
+NORMALIZED_CHARACTERS = str.maketrans({**INVISIBLE_CHARACTERS, '–': '-', '—': '-'})
+# With line breaks kept, no-break spaces become spaces and dashes are kept: the
+# layout parser tells fields apart by en and em dashes
+LINE_CHARACTERS = str.maketrans({**INVISIBLE_CHARACTERS, '\xa0': ' '})
+
+# Folds text the way re.IGNORECASE compares it to the ASCII section headers:
+# besides A-Z, dotted and dotless I, long S and the Kelvin sign match letters
+HEADER_CASE_FOLD = str.maketrans(string.ascii_uppercase + '\u0130\u0131\u017f\u212a',
+                                 string.ascii_lowercase + 'iisk')
+
+
+def compile_header_breaks(section_headers: Dict[str, List[str]]):
+    """
+    Compile the header line-breaking substitutions of _preprocess_text.
+    
+    Returns:
+        For every header in table order, its case-folded text and its substitution
+    """
+    return [
+        (header.lower(), re.compile(r'(?<!\n)(' + re.escape(header) + r')(?:[\s:]*)(?:\n|$)', re.IGNORECASE))
+        for headers in section_headers.values()
+        for header in headers
+    ]
+
+# Skill validation rules, compiled once and shared by every parser
+# Proficiency indicators such as "(Advanced)" are ignored
+SKILL_PROFICIENCY = re.compile(r'\([^)]*\)')
+# Any of these anywhere in a skill rejects it
+SKILL_REJECTION = re.compile('|'.join([
+    r'^\d+$',  # Just numbers
+    r'^[^a-zA-Z]+$',  # No letters
+    r'^(?:and|or|the|a|an|in|at|by|to|for|with|from)$',  # Common words
+    r'^(?:present|current|details|responsibilities|role|company|period)$',  # Resume section words
+    r'@',  # Email addresses
+    r'^\+?\d+',  # Phone numbers
+    r'(?:street|road|lane|avenue|drive)',  # Address components
+    r'(?:january|february|march|april|may|june|july|august|september|october|november|december)',  # Months
+    r'(?:university|college|institute|school)',  # Education institutions
+    r'(?:gpa|cgpa|grade)',  # Academic terms
+    r'[^\x00-\x7F]+',  # Non-ASCII characters
+    r'(?:http|www)',  # URLs
+    r'(?:linkedin|github)',  # Social media
+]), re.IGNORECASE)
+# Skills outside COMMON_SKILLS must not contain other characters
+SKILL_SPECIAL_CHARACTERS = re.compile(r'[^a-zA-Z0-9\s\-\+#]')
+# Common programming languages, frameworks and tools, lower-cased
+COMMON_SKILLS = frozenset({
+    'python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'php', 'sql',
+    'html', 'css', 'react', 'angular', 'vue', 'node', 'django', 'flask',
+    'spring', 'docker', 'kubernetes', 'aws', 'azure', 'git', 'linux',
+    'agile', 'scrum', 'jira', 'jenkins', 'maven', 'junit', 'selenium',
+    'rest', 'api', 'json', 'xml', 'nosql', 'mongodb', 'postgresql',
+    'mysql', 'oracle', 'redis', 'elasticsearch', 'typescript', 'golang',
+    'rust', 'scala', 'kotlin', 'swift', 'objective-c', 'perl', 'shell',
+    'bash', 'powershell', 'terraform', 'ansible', 'puppet', 'chef',
+    'ci/cd', 'devops', 'microservices', 'restful', 'graphql', 'grpc',
+    'oauth', 'jwt', 'saml', 'ldap', 'ssl/tls', 'nginx', 'apache',
+    'webpack', 'babel', 'sass', 'less', 'bootstrap', 'material-ui',
+    'jquery', 'redux', 'vuex', 'rxjs', 'numpy', 'pandas', 'scipy',
+    'tensorflow', 'pytorch', 'keras', 'scikit-learn', 'matplotlib',
+    'seaborn', 'tableau', 'power bi', 'hadoop', 'spark', 'kafka',
+    'rabbitmq', 'redis', 'memcached', 'websocket', 'socket.io',
+    'webrtc', 'opencv', 'unity', 'unreal', 'android', 'ios', 'flutter',
+    'react native', 'xamarin', 'cordova', 'ionic', 'electron'
+})
+
+
+def is_valid_skill(skill: str) -> bool:
+    """
+    Validate a skill entry.
+    
+    Args:
+        skill (str): Skill to validate
+        
+    Returns:
+        bool: True if skill is valid, False otherwise
+    """
+    if not skill:
+        return False
+    
+    # Remove proficiency indicators and clean up
+    skill = SKILL_PROFICIENCY.sub('', skill).strip()
+    
+    # Check minimum length and maximum length; more than five words make a sentence, not a skill
+    if len(skill) < 2 or len(skill) > 50 or len(skill.split()) > 5:
+        return False
+    
+    # Check for common invalid patterns
+    if SKILL_REJECTION.search(skill):
+        return False
+    
+    # Check if the skill is in the common skills list (case-insensitive)
+    if skill.lower() in COMMON_SKILLS:
+        return True
+    
+    # If not in common skills, require at least 3 characters and no special characters
+    if len(skill) < 3 or SKILL_SPECIAL_CHARACTERS.search(skill):
+        return False
+    
+    return True
+
+
+# Patterns and tables of the layout-driven parse_resume, compiled once
+_MONTH = (r'(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|June?|July?|Aug(?:ust)?'
+          r'|Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\.?')
+_DATE = rf'(?:{_MONTH}\s*\d{{4}}|\d{{1,2}}/\d{{4}}|\d{{4}}(?:\s+{_MONTH})?)'
+_DATE_RANGE = rf'{_DATE}\s*(?:[-–—]|to|until)\s*(?:{_DATE}|Present|Current|Now|Ongoing|Today)'
+# A period such as "2019 - 2023", "June 2023 - Present", "2021 March - Present" or "01/2020 to 03/2022"
+DATE_RANGE = re.compile(rf'(?<![\w/]){_DATE_RANGE}(?![\w/])', re.IGNORECASE)
+DATE_RANGE_DASH = re.compile(r'\s*(?:[-–—]|\bto\b|\buntil\b)\s*', re.IGNORECASE)
+
+# Fields that text extraction runs together on one line, each moved to a line of its own:
+# contact labels ("...@example.comPhone:"), periods after text ("Leeds2016 - 2019"),
+# bullets ("servers- Reduced"), employers after job titles ("Data AnalystNorthwind") and
+# institutions after degrees ("Science StreamRoyal Grammar School")
+GLUED_FIELDS = [
+    (re.compile(r'(?<=\S)(?=(?:E-?mail|Phone|Mobile|Tel|Cell|Address|Location|LinkedIn|GitHub|Website|Portfolio)\s*:)'),
+     '\n'),
+    (re.compile(rf'(?<=[a-z)])(?={_DATE_RANGE})'), '\n'),
+    (re.compile(r'(?<=[^\s\-•▪●])[ \t]*(?=[•▪●]\s)|(?<=[\w.)%+])(?=-\s+[A-Z])'), '\n'),
+    (re.compile(r'\b(Engineer|Developer|Intern|Manager|Analyst|Consultant|Designer|Architect|Administrator'
+                r'|Specialist|Officer|Director|Scientist|Programmer|Tester|Trainee)(?=[A-Z])'), r'\1\n'),
+    (re.compile(r"(?:(?<=[a-z]{3})|(?<=\)))(?=(?:[A-Z][\w.&'-]*\s+(?:of\s+|and\s+|&\s+)?){0,5}"
+                r"(?:University|Institute|College|School|Academy|Campus|Polytechnic)\b)"), '\n'),
+]
+# Tabs and wide gaps separate columns, e.g. a title on the left and its period on the right
+LAYOUT_COLUMN_GAP = re.compile(r' *\t[\t ]*| {3,}')
+LAYOUT_WHITESPACE = re.compile(r' {2,}')
+
+# Headers listed nowhere, e.g. "Tools & Platforms:" or "TECHNICAL PROFILE", go by their keyword,
+# provided they are set apart as headers: upper case, a colon, or title case ending in the keyword
+LAYOUT_SECTION_KEYWORDS = [
+    (re.compile(r'\b(?:EXPERIENCE|EMPLOYMENT|INTERNSHIPS?)\b'), "experience"),
+    (re.compile(r'\b(?:EDUCATION|QUALIFICATIONS?)\b'), "education"),
+    (re.compile(r'\bLANGUAGES?\b'), "languages"),
+    (re.compile(r'\b(?:SKILLS?|COMPETENC(?:Y|IES)|TECHNOLOGIES|TOOLS|EXPERTISE)\b'), "skills"),
+    (re.compile(r'\b(?:SUMMARY|PROFILE|OBJECTIVE)\b'), "summary"),
+    (re.compile(r'\b(?:PROJECTS|CERTIFICATIONS|AWARDS|PUBLICATIONS|INTERESTS|REFERENCES|VOLUNTEERING)\b'), "other"),
+]
+
+# Column headers of table layouts ("Role | Company | Period"), never entries themselves,
+# and labels of form layouts ("Company: Acme"), dropped from the field they label
+LAYOUT_COLUMN_HEADERS = frozenset({
+    'role', 'position', 'title', 'job title', 'designation', 'company', 'employer', 'organization',
+    'organisation', 'period', 'duration', 'dates', 'date', 'year', 'years', 'responsibilities',
+    'description', 'details', 'qualification', 'degree', 'course', 'institution', 'institute',
+    'university', 'school', 'college', 'location', 'results'
+})
+
+# Separators between the fields of an entry header, e.g. "Engineer | Acme | 2020 - 2022"
+ENTRY_FIELD_SEPARATOR = re.compile(r'\s*\|\s*|\s+[–—]\s+|\s+(?:at|@)\s+|\t+')
+ENTRY_BULLET = re.compile(r'^[-–—•▪●*◦]\s*')
+# Legal suffixes that belong to the company name rather than its location
+COMPANY_SUFFIXES = frozenset({'inc', 'inc.', 'llc', 'ltd', 'ltd.', 'pvt ltd', 'plc', 'corp', 'corp.', 'gmbh', 'llp'})
+
+DEGREE_KEYWORD = re.compile(
+    r"\b(?:B\.?Sc|M\.?Sc|B\.?A|M\.?A|B\.?S|M\.?S|B\.?E|B\.?Eng|M\.?Eng|B\.?Tech|M\.?Tech|MBA|Ph\.?D|HND|BBA"
+    r"|Bachelor|Master|Doctor|Doctorate|Diploma|Certificate|Associate Degree|Degree|Foundation"
+    r"|G\.?C\.?E\.?|A/L|O/L|Advanced Level|Ordinary Level|High School)\b",
+    re.IGNORECASE
+)
+INSTITUTION_KEYWORD = re.compile(
+    r'\b(?:University|Institute|College|School|Academy|Campus|Polytechnic)\b'
+)
+# A part of "Diploma in Nursing, UCLA, Los Angeles" that names the institution by its initials
+INSTITUTION_ACRONYM = re.compile(r'^[A-Z]{3,6}$')
+# Country and state codes that end a place, "Dubai, UAE" or "Austin, TX"
+REGION_CODE = re.compile(r'^[A-Z]{2,3}$')
+JOB_TITLE_KEYWORD = re.compile(
+    r'\b(?:Engineer|Developer|Intern|Internship|Manager|Analyst|Consultant|Designer|Architect|Administrator'
+    r'|Specialist|Officer|Director|Scientist|Programmer|Tester|Trainee|Lead|Head|Associate|Assistant'
+    r'|Coordinator|Executive|Technician|Researcher|Lecturer|Instructor|Teacher|Accountant|Supervisor'
+    r'|President|Founder|Co-Founder|Owner|Representative|Partner|CEO|CTO|CFO|QA)\b'
+)
+
+# A "Name: Jane Doe" or "Full Name: Jane Doe" line
+NAME_LABEL = re.compile(r'^[ \t]*(?:Full[ \t]+)?Name[ \t]*:[ \t]*(.+?)[ \t]*$', re.IGNORECASE | re.MULTILINE)
+NAME_WORD = re.compile(r"^[^\W\d_](?:[^\W\d_]|['.\-])*$")
+NAME_HONORIFIC = re.compile(r'^(?:Dr|Mr|Mrs|Ms|Miss|Prof|Eng)\.?\s+', re.IGNORECASE)
+# Credentials after a name, "Maria Lopez, RN" or "Jane Doe, PhD, PMP"
+NAME_POSTNOMINALS = re.compile(r'(?:,\s*(?:[A-Z]{2,5}|Ph\.?D\.?|M\.?D\.?|Jr\.?|Sr\.?))+$')
+LOCATION_LABEL = re.compile(r'^(?:Address|Location|City|Based in)\s*:\s*(.+)$', re.IGNORECASE)
+PLACE = re.compile(r"^[A-Z](?:[^\W\d_]|[.' -])+(?:,\s*[A-Z](?:[^\W\d_]|[.' -])+){1,2}$")
+CONTACT_SEPARATOR = re.compile(r'\s+[-|•·–—]\s+|\s*\|\s*|\s{2,}')
+NOT_A_NAME = frozenset({'RESUME', 'CV', 'CURRICULUM VITAE', 'BIODATA', 'BIO DATA'})
+
+SKILL_ITEM_SEPARATOR = re.compile(r'\s*[,;|•·]\s*')
+SOFT_SKILL_LABEL = re.compile(r'\b(?:soft|interpersonal|personal)\b', re.IGNORECASE)
+LANGUAGE_LABEL = re.compile(r'\blanguages?\b', re.IGNORECASE)
+SPOKEN_LANGUAGES = frozenset({
+    'english', 'sinhala', 'sinhalese', 'tamil', 'hindi', 'urdu', 'bengali', 'german', 'french', 'spanish',
+    'italian', 'portuguese', 'dutch', 'swedish', 'norwegian', 'danish', 'finnish', 'polish', 'russian',
+    'ukrainian', 'turkish', 'arabic', 'hebrew', 'persian', 'mandarin', 'cantonese', 'chinese', 'japanese',
+    'korean', 'thai', 'vietnamese', 'malay', 'indonesian', 'tagalog', 'filipino', 'greek', 'czech',
+    'hungarian', 'romanian', 'swahili', 'nepali', 'punjabi', 'gujarati', 'marathi', 'telugu', 'kannada',
+    'malayalam', 'dhivehi'
+})
+
 class ResumeParserError(Exception):
     """Custom exception for resume parser errors"""
     pass
@@ -27,14 +270,17 @@ class ImprovedResumeParser:
     key information: name, phone, email, education, work experience, and skills.
     """
     
-    def __init__(self, model_name: Optional[str] = None):
+    def __init__(self, model_name: Optional[str] = None, skill_taxonomy: Optional[SkillTaxonomy] = None):
         """
         Initialize the parser with NLP model and necessary components.
         
         Args:
             model_name: Optional name of the spaCy model to use. If None, will try default models.
+            skill_taxonomy: Skills to look for anywhere in the text. Defaults to the
+                taxonomy at SKILL_TAXONOMY_PATH, shared by all parsers.
         """
         self.nlp = self._load_nlp_model(model_name)
+        self.skill_taxonomy = skill_taxonomy if skill_taxonomy is not None else SkillTaxonomy.from_env()
         self._initialize_section_headers()
         logger.info("ResumeParser initialized successfully")
     
@@ -58,15 +304,31 @@ class ImprovedResumeParser:
                 "WORK EXPERIENCE", "EMPLOYMENT HISTORY", "PROFESSIONAL EXPERIENCE", 
                 "EXPERIENCE", "CAREER HISTORY", "WORK HISTORY", "CAREER EXPERIENCE", 
                 "EMPLOYMENT", "PROFESSIONAL EXPERIENCE", "ROLE", "EMPLOYMENT EXPERIENCE",
-                "JOB HISTORY", "POSITIONS HELD", "CAREER"
+                "JOB HISTORY", "POSITIONS HELD", "CAREER", "RELEVANT EXPERIENCE", "INTERNSHIPS",
+                "INTERNSHIP", "ACADEMIC APPOINTMENTS", "APPOINTMENTS", "RESEARCH EXPERIENCE",
+                "TEACHING EXPERIENCE"
             ],
             "skills": [
                 "SKILLS", "TECHNICAL SKILLS", "COMPETENCIES", "CORE COMPETENCIES", 
                 "KEY SKILLS", "SKILL SET", "PROFESSIONAL SKILLS", "KEY COMPETENCIES",
                 "TECHNICAL COMPETENCIES", "PROFESSIONAL SKILLS", "TECHNICAL EXPERTISE",
-                "TECHNOLOGY SUMMARY"
+                "TECHNOLOGY SUMMARY", "IT SKILLS", "COMPUTER SKILLS", "TOOLS", "TECHNOLOGIES",
+                "TOOLS AND TECHNOLOGIES", "TECH STACK"
+            ],
+            "soft_skills": ["SOFT SKILLS", "INTERPERSONAL SKILLS", "PERSONAL SKILLS"],
+            "languages": ["LANGUAGES", "LANGUAGE SKILLS", "LANGUAGE PROFICIENCY"],
+            # Sections the parser has no use for, so that their content does not run
+            # into the section above them
+            "other": [
+                "PROJECTS", "KEY PROJECTS", "ACADEMIC PROJECTS", "PERSONAL PROJECTS", "CERTIFICATIONS",
+                "CERTIFICATES", "LICENSES AND CERTIFICATIONS", "COURSES", "TRAINING", "AWARDS",
+                "ACHIEVEMENTS", "HONORS AND AWARDS", "PUBLICATIONS", "VOLUNTEER EXPERIENCE", "VOLUNTEERING",
+                "EXTRACURRICULAR ACTIVITIES", "ACTIVITIES", "RESEARCH INTERESTS", "INTERESTS", "HOBBIES",
+                "REFERENCES", "REFEREES", "DECLARATION"
             ]
         }
+        self._section_header_pattern, self._section_header_groups = compile_section_headers(self.section_headers)
+        self._header_breaks = compile_header_breaks(self.section_headers)
     
     def _load_nlp_model(self, model_name: Optional[str] = None) -> Any:
         """
@@ -118,140 +380,339 @@ class ImprovedResumeParser:
     def parse_resume(self, text: str) -> Dict[str, Any]:
         """
         Main function to parse resume text and extract structured information.
+        
+        The resume is read by its layout rather than by fixed phrases: lines are
+        grouped under the section headers they follow, entries within the
+        education and experience sections are anchored on their periods, and
+        the fields of each entry are told apart by separators and keywords.
+        Only the contact lines go through spaCy, and only if no name is found
+        otherwise.
+        
+        Args:
+            text (str): Resume text as returned by text extraction
+            
+        Returns:
+            Dict[str, Any]: Parsed data in the shape of the Gemini response: name,
+            email, phone, location, summary, education, work_experience and
+            skills (technical_skills, soft_skills and languages)
+            
+        Raises:
+            ResumeParserError: If the input is invalid or parsing fails
         """
         if not text or not isinstance(text, str):
             raise ResumeParserError("Invalid input: text must be a non-empty string")
         
         try:
-            # Preprocess the text
-            cleaned_text = self._preprocess_text(text)
+            lines = self._split_layout_lines(text)
+            sections = self._split_layout_sections(lines)
+            contact_lines = sections.get("contact", [])
             
-            # Process with spaCy for NLP features
-            doc = self.nlp(cleaned_text)
-            
-            # Initialize the result dictionary
+            # Extract contact information
+            contact_text = "\n".join(contact_lines)
+            contact_info = self._extract_contact_info(contact_text, None, contact_text)
+            if not contact_info["email"] or not contact_info["phone"]:
+                # Contact details can also sit in a footer or a sidebar
+                fallback_info = self._extract_contact_info("\n".join(lines), None, "")
+                contact_info["email"] = contact_info["email"] or fallback_info["email"]
+                contact_info["phone"] = contact_info["phone"] or fallback_info["phone"]
+            
+            work_experience = self._extract_work_experience("\n".join(sections.get("experience", [])), None)
             parsed_data = {
-                "name": "",
-                "email": "",
-                "phone": "",
-                "education": [],
-                "work_experience": [],
-                "skills": []
+                "name": contact_info["name"],
+                "email": contact_info["email"],
+                "phone": contact_info["phone"],
+                "location": self._extract_location(contact_lines, contact_info["name"]),
+                "summary": " ".join(sections.get("summary", [])),
+                "education": self._extract_education("\n".join(sections.get("education", [])), None),
+                "work_experience": work_experience,
+                "skills": self._extract_layout_skills(sections, text, work_experience)
             }
             
-            # Extract contact information
-            contact_info = self._extract_contact_info(cleaned_text, doc, "")
-            parsed_data["name"] = contact_info.get("name", "")
-            parsed_data["email"] = contact_info.get("email", "")
-            parsed_data["phone"] = contact_info.get("phone", "")
-            
-            # Extract education section
-            education_section = re.search(r'Academic Qualifications\s*(.*?)(?=Professional Experience|$)', cleaned_text, re.DOTALL)
-            if education_section:
-                edu_text = education_section.group(1).strip()
-                entries = [entry.strip() for entry in re.split(r'\n\n+', edu_text) if entry.strip()]
-                
-                for entry in entries:
-                    lines = [line.strip() for line in entry.split('\n') if line.strip()]
-                    if not lines:
-                        continue
-                    
-                    # Match BSc entry
-                    if 'BSc' in lines[0] and 'Information Technology' in lines[0]:
-                        parsed_data["education"].append({
-                            "degree": "BSc in Information Technology",
-                            "institution": "Sri Lanka Institute of Information Technology (SLIIT), Malabe",
-                            "dates": "2018 - 2022"
-                        })
-                    
-                    # Match GCE entry
-                    if 'G.C.E.' in lines[0] and 'Advanced Level' in lines[0]:
-                        parsed_data["education"].append({
-                            "degree": "G.C.E. Advanced Level (Technology Stream)",
-                            "institution": "Ananda College, Colombo",
-                            "dates": "2015 - 2017"
-                        })
-            
-            # Extract work experience section
-            experience_section = re.search(r'Professional Experience\s*(.*?)(?=Technical Skills|$)', cleaned_text, re.DOTALL)
-            if experience_section:
-                exp_text = experience_section.group(1).strip()
-                entries = [entry.strip() for entry in re.split(r'\n\n+', exp_text) if entry.strip()]
-                
-                for entry in entries:
-                    lines = [line.strip() for line in entry.split('\n') if line.strip()]
-                    if not lines:
-                        continue
-                    
-                    # Match Junior Software Engineer entry
-                    if 'Junior Software Engineer' in lines[0]:
-                        # Get description from remaining lines
-                        description_lines = []
-                        for line in lines:
-                            if line.strip() and not 'Junior Software Engineer' in line and not 'InnovateX' in line and not 'January 2023' in line and not 'Colombo' in line:
-                                description_lines.append(line.strip())
-                        
-                        parsed_data["work_experience"].append({
-                            "position": "Junior Software Engineer",
-                            "company": "InnovateX (Pvt) Ltd",
-                            "location": "Colombo, Sri Lanka",
-                            "dates": "January 2023 - Present",
-                            "description": ' '.join(description_lines)
-                        })
-                    
-                    # Match Software Development Intern entry
-                    if 'Software Development Intern' in lines[0]:
-                        # Get description from remaining lines
-                        description_lines = []
-                        for line in lines:
-                            if line.strip() and not 'Software Development Intern' in line and not 'WSO2' in line and not 'June 2021' in line and not 'Colombo' in line:
-                                description_lines.append(line.strip())
-                        
-                        parsed_data["work_experience"].append({
-                            "position": "Software Development Intern",
-                            "company": "WSO2",
-                            "location": "Colombo, Sri Lanka",
-                            "dates": "June 2021 - December 2021",
-                            "description": ' '.join(description_lines)
-                        })
-            
-            # Extract skills
-            skills_section = re.search(r'Technical Skills\s*(.*?)$', cleaned_text, re.DOTALL)
-            if skills_section:
-                skills_text = skills_section.group(1).strip()
-                lines = [line.strip() for line in skills_text.split('\n') if line.strip()]
-                
-                skill_categories = {}
-                current_category = None
-                
-                for line in lines:
-                    if ':' in line:
-                        category, skills = line.split(':', 1)
-                        category = category.strip()
-                        current_category = category
-                        skills_list = [s.strip() for s in skills.split(',')]
-                        skill_categories[category] = [s for s in skills_list if s]
-                
-                # Format skills by category
-                all_skills = []
-                for category in ['Languages', 'Frameworks/Technologies', 'Tools', 'Databases', 'Other']:
-                    if category in skill_categories:
-                        all_skills.extend(skill_categories[category])
-                
-                parsed_data["skills"] = all_skills
-            
             return parsed_data
             
         except Exception as e:
             logger.error(f"Error parsing resume: {e}")
             raise ResumeParserError(f"Failed to parse resume: {e}")
     
-    def _preprocess_text(self, text: str) -> str:
+    def _split_layout_lines(self, text: str) -> List[str]:
+        """
+        Split the text into non-empty lines, normalized by _preprocess_text with
+        their line breaks kept.
+        
+        Args:
+            text (str): Resume text
+            
+        Returns:
+            List[str]: Stripped lines, with columns separated by " | " and other runs of spaces collapsed
+        """
+        text = self._preprocess_text(text, keep_lines=True)
+        
+        lines = []
+        for line in text.splitlines():
+            line = LAYOUT_WHITESPACE.sub(' ', LAYOUT_COLUMN_GAP.sub(' | ', line.strip())).strip(' |')
+            if line:
+                lines.append(line)
+        return lines
+    
+    def _split_layout_sections(self, lines: List[str]) -> Dict[str, List[str]]:
+        """
+        Group lines under the section headers they follow, see _extract_sections.
+        
+        A header is a line of its own, e.g. "WORK EXPERIENCE" or "Skills:", see
+        _layout_section; every header is rewritten to the first one of its
+        section so that _extract_sections finds it. A header followed by content
+        on the same line, e.g. "Skills: Python, Git", holds just that line, after
+        which the section above continues. Lines before the first header belong
+        to "contact", as do those of contact sections; sections that occur more
+        than once are joined.
+        
+        Args:
+            lines (List[str]): Lines from _split_layout_lines
+            
+        Returns:
+            Dict[str, List[str]]: The lines of each section, in order
+        """
+        marked = []
+        current = "contact"
+        for line in lines:
+            section = self._layout_section(line)
+            if section:
+                if section != current:
+                    marked.append(self.section_headers[section][0])
+                    current = section
+                continue
+            
+            label, colon, content = line.partition(':')
+            inline = self._layout_section(label + colon) if colon else None
+            if inline and inline != current and content.strip():
+                marked.extend([self.section_headers[inline][0], content.strip(), self.section_headers[current][0]])
+            else:
+                marked.append(content.strip() if inline and content.strip() else line)
+        
+        sections = self._extract_sections("\n".join(marked), merge=True)
+        return {section: content.splitlines() for section, content in sections.items()}
+    
+    def _layout_section(self, line: str) -> Optional[str]:
+        """The section a line is the header of, or None if it is no header."""
+        match = self._section_header_pattern.match(line)
+        if match:
+            # Headers listed under several sections (e.g. PROFILE) go to the last of them
+            return self._section_header_groups[match.lastgroup][1][-1]
+        key = line.rstrip(' :').upper()
+        words = key.split()
+        if not words or len(words) > 4:
+            return None
+        set_apart = line.endswith(':') or line.isupper()
+        if not set_apart and not line.istitle():
+            return None
+        for pattern, section in LAYOUT_SECTION_KEYWORDS:
+            match = pattern.search(key)
+            # "Laboratory Skills" is a header, "Skills Development Programme" rather not
+            if match and (set_apart or match.end() == len(key)):
+                return section
+        return None
+    
+    def _split_entries(self, lines: List[str]) -> List[Dict[str, Any]]:
+        """
+        Split the lines of an education or experience section into entries.
+        
+        Every entry is anchored on its period. The lines before the first
+        period are the first entry's header, e.g. title and company; later
+        entries take as many header lines before their period, so that the body
+        of one entry is told apart from the header of the next even when text
+        extraction dropped the blank lines between them.
+        
+        Args:
+            lines (List[str]): Lines of the section
+            
+        Returns:
+            List[Dict[str, Any]]: Per entry its header fields, its dates and its body lines
+        """
+        lines = [line for line in lines if line.lower().rstrip(' :') not in LAYOUT_COLUMN_HEADERS]
+        anchors = []
+        for i, line in enumerate(lines):
+            match = None if ENTRY_BULLET.match(line) else DATE_RANGE.search(line)
+            if match:
+                anchors.append((i, match))
+        if not anchors:
+            return []
+        
+        header_count = min(sum(1 for line in lines[:anchors[0][0]] if not ENTRY_BULLET.match(line)), 3)
+        entries = []
+        for k, (i, match) in enumerate(anchors):
+            previous = anchors[k - 1][0] + 1 if k else 0
+            start = i
+            while start > previous and i - start < header_count and self._is_header_line(lines[start - 1]):
+                start -= 1
+            if entries:
+                entries[-1]["body"].extend(lines[previous:start])
+            
+            line = lines[i]
+            before = line[:match.start()].rstrip(' ,|:([-–—')
+            after = line[match.end():].lstrip(' ,|:)]-–—')
+            headers = lines[start:i] + [before]
+            body = []
+            if after:
+                # "Lyon" after the period is a field, "Built a ..." the start of the body,
+                # unless the line starts with the period: "2019 - 2021 Engineer, Acme"
+                if not before or (len(after.split()) <= 4 and not after.endswith('.') and not ENTRY_BULLET.match(after)):
+                    headers.append(after)
+                else:
+                    body.append(after)
+            entries.append({
+                "fields": [field for header in headers for field in self._split_fields(header)],
+                "dates": DATE_RANGE_DASH.sub(' - ', match.group(), count=1),
+                "body": body
+            })
+        entries[-1]["body"].extend(lines[anchors[-1][0] + 1:])
+        
+        for entry in entries:
+            # Header lines can follow the period: "Backend Developer | 2016 - 2019", "Initech, Austin",
+            # "- Ported ...", or "March 2018 - Present", "Firmware Engineer", "Hooli Ltd", "- Built ..."
+            body = entry["body"]
+            taken = 0
+            while (len(entry["fields"]) + taken < 2 and taken < len(body) and len(body[taken].split()) <= 8
+                   and not body[taken].endswith('.') and not ENTRY_BULLET.match(body[taken])):
+                taken += 1
+            if taken and (taken == len(body) or not self._is_header_line(body[taken])):
+                for line in body[:taken]:
+                    entry["fields"].extend(self._split_fields(line))
+                del body[:taken]
+        return entries
+    
+    def _split_fields(self, header: str) -> List[str]:
+        """
+        Split a line of an entry header into its fields, dropping form labels:
+        "Company: Acme | Lyon" gives "Acme" and "Lyon".
+        """
+        fields = []
+        for field in ENTRY_FIELD_SEPARATOR.split(header):
+            label, colon, value = field.partition(':')
+            if colon and label.strip().lower() in LAYOUT_COLUMN_HEADERS:
+                field = value
+            field = field.strip(' ,')
+            if field and field.lower() not in LAYOUT_COLUMN_HEADERS:
+                fields.append(field)
+        return fields
+    
+    def _is_header_line(self, line: str) -> bool:
+        """Whether a line can be part of an entry header rather than a bullet or sentence of the body."""
+        if ENTRY_BULLET.match(line):
+            return False
+        words = len(line.split())
+        return words <= 12 and not (line.endswith('.') and words > 4)
+    
+    def _split_body(self, body: List[str]) -> List[str]:
+        """
+        Turn the body lines of an entry into items, one per bullet or sentence
+        line; lines that continue the previous one are joined to it.
+        """
+        items: List[str] = []
+        for line in body:
+            bulleted = bool(ENTRY_BULLET.match(line))
+            line = ENTRY_BULLET.sub('', line).strip()
+            if not line:
+                continue
+            if items and not bulleted and (line[0].islower() or items[-1].endswith((',', '-', '&'))):
+                items[-1] = f"{items[-1]} {line}"
+            else:
+                items.extend(item.strip() for item in line.split('; ') if item.strip())
+        return items
+    
+    def _extract_location(self, contact_lines: List[str], name: str) -> str:
+        """
+        Find the candidate's location among the contact lines: an "Address:" or
+        "Location:" field, or else a "City, Country" part of a line.
+        """
+        for line in contact_lines:
+            match = LOCATION_LABEL.match(line)
+            if match:
+                return match.group(1).strip()
+        for line in contact_lines:
+            for part in CONTACT_SEPARATOR.split(line):
+                part = part.strip()
+                if (not (name and part.startswith(name)) and PLACE.match(part) and not JOB_TITLE_KEYWORD.search(part)
+                        and not INSTITUTION_KEYWORD.search(part)):
+                    return part
+        return ""
+    
+    def _extract_layout_skills(self, sections: Dict[str, List[str]], text: str,
+                               work_experience: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+        """
+        Extract skills from the skill and language sections.
+        
+        Items are split on commas and similar separators, category labels such
+        as "Frameworks:" are dropped and known skills take their canonical name
+        and category from the skill taxonomy; other items are kept if they pass
+        validate_many. Taxonomy skills named in the
+        summary or in the descriptions of past roles are added to them; entry
+        headers are left out, so that employers such as "Unity Bank" do not
+        count. Without any skill section the taxonomy is matched against the
+        whole text instead.
+        
+        Args:
+            sections (Dict[str, List[str]]): Output of _split_layout_sections
+            text (str): Resume text
+            work_experience (List[Dict[str, Any]]): Output of _extract_work_experience
+            
+        Returns:
+            Dict[str, List[str]]: technical_skills, soft_skills and languages
+        """
+        found: Dict[str, Dict[str, None]] = {"technical_skills": {}, "soft_skills": {}, "languages": {}}
+        
+        # Every item with the list it goes to and whether it is known; items outside
+        # the taxonomy and the spoken languages must pass validate_many
+        candidates: List[Tuple[str, str, bool]] = []
+        for section_name in ("skills", "soft_skills", "languages"):
+            for line in sections.get(section_name, []):
+                line = ENTRY_BULLET.sub('', line)
+                label, colon, items = line.partition(':')
+                if not colon or len(label.split()) > 4:
+                    label, items = "", line
+                soft = section_name == "soft_skills" or bool(SOFT_SKILL_LABEL.search(label))
+                spoken = section_name == "languages" or bool(LANGUAGE_LABEL.search(label))
+                
+                for item in SKILL_ITEM_SEPARATOR.split(items):
+                    item = item.strip(' .')
+                    if not item:
+                        continue
+                    first_word = re.match(r'[A-Za-z]*', item).group().lower()
+                    if spoken and first_word in SPOKEN_LANGUAGES:
+                        candidates.append((item, "languages", True))
+                        continue
+                    # An item that is just a skill's name is that skill, even names such
+                    # as "C" that are too ambiguous to match in prose
+                    canonical = item if item in self.skill_taxonomy.categories else self.skill_taxonomy.canonical(item)
+                    if canonical:
+                        category = self.skill_taxonomy.categories.get(canonical)
+                        candidates.append((canonical, "soft_skills" if soft or category == "soft" else "technical_skills", True))
+                    else:
+                        candidates.append((item, "soft_skills" if soft else "technical_skills", False))
+        
+        valid = set(self.validate_many(item for item, _, known in candidates if not known))
+        for item, kind, known in candidates:
+            if known or item in valid:
+                found[kind].setdefault(item)
+        
+        if any(found.values()):
+            descriptions = [item for experience in work_experience for item in experience["description"]]
+            text = "\n".join(sections.get("summary", []) + descriptions)
+        for skill in self.skill_taxonomy.extract(text):
+            kind = "soft_skills" if self.skill_taxonomy.categories.get(skill) == "soft" else "technical_skills"
+            found[kind].setdefault(skill)
+        
+        return {kind: list(skills) for kind, skills in found.items()}
+    
+    def _preprocess_text(self, text: str, keep_lines: bool = False) -> str:
         """
         Clean and normalize the text for better parsing.
         
         Args:
             text (str): The text to preprocess
+            keep_lines (bool): Keep the line breaks and spacing of the text, as
+                the layout parser reads sections, entries and columns from them,
+                and only give fields that text extraction ran together (see
+                GLUED_FIELDS) a line of their own
             
         Returns:
             str: Preprocessed text
@@ -264,35 +725,32 @@ class ImprovedResumeParser:
                 return ""
                 
             # Fix common spacing issues in contact information
-            text = re.sub(r'([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,})(Phone|Tel|Mobile|Contact|Cell)', 
-                         r'\1\n\2', text)
-            
-            # Add line breaks before section headers
-            for section_type, headers in self.section_headers.items():
-                for header in headers:
-                    pattern = r'(?<!\n)(' + re.escape(header) + r')(?:[\s:]*)(?:\n|$)'
-                    text = re.sub(pattern, r'\n\1\n', text, flags=re.IGNORECASE)
+            text = EMAIL_BEFORE_PHONE_LABEL.sub(r'\1\n\2', text)
             
-            # Add spaces between words with CamelCase-like transitions
-            text = re.sub(r'([a-z])([A-Z])', r'\1 \2', text)
+            if keep_lines:
+                text = text.translate(LINE_CHARACTERS)
+                for pattern, replacement in GLUED_FIELDS:
+                    text = pattern.sub(replacement, text)
+                return text.strip()
             
-            # Replace multiple spaces with a single space
-            text = re.sub(r'\s+', ' ', text)
+            # Add line breaks before section headers. Each substitution sees the
+            # result of the previous ones, so they run in table order, but only
+            # for headers that occur at all: breaking lines never creates one.
+            folded = text.translate(HEADER_CASE_FOLD)
+            for header, pattern in self._header_breaks:
+                if header in folded:
+                    text = pattern.sub(r'\n\1\n', text)
             
-            # Replace multiple newlines with a single newline
-            text = re.sub(r'\n+', '\n', text)
+            # Add spaces between words with CamelCase-like transitions and
+            # replace every run of whitespace, newlines included, with a single space
+            text = WHITESPACE_OR_CASE_CHANGE.sub(' ', text)
             
-            # Insert line breaks between fields if they're on the same line
-            text = re.sub(r'([.:])([A-Z])', r'\1\n\2', text)
+            # Insert line breaks between fields if they're on the same line,
+            # and before dates in YYYY-YYYY format
+            text = FIELD_OR_DATE_BOUNDARY.sub(r'\1\2\n\3', text)
             
-            # Add line breaks before dates in YYYY-YYYY format
-            text = re.sub(r'(\S)(\d{4}\s*[-–—]\s*(?:\d{4}|Present|Current))', r'\1\n\2', text)
-            
-            # Remove Unicode control characters
-            text = ''.join(ch for ch in text if ch not in {'\u200b', '\ufeff', '\u200e'})
-            
-            # Normalize different dash types to regular hyphen
-            text = re.sub(r'[–—]', '-', text)
+            # Remove Unicode control characters and normalize different dash types to regular hyphen
+            text = text.translate(NORMALIZED_CHARACTERS)
             
             return text.strip()
             
@@ -300,6 +758,30 @@ class ImprovedResumeParser:
             logger.error(f"Error preprocessing text: {e}")
             raise ResumeParserError(f"Failed to preprocess text: {e}")
 
+    def _validate_skill(self, skill: str) -> bool:
+        """Validate a skill entry, see is_valid_skill."""
+        return is_valid_skill(skill)
+    
+    def validate_many(self, skills: Iterable[str]) -> List[str]:
+        """
+        Validate many skill entries at once, e.g. every token of an experience section.
+        
+        Args:
+            skills: Skill candidates; repeated entries are only checked once
+            
+        Returns:
+            List[str]: The valid entries, in their original order
+        """
+        verdicts: Dict[str, bool] = {}
+        valid = []
+        for skill in skills:
+            verdict = verdicts.get(skill)
+            if verdict is None:
+                verdict = verdicts[skill] = is_valid_skill(skill)
+            if verdict:
+                valid.append(skill)
+        return valid
+
     def _validate_email(self, email: str) -> bool:
         """
         Validate email format.
@@ -406,7 +888,7 @@ class ImprovedResumeParser:
                     return name
             
             # Check for "Name:" label
-            name_label_match = re.search(r'(?:^|\n)(?:Name|Full Name)[\s:]+([A-Za-z\s\.\-\']+?)(?:\n|$)', text, re.IGNORECASE)
+            name_label_match = NAME_LABEL.search(text)
             if name_label_match:
                 name = name_label_match.group(1).strip()
                 if len(name) > 2 and not name.isupper():
@@ -418,7 +900,17 @@ class ImprovedResumeParser:
                 name = personal_info_match.group(1).strip()
                 if len(name) > 2 and not name.isupper():
                     return name
-            
+
+            # Otherwise the name usually opens the resume, on its own or ahead of other contact details
+            for line in text.strip().split('\n')[:5]:
+                name = NAME_HONORIFIC.sub('', CONTACT_SEPARATOR.split(line.strip())[0].strip())
+                name = NAME_POSTNOMINALS.sub('', name)
+                words = name.split()
+                if (2 <= len(words) <= 4 and all(NAME_WORD.match(word) and word[0].isupper() for word in words)
+                        and name.upper() not in NOT_A_NAME and not self._section_header_pattern.match(name)
+                        and not JOB_TITLE_KEYWORD.search(name) and not INSTITUTION_KEYWORD.search(name)):
+                    return name
+
             # Use NLP entity recognition for the first few lines
             first_lines = '\n'.join(text.strip().split('\n')[:5])
             first_lines_doc = self.nlp(first_lines)
@@ -457,6 +949,7 @@ class ImprovedResumeParser:
                 r'(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # (123) 456-7890
                 r'(?:\+?\d{1,3}[-.\s]?)?\d{3}[-.\s]?\d{3}[-.\s]?\d{4}',        # 123-456-7890
                 r'(?:\+?\d{1,3}[-.\s]?)?\d{4}[-.\s]?\d{3}[-.\s]?\d{3}',        # 1234-567-890
+                r'\+\d{1,3}(?:[-.\s]?\(?\d{1,4}\)?){2,5}',                     # +94 76 543 2109
                 r'(?:Phone|Tel|Mobile|Contact|Cell)[\s:]+([+\d\s\-\(\)\.]+)'    # Phone: 123-456-7890
             ]
             
@@ -474,48 +967,13 @@ class ImprovedResumeParser:
             logger.error(f"Error extracting phone: {e}")
             raise ResumeParserError(f"Failed to extract phone number: {e}")
 
-    def _validate_education(self, education: Dict[str, str]) -> bool:
-        """
-        Validate education entry.
-        
-        Args:
-            education (Dict[str, str]): Education entry to validate
-            
-        Returns:
-            bool: True if education is valid, False otherwise
-        """
-        if not education:
-            return False
-            
-        # Check required fields
-        required_fields = ['degree', 'institution']
-        if not all(field in education and education[field].strip() for field in required_fields):
-            return False
-            
-        # Validate degree
-        degree_keywords = [
-            'bachelor', 'master', 'phd', 'doctorate', 'diploma', 'certificate',
-            'bs', 'ba', 'bsc', 'be', 'btech', 'ms', 'msc', 'ma', 'mtech',
-            'mba', 'associate', 'undergraduate', 'graduate', 'postgraduate'
-        ]
-        
-        has_degree_keyword = any(keyword in education['degree'].lower() for keyword in degree_keywords)
-        if not has_degree_keyword:
-            return False
-            
-        # Validate dates if present
-        if 'dates' in education and education['dates']:
-            if not self._validate_date_range(education['dates']):
-                return False
-                
-        return True
-
     def _extract_education(self, text: str, doc: Any) -> List[Dict[str, str]]:
         """
         Extract education information from text.
         
         Args:
-            text (str): Text to extract education from
+            text (str): Lines of the education section, see _split_entries
+            doc (Any): Unused, kept for callers that pass a spaCy document
             
         Returns:
             List[Dict[str, str]]: List of education entries
@@ -526,52 +984,55 @@ class ImprovedResumeParser:
         try:
             if not text:
                 return []
-                
-            education_entries = []
             
-            # Common education section headers
-            edu_headers = [
-                r'(?:Education|Academic|Educational)(?:\s+Background|\s+History|\s+Qualifications)?',
-                r'(?:Degrees|Qualifications|Academics)'
-            ]
+            lines = text.splitlines()
+            entries = self._split_entries(lines)
+            if not entries:
+                # Without periods every line naming a degree starts an entry
+                entries = [
+                    {"fields": [line] + lines[i + 1:i + 2], "dates": "", "body": []}
+                    for i, line in enumerate(lines) if DEGREE_KEYWORD.search(line)
+                ]
             
-            # Look for education section
-            section_text = ""
-            for header in edu_headers:
-                pattern = r'(?:^|\n)(?:' + header + r')(?:[\s:]*)(?:\n|$)(.*?)(?:\n(?:^|\n)(?:' + '|'.join(edu_headers) + r')(?:[\s:]*)(?:\n|$)|$)'
-                match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-                if match:
-                    section_text = match.group(1).strip()
-                    break
-            
-            if not section_text:
-                # If no dedicated section found, look for education throughout the text
-                section_text = text
-            
-            # Pattern for education entries
-            patterns = [
-                # Pattern for degree followed by institution
-                r'(?:^|\n)(?:(?:Bachelor|Master|PhD|Doctorate|BS|BA|BSc|BE|BTech|MS|MSc|MA|MTech|MBA)\s+(?:of|in|on)?\s+[^,\n]+)(?:\s*,\s*|\s+at\s+|\s+from\s+)([^,\n]+)(?:,\s*|\s+)(?:(\d{4}\s*[-–—]\s*(?:\d{4}|Present|Current))|\s*(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s*\d{4}\s*[-–—]\s*(?:(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s*\d{4}|Present|Current))?',
-                
-                # Pattern for institution followed by degree
-                r'(?:^|\n)([^,\n]+)(?:\s*[-–—]\s*|\s*,\s*|\s+)(?:(?:Bachelor|Master|PhD|Doctorate|BS|BA|BSc|BE|BTech|MS|MSc|MA|MTech|MBA)\s+(?:of|in|on)?\s+[^,\n]+)(?:\s*,\s*|\s+)(?:(\d{4}\s*[-–—]\s*(?:\d{4}|Present|Current))|\s*(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s*\d{4}\s*[-–—]\s*(?:(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s*\d{4}|Present|Current))?'
-            ]
-            
-            for pattern in patterns:
-                matches = re.finditer(pattern, section_text, re.IGNORECASE)
-                for match in matches:
-                    degree = match.group(1).strip()
-                    institution = match.group(2).strip()
-                    dates = match.group(3).strip() if match.group(3) else ""
-                    
-                    education = {
-                        "degree": degree,
-                        "institution": institution,
-                        "dates": dates
-                    }
-                    
-                    if self._validate_education(education):
-                        education_entries.append(education)
+            education_entries = []
+            for entry in entries:
+                fields = entry["fields"]
+                degree_index = self._degree_index(fields)
+                degree = fields[degree_index] if fields else ""
+                others = fields[:degree_index] + fields[degree_index + 1:]
+                place = []
+                if ', ' in degree and not any(INSTITUTION_KEYWORD.search(field) for field in others):
+                    # "BSc in Computer Science, University of Leeds, UK" or
+                    # "University of Ghana, BSc Physics": the institution runs up to the degree or the end
+                    pieces = degree.split(', ')
+                    first = self._degree_index(pieces)
+                    rest = pieces[first + 1:]
+                    # Initials only name the institution right after the degree, the "UAE" of
+                    # "MBA, Dubai, UAE" is a country
+                    start = next((i for i, piece in enumerate(pieces) if i != first and (
+                                      INSTITUTION_KEYWORD.search(piece)
+                                      or (i == first + 1 and INSTITUTION_ACRONYM.match(piece)))), None)
+                    if start is None and len(rest) > 1 and REGION_CODE.match(rest[-1]) and PLACE.match(", ".join(rest)):
+                        # Where the degree was taken rather than where from
+                        degree = ", ".join(pieces[:first + 1])
+                        place = [", ".join(rest)]
+                    elif start is None and not others and rest:
+                        start = first + 1
+                    if start is not None:
+                        end = first if first > start else len(pieces)
+                        degree = ", ".join(pieces[first:start] if first < start else pieces[first:])
+                        others = [", ".join(pieces[start:end])] + pieces[:min(first, start)] + others
+                institution_index = next((i for i, field in enumerate(others) if INSTITUTION_KEYWORD.search(field)), 0)
+                institution = others.pop(institution_index) if others else ""
+
+                education = {
+                    "degree": degree,
+                    "institution": institution,
+                    "dates": entry["dates"],
+                    "details": "; ".join(others + place + self._split_body(entry["body"]))
+                }
+                if education["degree"] or education["institution"]:
+                    education_entries.append(education)
             
             return education_entries
             
@@ -579,72 +1040,26 @@ class ImprovedResumeParser:
             logger.error(f"Error extracting education: {e}")
             raise ResumeParserError(f"Failed to extract education: {e}")
 
-    def _validate_date_range(self, date_range: str) -> bool:
-        """
-        Validate date range format.
-        
-        Args:
-            date_range (str): Date range to validate (e.g., "2020 - 2022")
-            
-        Returns:
-            bool: True if date range is valid, False otherwise
-        """
-        if not date_range:
-            return False
-            
-        # Split the date range
-        dates = re.split(r'\s*[-–—]\s*', date_range)
-        if len(dates) != 2:
-            return False
-            
-        # Check if dates are valid
-        for date in dates:
-            date = date.strip().lower()
-            if date in ['present', 'current']:
-                continue
-            if not re.match(r'^\d{4}$', date):
-                return False
-                
-        return True
-
-    def _validate_work_experience(self, experience: Dict[str, str]) -> bool:
+    def _degree_index(self, fields: List[str]) -> int:
         """
-        Validate work experience entry.
-        
-        Args:
-            experience (Dict[str, str]): Work experience entry to validate
-            
-        Returns:
-            bool: True if experience is valid, False otherwise
+        Index of the field naming the degree, 0 if none does. Fields that open
+        with the degree are preferred, "Boston, MA" is no Master of Arts.
         """
-        if not experience:
-            return False
-            
-        # Check required fields
-        required_fields = ['title', 'company', 'dates']
-        if not all(field in experience for field in required_fields):
-            return False
-            
-        # Validate dates
-        if not self._validate_date_range(experience['dates']):
-            return False
-            
-        # Validate title and company
-        if not experience['title'].strip() or not experience['company'].strip():
-            return False
-            
-        return True
+        matches = [(match.start() > 0, i) for i, field in enumerate(fields)
+                   for match in [DEGREE_KEYWORD.search(field)] if match]
+        return min(matches)[1] if matches else 0
 
     def _extract_work_experience(self, text: str, doc: Any) -> List[Dict[str, Any]]:
         """
         Extract work experience from text.
         
         Args:
-            text (str): Text to extract work experience from
-            doc (Any): spaCy document
+            text (str): Lines of the experience section, see _split_entries
+            doc (Any): Unused, kept for callers that pass a spaCy document
             
         Returns:
-            List[Dict[str, str]]: List of work experience entries
+            List[Dict[str, Any]]: List of work experience entries, with the
+            description as a list of bullets
             
         Raises:
             ResumeParserError: If extraction fails
@@ -654,51 +1069,38 @@ class ImprovedResumeParser:
                 return []
                 
             experiences = []
-            
-            # Pattern for structured work experience entries
-            job_titles = (
-                r'(?:Senior|Junior|Lead|Principal|Staff|Associate)?\s*'
-                r'(?:Software|System|Network|Data|Cloud|DevOps|Full Stack|Frontend|Backend)?\s*'
-                r'(?:Engineer|Developer|Manager|Consultant|Analyst|Architect|Lead|Director|'
-                r'Head|Officer|Specialist|Coordinator|Administrator|Designer|Advisor|Expert|'
-                r'Professional|Associate|Assistant|Intern|Trainee|Apprentice|'
-                r'Researcher|Scientist|Technician|Technologist)'
-            )
-            
-            pattern = (
-                r'(?:^|\n)'  # Start of line
-                r'(' + job_titles + r')'  # Job title
-                r'\s*(?:at|@|with|for|in|,)\s*'  # Company separator
-                r'([A-Za-z0-9\s\-&.,]+?)'  # Company name
-                r'(?:\s*,\s*([A-Za-z\s,]+?))?'  # Optional location
-                r'(?:\s*,?\s*(\d{4}\s*[-–—]\s*(?:\d{4}|Present|Current)|'  # Date range (YYYY-YYYY)
-                r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s*\d{4}\s*[-–—]\s*'  # or Month YYYY
-                r'(?:(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s*\d{4}|Present|Current)))'  # to Month YYYY or Present
-            )
-            
-            matches = re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE)
-            
-            for match in matches:
-                title = match.group(1).strip()
-                company = match.group(2).strip()
-                location = match.group(3).strip() if match.group(3) else ""
-                dates = match.group(4).strip() if match.group(4) else ""
+            for entry in self._split_entries(text.splitlines()):
+                fields = entry["fields"]
+                if not fields:
+                    continue
                 
-                # Extract description if available
-                description = ""
-                next_match = re.search(r'(?:\n|$)(.*?)(?:\n(?!\n)|$)', text[match.end():], re.DOTALL)
-                if next_match:
-                    description = next_match.group(1).strip()
+                for separator in (', ', ' - '):
+                    if len(fields) == 1 and separator in fields[0]:
+                        # "Software Engineer, Acme Corp" or "Acme Corp - Software Engineer"
+                        fields = fields[0].split(separator)
+
+                # The title is the field naming a role, whether it comes before the company or after it
+                title_index = next((i for i, field in enumerate(fields) if JOB_TITLE_KEYWORD.search(field)), 0)
+                title = fields[title_index]
+                others = fields[:title_index] + fields[title_index + 1:]
+
+                company, locations = "", []
+                if others:
+                    # "Initech Systems, Austin, TX"
+                    pieces = others[0].split(', ') + others[1:]
+                    company = pieces.pop(0)
+                    while pieces and pieces[0].lower() in COMPANY_SUFFIXES:
+                        company = f"{company}, {pieces.pop(0)}"
+                    locations = pieces
                 
                 experience = {
                     "position": title,
                     "company": company,
-                    "location": location,
-                    "dates": dates,
-                    "description": description
+                    "location": ", ".join(locations),
+                    "dates": entry["dates"],
+                    "description": self._split_body(entry["body"])
                 }
-                
-                if self._validate_work_experience(experience):
+                if experience["position"] or experience["company"]:
                     experiences.append(experience)
             
             return experiences
@@ -707,179 +1109,6 @@ class ImprovedResumeParser:
             logger.error(f"Error extracting work experience: {e}")
             raise ResumeParserError(f"Failed to extract work experience: {e}")
 
-    def _validate_skill(self, skill: str) -> bool:
-        """
-        Validate a skill entry.
-        
-        Args:
-            skill (str): Skill to validate
-            
-        Returns:
-            bool: True if skill is valid, False otherwise
-        """
-        if not skill:
-            return False
-            
-        # Remove proficiency indicators and clean up
-        skill = re.sub(r'\([^)]*\)', '', skill).strip()
-        
-        # Check minimum length and maximum length
-        if len(skill) < 2 or len(skill) > 50:
-            return False
-            
-        # Check for common invalid patterns
-        invalid_patterns = [
-            r'^\d+$',  # Just numbers
-            r'^[^a-zA-Z]+$',  # No letters
-            r'^(?:and|or|the|a|an|in|at|by|to|for|with|from)$',  # Common words
-            r'^(?:present|current|details|responsibilities|role|company|period)$',  # Resume section words
-            r'@',  # Email addresses
-            r'^\+?\d+',  # Phone numbers
-            r'(?:street|road|lane|avenue|drive)',  # Address components
-            r'(?:january|february|march|april|may|june|july|august|september|october|november|december)',  # Months
-            r'(?:university|college|institute|school)',  # Education institutions
-            r'(?:gpa|cgpa|grade)',  # Academic terms
-            r'[^\x00-\x7F]+',  # Non-ASCII characters
-            r'(?:http|www)',  # URLs
-            r'(?:linkedin|github)',  # Social media
-        ]
-        
-        for pattern in invalid_patterns:
-            if re.search(pattern, skill, re.IGNORECASE):
-                return False
-                
-        # Check if it's a common programming language, framework, or tool
-        common_skills = {
-            'python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'php', 'sql',
-            'html', 'css', 'react', 'angular', 'vue', 'node', 'django', 'flask',
-            'spring', 'docker', 'kubernetes', 'aws', 'azure', 'git', 'linux',
-            'agile', 'scrum', 'jira', 'jenkins', 'maven', 'junit', 'selenium',
-            'rest', 'api', 'json', 'xml', 'nosql', 'mongodb', 'postgresql',
-            'mysql', 'oracle', 'redis', 'elasticsearch', 'typescript', 'golang',
-            'rust', 'scala', 'kotlin', 'swift', 'objective-c', 'perl', 'shell',
-            'bash', 'powershell', 'terraform', 'ansible', 'puppet', 'chef',
-            'ci/cd', 'devops', 'microservices', 'restful', 'graphql', 'grpc',
-            'oauth', 'jwt', 'saml', 'ldap', 'ssl/tls', 'nginx', 'apache',
-            'webpack', 'babel', 'sass', 'less', 'bootstrap', 'material-ui',
-            'jquery', 'redux', 'vuex', 'rxjs', 'numpy', 'pandas', 'scipy',
-            'tensorflow', 'pytorch', 'keras', 'scikit-learn', 'matplotlib',
-            'seaborn', 'tableau', 'power bi', 'hadoop', 'spark', 'kafka',
-            'rabbitmq', 'redis', 'memcached', 'websocket', 'socket.io',
-            'webrtc', 'opencv', 'unity', 'unreal', 'android', 'ios', 'flutter',
-            'react native', 'xamarin', 'cordova', 'ionic', 'electron'
-        }
-        
-        # Check if the skill is in the common skills list (case-insensitive)
-        if skill.lower() in common_skills:
-            return True
-            
-        # If not in common skills, require at least 3 characters and no special characters
-        if len(skill) < 3 or re.search(r'[^a-zA-Z0-9\s\-\+#]', skill):
-            return False
-            
-        return True
-
-    def _extract_skills(self, text: str) -> List[str]:
-        """
-        Extract skills from text.
-        
-        Args:
-            text (str): Text to extract skills from
-            
-        Returns:
-            List[str]: List of extracted skills
-            
-        Raises:
-            ResumeParserError: If extraction fails
-        """
-        try:
-            if not text:
-                return []
-                
-            skills = set()
-            
-            # Look for skills section with specific format
-            skills_section = re.search(
-                r'Skills\s*\n\s*\n(.*?)(?:\n\s*\n|$)',
-                text,
-                re.IGNORECASE | re.DOTALL
-            )
-            
-            if skills_section:
-                section_text = skills_section.group(1)
-                
-                # Look for category-based skills (e.g., "Languages: PHP, JavaScript")
-                category_skills = re.finditer(
-                    r'([A-Za-z\s]+):\s*([^:\n]+)(?:\n|$)',
-                    section_text,
-                    re.MULTILINE
-                )
-                
-                for match in category_skills:
-                    skill_list = match.group(2).strip()
-                    # Split by common delimiters
-                    for skill in re.split(r'[,;|]|\band\b', skill_list):
-                        skill = skill.strip()
-                        if self._validate_skill(skill):
-                            skills.add(skill)
-            
-            # Look for skills in work experience descriptions
-            experience_section = re.search(
-                r'(?:Work Experience|Professional Experience|Employment History).*?\n\s*\n(.*?)(?:\n\s*\n|$)',
-                text,
-                re.IGNORECASE | re.DOTALL
-            )
-            
-            if experience_section:
-                exp_text = experience_section.group(1)
-                
-                # Look for technologies used in bullet points
-                tech_points = re.finditer(
-                    r'[-•*]\s*.*?(?:using|with|in)\s+([A-Za-z0-9\s,\(\)]+?)(?:\.|\n|$)',
-                    exp_text,
-                    re.IGNORECASE
-                )
-                
-                for match in tech_points:
-                    tech_list = match.group(1)
-                    # Split by common delimiters and clean up
-                    for tech in re.split(r'[,\s]+|\band\b', tech_list):
-                        tech = re.sub(r'[\(\)]', '', tech).strip()
-                        if self._validate_skill(tech):
-                            skills.add(tech)
-                
-                # Look for technologies mentioned in parentheses
-                tech_parens = re.finditer(
-                    r'\(([^)]+)\)',
-                    exp_text
-                )
-                
-                for match in tech_parens:
-                    tech_list = match.group(1)
-                    for tech in re.split(r'[,\s]+', tech_list):
-                        tech = tech.strip()
-                        if self._validate_skill(tech):
-                            skills.add(tech)
-            
-            # Normalize skill names
-            normalized_skills = set()
-            for skill in skills:
-                # Convert common variations
-                skill = skill.replace('Javascript', 'JavaScript')
-                skill = skill.replace('Typescript', 'TypeScript')
-                skill = skill.replace('Nodejs', 'Node.js')
-                skill = skill.replace('Vuejs', 'Vue.js')
-                skill = skill.replace('Reactjs', 'React.js')
-                skill = skill.replace('Expressjs', 'Express.js')
-                
-                normalized_skills.add(skill)
-            
-            return sorted(list(normalized_skills))
-            
-        except Exception as e:
-            logger.error(f"Error extracting skills: {e}")
-            raise ResumeParserError(f"Failed to extract skills: {e}")
-
     def _extract_certifications(self, text: str) -> List[Dict[str, str]]:
         """
         Extract certifications from text.
@@ -942,240 +1171,16 @@ class ImprovedResumeParser:
             logger.error(f"Error extracting certifications: {e}")
             raise ResumeParserError(f"Failed to extract certifications: {e}")
 
-    def _extract_from_full_text(self, text: str, doc: Any, parsed_data: Dict[str, Any]):
-        """
-        Fallback method to extract information from the full text if section extraction fails.
-        """
-        # Look for education-related content
-        education_patterns = [
-            r'(?:Bachelor|Master|Ph\.?D\.?|Doctor|Doctorate|B\.S\.|M\.S\.|B\.A\.|M\.A\.|B\.Eng|M\.Eng|MBA|Associate|Diploma|Certificate)(?:\s+of|\s+in)?\s+([A-Za-z\s&\(\)]+)',
-            r'(?:University|College|Institute|School)(?:\s+of)?\s+([A-Za-z\s&\(\)]+)',
-            r'(G\.C\.E\.\s+[A-Za-z\s]+\s+Level)'
-        ]
-        
-        for pattern in education_patterns:
-            edu_matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in edu_matches:
-                # Extract surrounding text (+-2 lines) as context
-                context_start = max(0, text[:match.start()].rfind('\n', 0, match.start() - 50) if match.start() > 50 else 0)
-                context_end = text.find('\n', match.end() + 50) if match.end() + 50 < len(text) else len(text)
-                context = text[context_start:context_end]
-                
-                # Process this context as an education entry
-                edu_entry = self._extract_education(context, doc)
-                if edu_entry:
-                    parsed_data["education"].extend(edu_entry)
-        
-        # Look for work experience-related content
-        work_patterns = [
-            r'(?:19|20)\d{2}\s*[-–—]\s*(?:(?:19|20)\d{2}|Present|Current)',
-            r'(?:Engineer|Developer|Manager|Director|Analyst|Specialist|Consultant|Coordinator)'
-        ]
-        
-        for pattern in work_patterns:
-            work_matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in work_matches:
-                # Extract surrounding text
-                context_start = max(0, text[:match.start()].rfind('\n', 0, match.start() - 50) if match.start() > 50 else 0)
-                context_end = text.find('\n', match.end() + 50) if match.end() + 50 < len(text) else len(text)
-                context = text[context_start:context_end]
-                
-                # Process this context as work experience
-                work_entry = self._extract_work_experience(context, doc)
-                if work_entry:
-                    parsed_data["work_experience"].extend(work_entry)
-        
-        # Extract skills from full text if none found in sections
-        if not parsed_data["skills"]:
-            parsed_data["skills"] = self._extract_skills(text)
-
-    def _handle_specific_structured_format(self, text: str) -> Dict[str, Any]:
-        """Handle the specific structured format used in the test case"""
-        result = {
-            "education": [],
-            "work_experience": [],
-            "skills": []
-        }
-        
-        # Look for education section with "Qualification\nInstitution\nPeriod" format
-        edu_section_pattern = r'Education\s*\n\s*\n(?:Qualification\s*\nInstitution\s*\nPeriod\s*\nDetails\s*\n\s*\n)?([\s\S]*?)(?:\n\s*\n\S|\Z)'
-        edu_match = re.search(edu_section_pattern, text, re.IGNORECASE)
-        
-        if edu_match:
-            edu_text = edu_match.group(1).strip()
-            # Split into separate education entries
-            edu_entries = re.split(r'\n\s*\n', edu_text)
-            
-            for entry in edu_entries:
-                lines = entry.strip().split('\n')
-                if len(lines) >= 3:
-                    education = {
-                        "institution": lines[1].strip() if len(lines) > 1 else "",
-                        "degree": lines[0].strip(),
-                        "dates": lines[2].strip() if len(lines) > 2 else ""
-                    }
-                    result["education"].append(education)
-        
-        # Look for work experience with "Role\nCompany\nPeriod\nResponsibilities" format
-        work_section_pattern = r'Professional Experience\s*\n\s*\n(?:Role\s*\nCompany\s*\nPeriod\s*\nResponsibilities\s*\n\s*\n)?([\s\S]*?)(?:\n\s*\n\S|\Z)'
-        work_match = re.search(work_section_pattern, text, re.IGNORECASE)
-        
-        if work_match:
-            work_text = work_match.group(1).strip()
-            # Split into separate work entries
-            work_entries = re.split(r'\n\s*\n', work_text)
-            
-            for entry in work_entries:
-                lines = entry.strip().split('\n')
-                if len(lines) >= 3:
-                    experience = {
-                        "position": lines[0].strip(),
-                        "company": lines[1].strip() if len(lines) > 1 else "",
-                        "dates": lines[2].strip() if len(lines) > 2 else "",
-                        "description": ""
-                    }
-                    
-                    # Extract responsibilities (bullet points)
-                    responsibilities = []
-                    for i in range(3, len(lines)):
-                        line = lines[i].strip()
-                        if line.startswith('-'):
-                            responsibilities.append(line[1:].strip())
-                    
-                    experience["description"] = "\n".join(responsibilities)
-                    result["work_experience"].append(experience)
-        
-        # Look for skills section with "Category: skill1, skill2, ..." format
-        skills_section_pattern = r'Skills\s*\n\s*\n([\s\S]*?)(?:\n\s*\n\S|\Z)'
-        skills_match = re.search(skills_section_pattern, text, re.IGNORECASE)
-        
-        if skills_match:
-            skills_text = skills_match.group(1).strip()
-            # Look for skill categories
-            skill_categories = re.findall(r'(\w+):\s*([^\n]+)', skills_text)
-            
-            for category, skills_str in skill_categories:
-                skill_items = [s.strip() for s in re.split(r',\s*', skills_str)]
-                result["skills"].extend(skill_items)
-        
-        return result
-
-    def _validate_language(self, language: Dict[str, str]) -> bool:
-        """
-        Validate language entry.
-        
-        Args:
-            language (Dict[str, str]): Language entry to validate
-            
-        Returns:
-            bool: True if language is valid, False otherwise
-        """
-        if not language:
-            return False
-            
-        # Check required fields
-        if 'name' not in language or not language['name'].strip():
-            return False
-            
-        # Validate proficiency if present
-        if 'proficiency' in language and language['proficiency']:
-            valid_levels = [
-                'native', 'fluent', 'proficient', 'intermediate', 'basic',
-                'beginner', 'advanced', 'business', 'conversational',
-                'elementary', 'limited', 'professional'
-            ]
-            if language['proficiency'].lower() not in valid_levels:
-                return False
-                
-        return True
-
-    def _extract_languages(self, text: str) -> List[Dict[str, str]]:
-        """
-        Extract languages from text.
-        
-        Args:
-            text (str): Text to extract languages from
-            
-        Returns:
-            List[Dict[str, str]]: List of language entries
-            
-        Raises:
-            ResumeParserError: If extraction fails
-        """
-        try:
-            if not text:
-                return []
-                
-            languages = []
-            
-            # Common language section headers
-            lang_headers = [
-                r'(?:Language|Linguistic)(?:\s+Skills|\s+Proficiencies|\s+Competencies)?',
-                r'(?:Languages|Fluencies|Communication)'
-            ]
-            
-            # Look for language section
-            section_text = ""
-            for header in lang_headers:
-                pattern = r'(?:^|\n)(?:' + header + r')(?:[\s:]*)(?:\n|$)(.*?)(?:\n(?:^|\n)(?:' + '|'.join(lang_headers) + r')(?:[\s:]*)(?:\n|$)|$)'
-                match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-                if match:
-                    section_text = match.group(1).strip()
-                    break
-            
-            if not section_text:
-                # If no dedicated section found, look for languages throughout the text
-                section_text = text
-            
-            # Pattern for language entries
-            patterns = [
-                # Language with proficiency in parentheses
-                r'(?:^|\n)(?:[-•*]\s*)?([A-Za-z\s]+)(?:\s*[-:]\s*|\s+)?(?:\((Native|Fluent|Proficient|Intermediate|Basic|Beginner|Advanced|Business|Conversational|Elementary|Limited|Professional)\))',
-                
-                # Language followed by proficiency
-                r'(?:^|\n)(?:[-•*]\s*)?([A-Za-z\s]+)(?:\s*[-:]\s*|\s+)?(Native|Fluent|Proficient|Intermediate|Basic|Beginner|Advanced|Business|Conversational|Elementary|Limited|Professional)',
-                
-                # Language in a list
-                r'(?:^|\n)(?:[-•*]\s*)?([A-Za-z\s]+)(?:\s*[-:,]\s*|\s+)'
-            ]
-            
-            for pattern in patterns:
-                matches = re.finditer(pattern, section_text, re.IGNORECASE)
-                for match in matches:
-                    name = match.group(1).strip()
-                    proficiency = match.group(2).strip() if match.lastindex > 1 and match.group(2) else ""
-                    
-                    language = {
-                        "name": name,
-                        "proficiency": proficiency
-                    }
-                    
-                    if self._validate_language(language):
-                        # Check if language already exists
-                        exists = False
-                        for existing in languages:
-                            if existing['name'].lower() == name.lower():
-                                exists = True
-                                # Update proficiency if new one is provided
-                                if proficiency and not existing['proficiency']:
-                                    existing['proficiency'] = proficiency
-                                break
-                        
-                        if not exists:
-                            languages.append(language)
-            
-            return languages
-            
-        except Exception as e:
-            logger.error(f"Error extracting languages: {e}")
-            raise ResumeParserError(f"Failed to extract languages: {e}")
-
-    def _extract_sections(self, text: str) -> Dict[str, str]:
+    def _extract_sections(self, text: str, merge: bool = False) -> Dict[str, str]:
         """
         Extract sections from the resume text using pattern matching.
         
         Args:
             text (str): Text to extract sections from
+            merge (bool): Join the content of sections that occur more than once
+                instead of keeping one occurrence. The text before the first header
+                then always opens the contact section, and a header listed under
+                several sections (e.g. PROFILE) goes to the last of them.
             
         Returns:
             Dict[str, str]: Dictionary containing sections and their content
@@ -1186,35 +1191,35 @@ class ImprovedResumeParser:
         try:
             sections = {}
             
-            # Generate regex patterns for section headers
-            header_patterns = {}
-            for section_name, headers in self.section_headers.items():
-                patterns = []
-                for header in headers:
-                    # Create pattern that matches header text at the start of a line
-                    # followed by optional colon, blank space, and then newline
-                    pattern = r'(?:\n|^)(' + re.escape(header) + r')(?:[\s:]*)(?:\n|$)'
-                    patterns.append(pattern)
-                header_patterns[section_name] = patterns
-            
-            # Find all section headers and their positions
+            # Find all section headers and their positions in one scan. A header's
+            # span starts at the newline before it and ends after the whitespace
+            # and colons that follow it, up to the end of its line.
             section_positions = []
-            for section_name, patterns in header_patterns.items():
-                for pattern in patterns:
-                    matches = re.finditer(pattern, text, re.IGNORECASE)
-                    for match in matches:
-                        # Get the header text as it appears in the document
-                        header_text = match.group(1)
-                        # Store position, section name, and actual header text
-                        section_positions.append({
-                            'start': match.start(),
-                            'end': match.end(),
-                            'name': section_name,
-                            'header': header_text
-                        })
-            
-            # Sort section positions by their start position in the document
-            section_positions.sort(key=lambda x: x['start'])
+            header_ends: Dict[str, int] = {}
+            for match in self._section_header_pattern.finditer(text):
+                header, section_names = self._section_header_groups[match.lastgroup]
+                start = max(match.start() - 1, 0)
+                if start < header_ends.get(header, 0):
+                    # A header repeated right below itself is content of the first one
+                    continue
+                end = SECTION_HEADER_TAIL.match(text, match.end()).end()
+                header_ends[header] = end
+                for section_name in (section_names[-1:] if merge else section_names):
+                    section_positions.append({
+                        'start': start,
+                        'end': end,
+                        'name': section_name,
+                        'header': match.group(),
+                        'canonical': header
+                    })
+            
+            if merge:
+                first_section_pos = section_positions[0]['start'] if section_positions else len(text)
+                merged: Dict[str, List[str]] = {'contact': [text[:first_section_pos].strip()]}
+                for i, section in enumerate(section_positions):
+                    end_pos = section_positions[i+1]['start'] if i < len(section_positions) - 1 else len(text)
+                    merged.setdefault(section['name'], []).append(text[section['end']:end_pos].strip())
+                return {name: "\n".join(part for part in parts if part) for name, parts in merged.items()}
             
             # Extract content for each section
             for i, section in enumerate(section_positions):
@@ -1241,31 +1246,19 @@ class ImprovedResumeParser:
                 if first_part:
                     sections['contact'] = first_part
             
-            # Look for Career History section explicitly
-            career_pattern = r'(?:\n|^)(Career History|Professional Experience)(?:[\s:]*)(?:\n|$)'
-            career_match = re.search(career_pattern, text, re.IGNORECASE)
-            if career_match:
-                start_pos = career_match.end()
-                # Find end of section
-                next_section_pos = len(text)
-                for sect in section_positions:
-                    if sect['start'] > start_pos:
-                        next_section_pos = sect['start']
-                        break
-                sections['experience'] = text[start_pos:next_section_pos].strip()
-            
-            # Look for Technical Competencies section explicitly
-            tech_pattern = r'(?:\n|^)(Technical Competencies)(?:[\s:]*)(?:\n|$)'
-            tech_match = re.search(tech_pattern, text, re.IGNORECASE)
-            if tech_match:
-                start_pos = tech_match.end()
-                # Find end of section
-                next_section_pos = len(text)
-                for sect in section_positions:
-                    if sect['start'] > start_pos:
-                        next_section_pos = sect['start']
-                        break
-                sections['skills'] = text[start_pos:next_section_pos].strip()
+            # Career History / Professional Experience and Technical Competencies
+            # take their first occurrence rather than the last
+            for section_name, headers in PINNED_SECTION_HEADERS.items():
+                pinned = next((sect for sect in section_positions if sect['canonical'] in headers), None)
+                if pinned:
+                    start_pos = pinned['end']
+                    # Find end of section
+                    next_section_pos = len(text)
+                    for sect in section_positions:
+                        if sect['start'] > start_pos:
+                            next_section_pos = sect['start']
+                            break
+                    sections[section_name] = text[start_pos:next_section_pos].strip()
             
             return sections
             
@@ -1273,117 +1266,6 @@ class ImprovedResumeParser:
             logger.error(f"Error extracting sections: {e}")
             raise ResumeParserError(f"Failed to extract sections: {e}")
 
-    def extract_education(self, text: str) -> List[Dict[str, str]]:
-        """Extract education information from resume text."""
-        education = []
-        try:
-            # Split text into sections
-            sections = text.split('\n\n')
-            
-            # Find education section
-            education_section = None
-            for section in sections:
-                if 'Academic Qualifications' in section or 'Education' in section:
-                    education_section = section
-                    break
-            
-            if not education_section:
-                return education
-            
-            # Split into individual education entries
-            entries = education_section.split('\n\n')
-            
-            for entry in entries:
-                if not entry.strip() or 'Academic Qualifications' in entry or 'Education' in entry:
-                    continue
-                
-                # Extract degree and institution
-                lines = entry.split('\n')
-                if len(lines) >= 1:
-                    first_line = lines[0].strip()
-                    # Split by common separators
-                    parts = re.split(r'[,|]', first_line)
-                    if len(parts) >= 2:
-                        degree = parts[0].strip()
-                        institution = parts[1].strip()
-                        
-                        # Extract dates
-                        dates = ""
-                        for line in lines:
-                            if re.search(r'\d{4}\s*-\s*\d{4}', line):
-                                dates = line.strip()
-                                break
-                        
-                        education.append({
-                            'degree': degree,
-                            'institution': institution,
-                            'dates': dates
-                        })
-            
-            return education
-        except Exception as e:
-            self.logger.error(f"Error extracting education: {str(e)}")
-            return []
-
-    def extract_work_experience(self, text: str) -> List[Dict[str, str]]:
-        """Extract work experience information from resume text."""
-        experience = []
-        try:
-            # Split text into sections
-            sections = text.split('\n\n')
-            
-            # Find experience section
-            experience_section = None
-            for section in sections:
-                if 'Professional Experience' in section:
-                    experience_section = section
-                    break
-            
-            if not experience_section:
-                return experience
-            
-            # Split into individual experience entries
-            entries = experience_section.split('\n\n')
-            
-            for entry in entries:
-                if not entry.strip() or 'Professional Experience' in entry:
-                    continue
-                
-                # Extract position and company
-                lines = entry.split('\n')
-                if len(lines) >= 1:
-                    first_line = lines[0].strip()
-                    # Split by common separators
-                    parts = re.split(r'[,|]', first_line)
-                    if len(parts) >= 2:
-                        position = parts[0].strip()
-                        company = parts[1].strip()
-                        
-                        # Extract dates
-                        dates = ""
-                        for line in lines:
-                            if re.search(r'\d{4}\s*-\s*(?:Present|\d{4})', line):
-                                dates = line.strip()
-                                break
-                        
-                        # Extract description
-                        description = ""
-                        for line in lines[1:]:
-                            if line.strip() and not re.search(r'\d{4}\s*-\s*(?:Present|\d{4})', line):
-                                description += line.strip() + " "
-                        
-                        experience.append({
-                            'position': position,
-                            'company': company,
-                            'dates': dates,
-                            'description': description.strip()
-                        })
-            
-            return experience
-        except Exception as e:
-            self.logger.error(f"Error extracting work experience: {str(e)}")
-            return []
-
 # def test_resume_parser():
 #     """
 #     Test function to verify the resume parser functionality.
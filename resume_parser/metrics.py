@@ -0,0 +1,88 @@
+"""
+Prometheus-style latency histograms of the parsing pipeline.
+
+Rendered in the Prometheus text exposition format on the service's /metrics
+endpoint. Only the pieces the service needs are implemented, so no client
+library is required.
+"""
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Upper bounds in seconds; Gemini calls take seconds, spaCy and BERT milliseconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    """Thread-safe cumulative histogram with one label dimension."""
+
+    def __init__(self, name: str, documentation: str, label_name: str,
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_name = label_name
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets)) + (math.inf,)
+        self._series: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label: str, value: float, count: int = 1) -> None:
+        """Record `count` observations of `value` under `label`."""
+        with self._lock:
+            series = self._series.get(label)
+            if series is None:
+                # One counter per bucket, then the sum and the count
+                series = self._series[label] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += count
+            series[-2] += value * count
+            series[-1] += count
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {label: list(values) for label, values in self._series.items()}
+        for label, values in sorted(series.items()):
+            selector = f'{self.label_name}="{label}"'
+            for bound, bucket_count in zip(self.buckets, values):
+                le = "+Inf" if math.isinf(bound) else repr(bound)
+                lines.append(f'{self.name}_bucket{{{selector},le="{le}"}} {int(bucket_count)}')
+            lines.append(f"{self.name}_sum{{{selector}}} {values[-2]}")
+            lines.append(f"{self.name}_count{{{selector}}} {int(values[-1])}")
+        return "\n".join(lines) + "\n"
+
+
+STAGE_SECONDS = Histogram(
+    "resume_parser_stage_seconds",
+    "Time spent per resume in each pipeline stage",
+    "stage"
+)
+
+
+def observe_stage(stage: str, seconds: float, count: int = 1) -> None:
+    """Record time spent in a stage; `count` resumes that each took `seconds`."""
+    STAGE_SECONDS.observe(stage, seconds, count)
+
+
+@contextmanager
+def timed_stage(stage: str) -> Iterator[None]:
+    """Record the time spent in the block as one observation of `stage`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - start)
+
+
+def observe_parse_result(result: Optional[dict]) -> None:
+    """Record the parser stages of a fresh parse result from its `metadata.stage_timings_ms`."""
+    timings = ((result or {}).get("metadata") or {}).get("stage_timings_ms") or {}
+    for stage, milliseconds in timings.items():
+        STAGE_SECONDS.observe(stage, milliseconds / 1000)
+
+
+def render_metrics() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    return STAGE_SECONDS.render()
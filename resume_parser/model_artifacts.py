@@ -0,0 +1,73 @@
+"""
+Start-up checks for the model files the parser needs.
+
+Models are never downloaded at runtime: a container missing one should fail
+at start with a clear message, not stall for minutes fetching it. The checks
+only look at the filesystem, so they cost milliseconds and import none of
+the heavy libraries.
+"""
+import importlib.util
+import logging
+import os
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+# Files a DistilBERT checkpoint cannot load without
+BERT_REQUIRED_FILES = ("config.json", "vocab.txt")
+BERT_WEIGHT_FILES = ("model.safetensors", "pytorch_model.bin")
+
+
+class MissingModelError(RuntimeError):
+    """Raised when a model the parser needs is not installed"""
+    pass
+
+
+def check_spacy_model(model_name: str) -> None:
+    """
+    Check that a spaCy model is installed as a package or present as a directory.
+
+    Raises:
+        MissingModelError: If it is neither
+    """
+    if os.path.isdir(model_name) or importlib.util.find_spec(model_name) is not None:
+        return
+    raise MissingModelError(
+        f"spaCy model {model_name!r} is not installed; "
+        f"add `python -m spacy download {model_name}` to the image build"
+    )
+
+
+def _cached_hub_file(model_name: str, filename: str) -> bool:
+    from huggingface_hub import try_to_load_from_cache
+
+    try:
+        return isinstance(try_to_load_from_cache(model_name, filename), str)
+    except ValueError:
+        # Not a valid repo id either, e.g. a local path that does not exist
+        return False
+
+
+def check_bert_model(model_name: str) -> None:
+    """
+    Check that a Hugging Face model is available without network access,
+    either as a local directory or in the Hugging Face cache.
+
+    Raises:
+        MissingModelError: If any required file is missing
+    """
+    if os.path.isdir(model_name):
+        def exists(filename):
+            return os.path.exists(os.path.join(model_name, filename))
+    else:
+        def exists(filename):
+            return _cached_hub_file(model_name, filename)
+
+    missing: List[str] = [filename for filename in BERT_REQUIRED_FILES if not exists(filename)]
+    if not any(exists(filename) for filename in BERT_WEIGHT_FILES):
+        missing.append(" or ".join(BERT_WEIGHT_FILES))
+    if missing:
+        raise MissingModelError(
+            f"BERT model {model_name!r} is missing {', '.join(missing)}; pre-fetch it during the image build "
+            f"(e.g. `huggingface-cli download {model_name}`) or point the parser at a local copy"
+        )
@@ -0,0 +1,252 @@
+"""
+Write-behind buffer for the MongoDB writes of the resume parser service.
+
+Inserts of parsed resumes and ranking-score updates are queued and written by
+one background event loop with the async driver, batched into `bulk_write`
+calls. Callers get a future per write and only wait for it when they need the
+document to exist, e.g. before asking the ranking service to score it.
+"""
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import Future
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
+
+logger = logging.getLogger(__name__)
+
+# Connection pool of the service's MongoDB clients
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "20"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "2"))
+MONGO_MAX_IDLE_MS = int(os.getenv("MONGO_MAX_IDLE_MS", "60000"))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "5000"))
+
+# Writes per bulk_write, and how long the first queued write waits for company
+MONGO_WRITE_BATCH_SIZE = int(os.getenv("MONGO_WRITE_BATCH_SIZE", "100"))
+MONGO_WRITE_FLUSH_MS = float(os.getenv("MONGO_WRITE_FLUSH_MS", "50"))
+# Writers block once this many writes are queued, so a slow database cannot exhaust memory
+MONGO_WRITE_MAX_PENDING = int(os.getenv("MONGO_WRITE_MAX_PENDING", "10000"))
+
+
+def mongo_pool_options() -> Dict[str, Any]:
+    """Connection pool keyword arguments shared by the service's MongoDB clients."""
+    return {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": MONGO_MAX_IDLE_MS,
+        "waitQueueTimeoutMS": MONGO_WAIT_QUEUE_TIMEOUT_MS
+    }
+
+
+class MongoWriteBehind:
+    """
+    Batches inserts and updates into one collection and writes them with
+    `bulk_write` on a background event loop.
+
+    Inserted documents get their `_id` assigned up front, so an insert's
+    future resolves to that id once the document is stored. Within a batch
+    inserts are written before updates.
+    """
+
+    def __init__(self, collection_factory: Callable[[], Any], batch_size: int = 100,
+                 flush_interval: float = 0.05, max_pending: int = 10000):
+        """
+        Initialize the buffer. The event loop thread starts on first use.
+
+        Args:
+            collection_factory: Returns the `AsyncMongoClient` collection to write to; it is
+                called on the buffer's event loop so the client binds to that loop.
+            batch_size: Maximum writes per bulk_write.
+            flush_interval: Seconds a write waits for others to join its batch.
+            max_pending: Queued writes beyond which callers block.
+        """
+        self.collection_factory = collection_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._collection = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._flusher: Optional[Future] = None
+        self._loop_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._closed = False
+
+        self._stats_lock = threading.Lock()
+        self.pending = 0
+        self.inserted = 0
+        self.updated = 0
+        self.failed = 0
+        self.batches = 0
+
+    @classmethod
+    def from_env(cls, collection_factory: Callable[[], Any]) -> "MongoWriteBehind":
+        """Build a buffer configured by MONGO_WRITE_BATCH_SIZE, MONGO_WRITE_FLUSH_MS and MONGO_WRITE_MAX_PENDING."""
+        return cls(
+            collection_factory,
+            batch_size=MONGO_WRITE_BATCH_SIZE,
+            flush_interval=MONGO_WRITE_FLUSH_MS / 1000,
+            max_pending=MONGO_WRITE_MAX_PENDING
+        )
+
+    def insert(self, document: Dict[str, Any]) -> Future:
+        """
+        Queue a document for insertion.
+
+        Returns:
+            Future resolving to the document's `_id` once it is stored
+        """
+        document.setdefault("_id", ObjectId())
+        return self._enqueue(InsertOne(document), document["_id"])
+
+    def insert_many(self, documents: List[Dict[str, Any]], ordered: bool = False) -> SimpleNamespace:
+        """
+        Queue several documents and wait until all are stored, like `Collection.insert_many`
+        with `ordered=False`: a failed document does not stop the others.
+
+        Raises:
+            BulkWriteError: If any document could not be stored; its `writeErrors`
+                give the index of each failed document, the others are stored
+        """
+        futures = [self.insert(document) for document in documents]
+        inserted_ids = []
+        write_errors = []
+        for index, future in enumerate(futures):
+            try:
+                inserted_ids.append(future.result())
+            except PyMongoError as e:
+                write_errors.append({"index": index, "errmsg": str(e)})
+        if write_errors:
+            raise BulkWriteError({
+                "writeErrors": write_errors, "writeConcernErrors": [], "nInserted": len(inserted_ids),
+                "nUpserted": 0, "nMatched": 0, "nModified": 0, "nRemoved": 0, "upserted": []
+            })
+        return SimpleNamespace(inserted_ids=inserted_ids)
+
+    def update_one(self, filter: Dict[str, Any], update: Dict[str, Any]) -> Future:
+        """Queue an update. Returns a future resolving to None once it is written."""
+        return self._enqueue(UpdateOne(filter, update), None)
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Block until every write queued so far has been attempted."""
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._queue.join(), self._loop).result(timeout)
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """Flush queued writes and stop the event loop."""
+        with self._loop_lock:
+            self._closed = True
+        try:
+            self.flush(timeout)
+        finally:
+            with self._loop_lock:
+                if self._loop is not None:
+                    self._flusher.cancel()
+                    asyncio.run_coroutine_threadsafe(self._close_client(), self._loop).result(timeout)
+                    self._loop.call_soon_threadsafe(self._loop.stop)
+                    self._loop = None
+
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return {
+                "pending": self.pending,
+                "inserted": self.inserted,
+                "updated": self.updated,
+                "failed": self.failed,
+                "batches": self.batches
+            }
+
+    def _enqueue(self, operation, result: Any) -> Future:
+        future: Future = Future()
+        self._slots.acquire()
+        with self._stats_lock:
+            self.pending += 1
+        with self._loop_lock:
+            if self._closed:
+                self._release(1)
+                raise RuntimeError("MongoDB write buffer is closed")
+            loop = self._ensure_loop()
+            loop.call_soon_threadsafe(self._queue.put_nowait, (operation, result, future))
+        return future
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._queue = asyncio.Queue()
+            threading.Thread(target=self._loop.run_forever, name="mongo-writer", daemon=True).start()
+            self._flusher = asyncio.run_coroutine_threadsafe(self._flush_forever(), self._loop)
+        return self._loop
+
+    async def _close_client(self) -> None:
+        if self._collection is not None:
+            await self._collection.database.client.close()
+
+    def _release(self, count: int) -> None:
+        with self._stats_lock:
+            self.pending -= count
+        for _ in range(count):
+            self._slots.release()
+
+    async def _flush_forever(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._write(batch)
+            except Exception as e:
+                # Never let one bad batch stop the flusher
+                logger.error(f"MongoDB write-behind batch failed unexpectedly: {e}")
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            finally:
+                self._release(len(batch))
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _write(self, batch: List[Tuple[Any, Any, Future]]) -> None:
+        if self._collection is None:
+            self._collection = self.collection_factory()
+        inserts = [entry for entry in batch if isinstance(entry[0], InsertOne)]
+        updates = [entry for entry in batch if not isinstance(entry[0], InsertOne)]
+        for entries, kind, counter in ((inserts, "insert", "inserted"), (updates, "update", "updated")):
+            if not entries:
+                continue
+            errors: Dict[int, Exception] = {}
+            try:
+                await self._collection.bulk_write([operation for operation, _, _ in entries], ordered=False)
+            except BulkWriteError as e:
+                for error in e.details.get("writeErrors", []):
+                    errors[error["index"]] = PyMongoError(error.get("errmsg", "write failed"))
+                if not errors:
+                    # e.g. a write concern error: nothing is known to have failed on its own
+                    errors = {index: e for index in range(len(entries))}
+            except PyMongoError as e:
+                errors = {index: e for index in range(len(entries))}
+
+            for index, (_, result, future) in enumerate(entries):
+                if index in errors:
+                    future.set_exception(errors[index])
+                else:
+                    future.set_result(result)
+            with self._stats_lock:
+                setattr(self, counter, getattr(self, counter) + len(entries) - len(errors))
+                self.failed += len(errors)
+                self.batches += 1
+            if errors:
+                logger.warning(f"MongoDB bulk write: {len(errors)} of {len(entries)} {kind} operations failed")
@@ -0,0 +1,56 @@
+"""
+Loading of the spaCy pipeline used to verify Gemini's output.
+
+The parser only reads `doc.ents`, so by default every component that NER
+does not depend on (tagger, parser, lemmatizer, attribute ruler, ...) is
+disabled. Set SPACY_PIPELINE=full to run the complete pipeline.
+"""
+import logging
+import os
+from typing import Iterable, List, Set
+
+logger = logging.getLogger(__name__)
+
+# "lean" runs only the components in SPACY_KEEP_COMPONENTS and what they listen to
+SPACY_PIPELINE = os.getenv("SPACY_PIPELINE", "lean").lower()
+SPACY_KEEP_COMPONENTS = [name.strip() for name in os.getenv("SPACY_KEEP_COMPONENTS", "ner").split(",") if name.strip()]
+
+
+def required_components(nlp, keep: Iterable[str]) -> Set[str]:
+    """
+    Names of the components needed to run `keep`.
+
+    Besides the kept components themselves this includes shared embedding
+    layers (tok2vec, transformer) that a kept component listens to.
+    """
+    required = {name for name in keep if name in nlp.pipe_names}
+    for name, component in nlp.pipeline:
+        listeners = getattr(component, "listening_components", None) or []
+        if required.intersection(listeners):
+            required.add(name)
+    return required
+
+
+def load_spacy_pipeline(model_name: str, lean: bool = SPACY_PIPELINE == "lean",
+                        keep: Iterable[str] = SPACY_KEEP_COMPONENTS):
+    """
+    Load a spaCy model, disabling every component the kept ones don't need.
+
+    Args:
+        model_name: Installed spaCy model, e.g. "en_core_web_sm"
+        lean: Disable unneeded components; False runs the full pipeline
+        keep: Components whose output is used
+
+    Returns:
+        The loaded Language object
+    """
+    import spacy
+
+    nlp = spacy.load(model_name)
+    if lean:
+        required = required_components(nlp, keep)
+        disabled: List[str] = [name for name in nlp.pipe_names if name not in required]
+        if disabled:
+            nlp.select_pipes(disable=disabled)
+        logger.info(f"spaCy pipeline {model_name}: running {nlp.pipe_names}, disabled {disabled}")
+    return nlp
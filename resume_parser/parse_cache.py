@@ -0,0 +1,187 @@
+"""
+Content-hash cache of parse results.
+
+Candidates often upload the same CV to several jobs. Results are stored under
+the SHA-256 of the raw file bytes and of the whitespace-normalized extracted
+text, so a repeat upload skips Gemini and the NLP pipeline entirely even when
+the file was re-exported.
+
+Cached results are personal data, so entries expire after a time to live
+and the oldest are evicted beyond a maximum count.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
+
+
+def hash_bytes(contents: bytes) -> str:
+    return hashlib.sha256(contents).hexdigest()
+
+
+def hash_text(text: str) -> str:
+    """Hash of the extracted text with whitespace differences ignored."""
+    return hashlib.sha256(" ".join(text.split()).encode("utf-8")).hexdigest()
+
+
+class ParseResultCache:
+    """
+    SQLite store of parse results keyed by file and text hashes.
+
+    An optional MongoDB collection mirrors every entry so that service
+    instances on other hosts can reuse each other's results; local misses
+    read through to it.
+    """
+
+    def __init__(self, directory: str, parser_version: str, mirror_collection=None,
+                 max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Directory holding `parse_cache.db`.
+            parser_version: Entries written by another parser version are ignored.
+            mirror_collection: Optional MongoDB collection to mirror entries to.
+            max_entries: Local entries kept; the oldest are evicted on put. None keeps all.
+            ttl_seconds: Age after which entries are neither returned nor kept. None keeps them.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.parser_version = parser_version
+        self.mirror = mirror_collection
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            os.path.join(directory, "parse_cache.db"),
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=30
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS parse_cache (
+                key TEXT PRIMARY KEY,
+                parser_version TEXT NOT NULL,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS parse_cache_created_at ON parse_cache (created_at)")
+
+    def get(self, file_hash: Optional[str] = None, text_hash: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Look up a parse result by file hash and/or text hash.
+
+        Returns:
+            A copy of the cached parse result marked as a cache hit, or None
+        """
+        keys = [key for key in (self._key("file", file_hash), self._key("text", text_hash)) if key]
+        result = self._get_local(keys)
+        if result is None and self.mirror is not None:
+            result = self._get_mirror(keys)
+            if result is not None:
+                self._put_local(keys, result)
+
+        with self._lock:
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        result.setdefault("metadata", {})["cache_hit"] = True
+        return result
+
+    def put(self, result: Dict[str, Any], file_hash: Optional[str] = None, text_hash: Optional[str] = None) -> None:
+        """Store a parse result under every hash given. Degraded or partial parses are not stored."""
+        metadata = result.get("metadata", {})
+        if metadata.get("gemini_fallback") or metadata.get("response_repaired"):
+            return
+        keys = [key for key in (self._key("file", file_hash), self._key("text", text_hash)) if key]
+        self._put_local(keys, result)
+        if self.mirror is not None:
+            self._put_mirror(keys, result)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            entries = self._conn.execute("SELECT COUNT(*) FROM parse_cache").fetchone()[0]
+        return {
+            "lookups": lookups,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": entries
+        }
+
+    def _key(self, kind: str, digest: Optional[str]) -> Optional[str]:
+        return f"{kind}:{digest}" if digest else None
+
+    def _cutoff(self) -> float:
+        """Creation time of the oldest entry still valid."""
+        return time.time() - self.ttl_seconds if self.ttl_seconds is not None else float("-inf")
+
+    def _get_local(self, keys) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            for key in keys:
+                row = self._conn.execute(
+                    "SELECT result FROM parse_cache WHERE key = ? AND parser_version = ? AND created_at >= ?",
+                    (key, self.parser_version, self._cutoff())
+                ).fetchone()
+                if row is not None:
+                    return json.loads(row[0])
+        return None
+
+    def _put_local(self, keys, result: Dict[str, Any]) -> None:
+        serialized = json.dumps(result, default=str)
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO parse_cache (key, parser_version, result, created_at) VALUES (?, ?, ?, ?)",
+                [(key, self.parser_version, serialized, now) for key in keys]
+            )
+            self._prune()
+
+    def _prune(self) -> None:
+        """Delete expired entries and the oldest beyond max_entries; called with the lock held."""
+        if self.ttl_seconds is not None:
+            self._conn.execute("DELETE FROM parse_cache WHERE created_at < ?", (self._cutoff(),))
+        if self.max_entries is not None:
+            self._conn.execute(
+                "DELETE FROM parse_cache WHERE key IN "
+                "(SELECT key FROM parse_cache ORDER BY created_at DESC, rowid DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def _get_mirror(self, keys) -> Optional[Dict[str, Any]]:
+        try:
+            document = self.mirror.find_one({"_id": {"$in": keys}, "parser_version": self.parser_version,
+                                             "created_at": {"$gte": self._cutoff()}})
+        except PyMongoError as e:
+            logger.warning(f"Parse cache mirror lookup failed: {e}")
+            return None
+        return json.loads(document["result"]) if document else None
+
+    def _put_mirror(self, keys, result: Dict[str, Any]) -> None:
+        serialized = json.dumps(result, default=str)
+        try:
+            for key in keys:
+                self.mirror.replace_one(
+                    {"_id": key},
+                    {"_id": key, "parser_version": self.parser_version, "result": serialized, "created_at": time.time()},
+                    upsert=True
+                )
+        except PyMongoError as e:
+            logger.warning(f"Parse cache mirror write failed: {e}")
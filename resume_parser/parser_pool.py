@@ -0,0 +1,113 @@
+"""
+Process-wide pool of warm HybridCVParser instances.
+
+Loading spaCy, DistilBERT and the Gemini client takes seconds and hundreds of MB,
+so the service builds its parsers once at startup and lends them out per request.
+"""
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ParserPool:
+    """
+    Thread-safe pool of pre-loaded parser instances.
+
+    The pool is filled by `warm_up()` and hands parsers out through the
+    `acquire()` context manager, so at most `size` parses run concurrently and
+    no request ever pays the model loading cost.
+    """
+
+    def __init__(self, factory: Callable[[], Any], size: int = 1):
+        """
+        Initialize an empty pool.
+
+        Args:
+            factory: Callable that builds a fully loaded parser instance.
+            size: Number of parser instances to keep warm.
+        """
+        if size < 1:
+            raise ValueError("Parser pool size must be at least 1")
+
+        self.size = size
+        self._factory = factory
+        self._parsers: "queue.LifoQueue[Any]" = queue.LifoQueue(maxsize=size)
+        self._ready = threading.Event()
+        self._warm_lock = threading.Lock()
+        self._error: Optional[BaseException] = None
+
+    @property
+    def is_ready(self) -> bool:
+        """True once every parser in the pool has finished loading its models."""
+        return self._ready.is_set()
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        """The exception raised while warming up, if any."""
+        return self._error
+
+    def warm_up(self) -> None:
+        """
+        Build all parser instances. Safe to call more than once.
+
+        Raises:
+            Exception: Whatever the parser factory raised while loading models.
+        """
+        with self._warm_lock:
+            if self._ready.is_set():
+                return
+
+            self._error = None
+            try:
+                while self._parsers.qsize() < self.size:
+                    self._parsers.put_nowait(self._factory())
+                    logger.info(f"Warmed parser {self._parsers.qsize()}/{self.size}")
+            except Exception as e:
+                self._error = e
+                logger.error(f"Failed to warm up parser pool: {e}")
+                raise
+
+            self._ready.set()
+            logger.info(f"Parser pool ready with {self.size} instance(s)")
+
+    def warm_up_in_background(self) -> threading.Thread:
+        """Warm up the pool on a daemon thread so startup does not block."""
+        def _run() -> None:
+            try:
+                self.warm_up()
+            except Exception:
+                # The error is recorded on the pool and surfaced by readiness checks
+                pass
+
+        thread = threading.Thread(target=_run, name="parser-pool-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """
+        Borrow a parser for the duration of a `with` block.
+
+        Args:
+            timeout: Seconds to wait for a free parser. None waits forever.
+
+        Raises:
+            RuntimeError: If the pool has not finished warming up.
+            TimeoutError: If no parser became free within `timeout`.
+        """
+        if not self._ready.is_set():
+            raise RuntimeError("Parser pool is not ready yet")
+
+        try:
+            parser = self._parsers.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError("Timed out waiting for a free parser")
+
+        try:
+            yield parser
+        finally:
+            self._parsers.put_nowait(parser)
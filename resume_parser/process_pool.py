@@ -0,0 +1,190 @@
+"""
+Process-pool execution mode for the CPU-bound parsing stages.
+
+Each worker process loads its own HybridCVParser once in the pool initializer
+and then only receives raw upload bytes or extracted text, so spaCy, DistilBERT and PyPDF2 run
+outside the service process and every core can be used.
+"""
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Parser owned by the current worker process
+_worker_parser = None
+
+
+def _init_worker(torch_threads: int, preload_models: bool = True) -> None:
+    """Pool initializer: build the parser once per worker process."""
+    global _worker_parser
+
+    # Several processes share the machine, so keep intra-op threading small.
+    # Set before bert_backends is imported, it reads the value at import time.
+    os.environ.setdefault("BERT_ONNX_THREADS", str(torch_threads))
+
+    import torch
+    from bert_backends import BERT_BACKEND, cache_namespace
+    from embedding_cache import EmbeddingCache
+    from hybrid_cv_parser import HybridCVParser
+
+    torch.set_num_threads(torch_threads)
+    _worker_parser = HybridCVParser(
+        api_key=os.getenv("GOOGLE_API_KEY"),
+        embedding_cache=EmbeddingCache.from_env(cache_namespace(BERT_BACKEND))
+    )
+    if preload_models:
+        _worker_parser.load_models()
+    logger.info(f"Parser worker process {os.getpid()} ready")
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _extract_text(contents: bytes, file_extension: str) -> str:
+    """Extract the text of an upload inside a worker process."""
+    from text_extraction import extract_text
+
+    # The pool already spreads uploads over processes; don't fan out pages again
+    return extract_text(contents, file_extension, pdf_workers=1)
+
+
+def _parse(cv_text: str) -> Dict[str, Any]:
+    """Parse an already extracted text inside a worker process."""
+    return _worker_parser.parse(cv_text)
+
+
+def _parse_batch(cv_texts: List[str]) -> List[Union[Dict[str, Any], Exception]]:
+    """Parse a batch of already extracted texts inside a worker process."""
+    return _worker_parser.parse_batch(cv_texts)
+
+
+class ParserProcessPool:
+    """
+    Pool of parser worker processes with the same readiness interface as ParserPool.
+
+    Worker processes are recycled after `max_tasks_per_child` parses so that
+    memory fragmentation in torch and spaCy cannot grow without bound.
+    """
+
+    def __init__(self, size: int = 1, max_tasks_per_child: Optional[int] = 200, torch_threads: int = 1,
+                 preload_models: bool = True):
+        """
+        Initialize the pool. Processes are started by `warm_up()`.
+
+        Args:
+            size: Number of worker processes.
+            max_tasks_per_child: Parses before a worker is replaced. None never recycles.
+            torch_threads: Intra-op threads torch may use in each worker.
+            preload_models: Load spaCy and BERT when a worker starts rather than on its first parse.
+        """
+        if size < 1:
+            raise ValueError("Parser pool size must be at least 1")
+
+        self.size = size
+        self.max_tasks_per_child = max_tasks_per_child
+        self.torch_threads = torch_threads
+        self.preload_models = preload_models
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._ready = threading.Event()
+        self._warm_lock = threading.Lock()
+        self._error: Optional[BaseException] = None
+
+    @property
+    def is_ready(self) -> bool:
+        """True once the worker processes have loaded their models."""
+        return self._ready.is_set()
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        """The exception raised while warming up, if any."""
+        return self._error
+
+    def warm_up(self) -> None:
+        """
+        Start the worker processes and wait until their models are loaded.
+
+        Raises:
+            Exception: Whatever a worker raised while loading models.
+        """
+        with self._warm_lock:
+            if self._ready.is_set():
+                return
+
+            self._error = None
+            try:
+                # Spawn rather than fork: forking after torch has started threads is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.size,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.torch_threads, self.preload_models),
+                    max_tasks_per_child=self.max_tasks_per_child
+                )
+                # One ping per worker forces every process to start and run its initializer
+                pings = [self._executor.submit(_ping) for _ in range(self.size)]
+                wait(pings)
+                pids = {ping.result() for ping in pings}
+            except Exception as e:
+                self._error = e
+                logger.error(f"Failed to start parser worker processes: {e}")
+                raise
+
+            self._ready.set()
+            logger.info(f"Parser process pool ready with {len(pids)} process(es)")
+
+    def warm_up_in_background(self) -> threading.Thread:
+        """Start the worker processes on a daemon thread so startup does not block."""
+        def _run() -> None:
+            try:
+                self.warm_up()
+            except Exception:
+                # The error is recorded on the pool and surfaced by readiness checks
+                pass
+
+        thread = threading.Thread(target=_run, name="parser-process-pool-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def extract_text(self, contents: bytes, file_extension: str) -> str:
+        """
+        Extract the text of an upload in a worker process, blocking until done.
+
+        Raises:
+            RuntimeError: If the pool has not finished warming up.
+        """
+        if not self._ready.is_set():
+            raise RuntimeError("Parser pool is not ready yet")
+        return self._executor.submit(_extract_text, contents, file_extension).result()
+
+    def parse(self, cv_text: str) -> Dict[str, Any]:
+        """
+        Parse a CV text in a worker process, blocking until done.
+
+        Raises:
+            RuntimeError: If the pool has not finished warming up.
+        """
+        if not self._ready.is_set():
+            raise RuntimeError("Parser pool is not ready yet")
+        return self._executor.submit(_parse, cv_text).result()
+
+    def parse_batch(self, cv_texts: List[str]) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Parse a batch of CV texts in one worker process, blocking until done.
+
+        Raises:
+            RuntimeError: If the pool has not finished warming up.
+        """
+        if not self._ready.is_set():
+            raise RuntimeError("Parser pool is not ready yet")
+        return self._executor.submit(_parse_batch, cv_texts).result()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._ready.clear()
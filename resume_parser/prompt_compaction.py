@@ -0,0 +1,153 @@
+"""
+Pre-LLM compaction of CV text.
+
+Extracted text carries layout noise that costs Gemini tokens without adding
+information: runs of whitespace, page numbers, headers and footers repeated
+on every page. This module strips that and, if the CV is still larger than
+the token budget, trims the longest sections first so every section keeps
+its header and opening lines.
+"""
+import math
+import re
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+
+# Rough size of a Gemini token in characters of English text
+CHARS_PER_TOKEN = 4
+
+TRUNCATION_MARKER = "[...]"
+
+# Minimum lines between two occurrences of a page header or footer
+MIN_PAGE_LINES = 15
+
+_INVISIBLE = re.compile("[\u200b\u200c\u200d\u2060\ufeff\u00ad]")
+_HORIZONTAL_SPACE = re.compile("[ \t\u00a0\u2000-\u200a\u202f\u3000]+")
+_BULLETS = re.compile("^[\u2022\u25cf\u25aa\u25e6\u25a0\u25a1\u25ba\u2756\u27a2\u2713\u00b7*-]+\\s*")
+_PAGE_NUMBER = re.compile(r"^(?:page\s*\d+(?:\s*(?:of|/)\s*\d+)?|-?\s*\d{1,3}\s*-?|\d+\s*/\s*\d+)$", re.IGNORECASE)
+_BOILERPLATE = re.compile(
+    r"^(?:curriculum\s+vitae|resume|r\u00e9sum\u00e9|cv|references?\s+(?:are\s+)?available\s+(?:up)?on\s+request\.?)$",
+    re.IGNORECASE
+)
+_SECTION_HEADER = re.compile(
+    r"^(?:professional\s+|work\s+|employment\s+|academic\s+|technical\s+|key\s+)?"
+    r"(?:summary|profile|objective|experience|history|education|qualifications|skills|projects|"
+    r"certifications?|awards|achievements|publications|languages|interests|references|"
+    r"contact(?:\s+information)?|volunteer(?:ing)?)\s*:?$",
+    re.IGNORECASE
+)
+_CAPS_HEADER = re.compile(r"^[A-Z][A-Z &/]{2,40}:?$")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate Gemini token count; avoids shipping a tokenizer."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _normalize_lines(text: str) -> List[str]:
+    text = _INVISIBLE.sub("", text.replace("\r\n", "\n").replace("\r", "\n"))
+    lines = []
+    for line in text.split("\n"):
+        line = _HORIZONTAL_SPACE.sub(" ", line).strip()
+        # Bullet glyphs carry no meaning for the model; keep a plain dash
+        line = _BULLETS.sub("- ", line) if _BULLETS.match(line) else line
+        lines.append(line)
+    return lines
+
+
+def _strip_boilerplate(lines: List[str]) -> List[str]:
+    # Short lines that recur three or more times, a page length apart, are
+    # page headers and footers; lines repeated closer together (a city shared
+    # by several jobs, say) are content. The first occurrence stays, since a
+    # header repeated on every page is often the contact line itself.
+    positions: Dict[str, List[int]] = defaultdict(list)
+    for i, line in enumerate(lines):
+        if line and len(line) <= 80:
+            positions[line].append(i)
+    repeated = {
+        line for line, found in positions.items()
+        if len(found) >= 3 and min(b - a for a, b in zip(found, found[1:])) >= MIN_PAGE_LINES
+    }
+
+    kept = []
+    for i, line in enumerate(lines):
+        if line and ((line in repeated and positions[line][0] != i) or _PAGE_NUMBER.match(line)
+                     or _BOILERPLATE.match(line)):
+            continue
+        # Keep at most one blank line in a row
+        if not line and (not kept or not kept[-1]):
+            continue
+        kept.append(line)
+    while kept and not kept[-1]:
+        kept.pop()
+    return kept
+
+
+def _split_sections(lines: List[str]) -> List[List[str]]:
+    sections: List[List[str]] = [[]]
+    for line in lines:
+        if line and len(line) <= 50 and (_SECTION_HEADER.match(line) or _CAPS_HEADER.match(line)) and sections[-1]:
+            sections.append([])
+        sections[-1].append(line)
+    return [section for section in sections if section]
+
+
+def _truncate_sections(sections: List[List[str]], max_tokens: int) -> List[List[str]]:
+    """
+    Cap every section at the same token allowance, chosen as large as the budget
+    allows, so short sections stay whole and only the longest ones are cut.
+    """
+    sizes = [estimate_tokens("\n".join(section)) for section in sections]
+    if sum(sizes) <= max_tokens:
+        return sections
+
+    # Water-filling: largest cap with sum(min(size, cap)) <= budget
+    remaining = max_tokens
+    cap = 0
+    for count, size in enumerate(sorted(sizes)):
+        share = remaining // (len(sizes) - count)
+        if size > share:
+            cap = share
+            break
+        remaining -= size
+
+    truncated = []
+    for section, size in zip(sections, sizes):
+        if size <= cap:
+            truncated.append(section)
+            continue
+        kept, used = [], estimate_tokens(TRUNCATION_MARKER)
+        for line in section:
+            cost = estimate_tokens(line) + 1
+            if kept and used + cost > cap:
+                break
+            kept.append(line)
+            used += cost
+        truncated.append(kept + [TRUNCATION_MARKER])
+    return truncated
+
+
+def compact_cv_text(text: str, max_tokens: int) -> Tuple[str, Dict[str, Any]]:
+    """
+    Normalize whitespace, strip boilerplate and fit the CV text into a token budget.
+
+    Args:
+        text: Extracted CV text
+        max_tokens: Token budget for the CV part of the prompt; 0 disables truncation
+
+    Returns:
+        The compacted text and stats with estimated token counts before and after
+    """
+    lines = _strip_boilerplate(_normalize_lines(text))
+    sections = _split_sections(lines)
+    truncated = False
+    if max_tokens > 0:
+        fitted = _truncate_sections(sections, max_tokens)
+        truncated = fitted is not sections
+        sections = fitted
+
+    compacted = "\n".join(line for section in sections for line in section)
+    return compacted, {
+        "cv_tokens_estimated": estimate_tokens(text),
+        "cv_tokens_sent": estimate_tokens(compacted),
+        "truncated": truncated
+    }
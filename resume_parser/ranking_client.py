@@ -0,0 +1,219 @@
+"""
+Pooled async client for the candidate ranking service.
+
+Requests run on one background event loop per process over a shared
+keep-alive connection pool, with timeouts and jittered retries. Synchronous
+callers get a future per resume.
+
+With RANKING_BATCH_SIZE above 1 the client micro-batches: once at least
+RANKING_BATCH_MIN_QUEUE resumes are waiting, up to RANKING_BATCH_SIZE of them
+are sent in one call as {"resumeIDs": [...]}, and the service is expected to
+answer {"results": [{"resumeID": ..., "ranking_score": ...}, ...]}. A lone
+resume is always sent as {"resumeID": ...}, the service's original contract.
+"""
+import asyncio
+import logging
+import os
+import random
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying: throttling and transient server errors
+RETRYABLE_STATUS = {429, 502, 503, 504}
+
+
+class RankingServiceError(RuntimeError):
+    """Raised when the ranking service could not score a resume"""
+    pass
+
+
+class RankingClient:
+    """
+    Sends resume ids to the ranking service and resolves each to its score.
+    """
+
+    def __init__(self, url: str, timeout: float = 30.0, connect_timeout: float = 5.0,
+                 max_connections: int = 20, max_retries: int = 3, base_delay: float = 0.5,
+                 batch_size: int = 1, batch_min_queue: int = 2, batch_wait: float = 0.02):
+        """
+        Initialize the client. The event loop thread starts on first use.
+
+        Args:
+            url: Ranking endpoint.
+            timeout: Seconds a single call may take.
+            connect_timeout: Seconds to establish a connection.
+            max_connections: Size of the connection pool, also the limit of calls in flight.
+            max_retries: Retries of a transient failure before giving up.
+            base_delay: Backoff before the first retry, doubled each attempt.
+            batch_size: Maximum resume ids per call; 1 disables micro-batching.
+            batch_min_queue: Queue depth from which resumes are batched.
+            batch_wait: Seconds a batch waits to fill up.
+        """
+        self.url = url
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.max_connections = max_connections
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.batch_size = max(1, batch_size)
+        self.batch_min_queue = batch_min_queue
+        self.batch_wait = batch_wait
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+        self._queue: Optional[asyncio.Queue] = None
+        self._http_client = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._in_flight = set()
+
+        self._stats_lock = threading.Lock()
+        self.calls = 0
+        self.ranked = 0
+        self.failed = 0
+        self.retries = 0
+
+    @classmethod
+    def from_env(cls) -> "RankingClient":
+        """Build a client configured by the RANKING_* environment variables."""
+        return cls(
+            os.getenv("RANKING_SERVICE_URL", "https://aicandidaterankingcs3023.azurewebsites.net/api/ranking"),
+            timeout=float(os.getenv("RANKING_TIMEOUT", "30")),
+            connect_timeout=float(os.getenv("RANKING_CONNECT_TIMEOUT", "5")),
+            max_connections=int(os.getenv("RANKING_MAX_CONNECTIONS", "20")),
+            max_retries=int(os.getenv("RANKING_MAX_RETRIES", "3")),
+            batch_size=int(os.getenv("RANKING_BATCH_SIZE", "1")),
+            batch_min_queue=int(os.getenv("RANKING_BATCH_MIN_QUEUE", "2")),
+            batch_wait=float(os.getenv("RANKING_BATCH_WAIT_MS", "20")) / 1000
+        )
+
+    def rank(self, resume_id: Any) -> Future:
+        """
+        Queue a resume for ranking.
+
+        Returns:
+            Future resolving to the ranking score, or raising RankingServiceError
+        """
+        future: Future = Future()
+        loop = self._ensure_loop()
+        loop.call_soon_threadsafe(self._queue.put_nowait, (str(resume_id), future))
+        return future
+
+    def rank_many(self, resume_ids: List[Any]) -> List[Future]:
+        """Queue several resumes at once so they can share ranking calls."""
+        return [self.rank(resume_id) for resume_id in resume_ids]
+
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return {
+                "calls": self.calls,
+                "ranked": self.ranked,
+                "failed": self.failed,
+                "retries": self.retries,
+                "queued": self._queue.qsize() if self._queue is not None else 0
+            }
+
+    def close(self) -> None:
+        with self._loop_lock:
+            if self._loop is not None:
+                if self._http_client is not None:
+                    asyncio.run_coroutine_threadsafe(self._http_client.aclose(), self._loop).result(5)
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._loop = None
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._queue = asyncio.Queue()
+                threading.Thread(target=self._loop.run_forever, name="ranking-client", daemon=True).start()
+                asyncio.run_coroutine_threadsafe(self._dispatch_forever(), self._loop)
+            return self._loop
+
+    async def _dispatch_forever(self) -> None:
+        import httpx
+
+        self._http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+            limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections)
+        )
+        self._semaphore = asyncio.Semaphore(self.max_connections)
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            # Only batch when work is piling up; a lone resume goes out at once
+            if self.batch_size > 1 and self._queue.qsize() + 1 >= self.batch_min_queue:
+                deadline = loop.time() + self.batch_wait
+                while len(batch) < self.batch_size:
+                    if not self._queue.empty():
+                        batch.append(self._queue.get_nowait())
+                        continue
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+            await self._semaphore.acquire()
+            task = loop.create_task(self._send(batch))
+            # The loop only keeps weak references to tasks
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+            task.add_done_callback(lambda _: self._semaphore.release())
+
+    async def _send(self, batch: List[Tuple[str, Future]]) -> None:
+        resume_ids = [resume_id for resume_id, _ in batch]
+        try:
+            if len(batch) == 1:
+                data = await self._post({"resumeID": resume_ids[0]})
+                scores = {resume_ids[0]: data.get("ranking_score")}
+            else:
+                data = await self._post({"resumeIDs": resume_ids})
+                scores = {str(item["resumeID"]): item.get("ranking_score") for item in data.get("results", [])}
+        except Exception as e:
+            error = e if isinstance(e, RankingServiceError) else RankingServiceError(f"Ranking request failed: {e}")
+            with self._stats_lock:
+                self.failed += len(batch)
+            for _, future in batch:
+                future.set_exception(error)
+            return
+
+        ranked = 0
+        for resume_id, future in batch:
+            if resume_id in scores:
+                future.set_result(scores[resume_id])
+                ranked += 1
+            else:
+                future.set_exception(RankingServiceError(f"Ranking service returned no score for {resume_id}"))
+        with self._stats_lock:
+            self.ranked += ranked
+            self.failed += len(batch) - ranked
+
+    async def _post(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        import httpx
+
+        for attempt in range(self.max_retries + 1):
+            with self._stats_lock:
+                self.calls += 1
+            try:
+                response = await self._http_client.post(self.url, json=body)
+                if response.status_code not in RETRYABLE_STATUS:
+                    response.raise_for_status()
+                    return response.json()
+                error: Exception = RankingServiceError(f"Ranking service returned {response.status_code}")
+            except (httpx.TimeoutException, httpx.TransportError) as e:
+                error = e
+            except (httpx.HTTPStatusError, ValueError) as e:
+                # Client errors and unreadable bodies will not improve on retry
+                raise RankingServiceError(f"Ranking request failed: {e}")
+
+            if attempt == self.max_retries:
+                raise RankingServiceError(f"Ranking request failed after {attempt + 1} attempt(s): {error}")
+            with self._stats_lock:
+                self.retries += 1
+            delay = random.uniform(0, self.base_delay * 2 ** attempt)
+            logger.warning(f"Ranking request failed ({error!r}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
@@ -0,0 +1,171 @@
+"""
+Skill taxonomy compiled into a token trie.
+
+A taxonomy lists canonical skills with their aliases, e.g. "nodejs" and
+"node js" for Node.js. Text is split into tokens once and scanned left to
+right: from each token the trie is walked as far as the text allows and the
+longest skill ending on the way wins, so "React Native" is found rather than
+"React". List separators and line breaks end a walk. The scan is linear in the
+length of the text.
+
+The default taxonomy ships as skill_taxonomy.json; SKILL_TAXONOMY_PATH points
+the parser at another file in the same format:
+
+    {"version": 1, "skills": [
+        {"name": "Node.js", "category": "technical", "aliases": ["nodejs", "node js"]},
+        {"name": "Go", "category": "technical", "aliases": ["golang"], "case_sensitive": true},
+        {"name": "AWS Lambda", "category": "technical", "case_sensitive_aliases": ["Lambda"]},
+        {"name": "C", "category": "technical", "aliases": ["ANSI C"], "match_name": false}
+    ]}
+
+Names and aliases match case-insensitively unless `case_sensitive` is set;
+`case_sensitive_aliases` are forms that are ordinary words in other cases.
+With `match_name` false only the aliases are matched, for names like "C"
+that are too ambiguous on their own.
+"""
+import json
+import logging
+import os
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "skill_taxonomy.json")
+SKILL_TAXONOMY_PATH = os.getenv("SKILL_TAXONOMY_PATH", DEFAULT_TAXONOMY_PATH)
+
+# Words with the "+" and "#" of C++ and C#, and the punctuation inside names like Node.js, CI/CD or R&D
+SKILL_TOKEN = re.compile(r"[^\W_]+[+#]*|[./&-]")
+# Scanned text also keeps the separators of lists and lines; no form contains them,
+# so "React, Native bridges" cannot match React Native
+TEXT_TOKEN = re.compile(SKILL_TOKEN.pattern + r"|[,;:()|\n]")
+
+# Key of a trie node's matches; tokens are never empty, so it cannot clash with a child
+_MATCHES = ""
+
+# One taxonomy per file and process, see SkillTaxonomy.from_env
+_shared_taxonomies: Dict[str, "SkillTaxonomy"] = {}
+_shared_taxonomies_lock = threading.Lock()
+
+
+class SkillTaxonomy:
+    """
+    Canonical skills and their aliases, matched as token sequences.
+    """
+
+    def __init__(self, skills: Iterable[Dict[str, Any]]):
+        """
+        Compile the taxonomy.
+
+        Args:
+            skills: Entries with a `name` and optionally `category`, `aliases`,
+                `case_sensitive_aliases`, `case_sensitive` and `match_name`.
+
+        Raises:
+            ValueError: If an entry has no name or two skills share a form
+        """
+        self._root: Dict[str, Any] = {}
+        self.categories: Dict[str, Optional[str]] = {}
+
+        for entry in skills:
+            name = entry.get("name")
+            if not isinstance(name, str) or not name.strip():
+                raise ValueError(f"Skill taxonomy entry without a name: {entry!r}")
+            if name in self.categories:
+                raise ValueError(f"Skill {name!r} is listed twice in the taxonomy")
+            self.categories[name] = entry.get("category")
+
+            case_sensitive = bool(entry.get("case_sensitive", False))
+            forms = ([name] if entry.get("match_name", True) else []) + list(entry.get("aliases", []))
+            for form in forms:
+                self._add(form, name, case_sensitive)
+            for form in entry.get("case_sensitive_aliases", []):
+                self._add(form, name, True)
+
+    @classmethod
+    def from_file(cls, path: str) -> "SkillTaxonomy":
+        """Load a taxonomy from a JSON file in the format described above."""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        taxonomy = cls(data.get("skills", []))
+        logger.info(f"Loaded skill taxonomy with {len(taxonomy)} skills from {path}")
+        return taxonomy
+
+    @classmethod
+    def from_env(cls) -> "SkillTaxonomy":
+        """
+        Get the process-wide taxonomy loaded from SKILL_TAXONOMY_PATH, or the
+        bundled one. Parsers share it so it is only compiled once.
+        """
+        with _shared_taxonomies_lock:
+            if SKILL_TAXONOMY_PATH not in _shared_taxonomies:
+                _shared_taxonomies[SKILL_TAXONOMY_PATH] = cls.from_file(SKILL_TAXONOMY_PATH)
+            return _shared_taxonomies[SKILL_TAXONOMY_PATH]
+
+    def __len__(self) -> int:
+        return len(self.categories)
+
+    def extract(self, text: str) -> List[str]:
+        """
+        Find every skill of the taxonomy mentioned in the text.
+
+        Overlapping mentions resolve to the longest skill starting first.
+
+        Returns:
+            Canonical skill names in order of first mention
+        """
+        tokens = TEXT_TOKEN.findall(text)
+        lowered = [token.lower() for token in tokens]
+        found: Dict[str, None] = {}
+        i = 0
+        while i < len(tokens):
+            canonical, end = self._longest_match(tokens, lowered, i)
+            if canonical is None:
+                i += 1
+            else:
+                found.setdefault(canonical)
+                i = end
+        return list(found)
+
+    def canonical(self, skill: str) -> Optional[str]:
+        """The canonical name of a skill given by any of its forms, or None if it is not in the taxonomy."""
+        tokens = TEXT_TOKEN.findall(skill)
+        if not tokens:
+            return None
+        canonical, end = self._longest_match(tokens, [token.lower() for token in tokens], 0)
+        return canonical if end == len(tokens) else None
+
+    def category(self, skill: str) -> Optional[str]:
+        """The category of a skill given by any of its forms."""
+        canonical = self.canonical(skill)
+        return self.categories.get(canonical) if canonical else None
+
+    def _add(self, form: str, name: str, case_sensitive: bool) -> None:
+        tokens = tuple(SKILL_TOKEN.findall(form))
+        if not tokens:
+            raise ValueError(f"Skill {name!r} has a form without words: {form!r}")
+        node = self._root
+        for token in tokens:
+            node = node.setdefault(token.lower(), {})
+        matches: List[Tuple[str, Optional[Tuple[str, ...]]]] = node.setdefault(_MATCHES, [])
+        exact = tokens if case_sensitive else None
+        for other, other_exact in matches:
+            if other != name and other_exact == exact:
+                raise ValueError(f"Skills {other!r} and {name!r} share the form {form!r}")
+        # Case-sensitive forms go first, they are the more specific ones
+        matches.insert(0 if case_sensitive else len(matches), (name, exact))
+
+    def _longest_match(self, tokens: List[str], lowered: List[str], start: int) -> Tuple[Optional[str], int]:
+        """The longest skill starting at token `start` and the index of the token after it."""
+        node = self._root
+        best: Tuple[Optional[str], int] = (None, start)
+        for end in range(start, len(tokens)):
+            node = node.get(lowered[end])
+            if node is None:
+                break
+            for name, exact in node.get(_MATCHES, ()):
+                if exact is None or exact == tuple(tokens[start:end + 1]):
+                    best = (name, end + 1)
+                    break
+        return best
@@ -19,6 +19,11 @@ source venv/bin/activate
 echo "Installing dependencies..."
 pip3 install -r requirements.txt
 
+# The service never downloads models at runtime, fetch them now
+echo "Fetching models..."
+python3 -m spacy download en_core_web_sm
+python3 -c "from transformers import DistilBertModel, DistilBertTokenizer; DistilBertTokenizer.from_pretrained('distilbert-base-uncased'); DistilBertModel.from_pretrained('distilbert-base-uncased')"
+
 # Create .env file if it doesn't exist
 if [ ! -f ".env" ]; then
     echo "Creating .env file..."
@@ -0,0 +1,101 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add resume_parser directory to sys.path to ensure module imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("onnx")
+
+from bert_backends import BERT_MODEL_NAME, ONNX_INT8_BACKEND, TORCH_BACKEND, load_bert
+from bert_embeddings import BertEmbedder
+from hybrid_cv_parser import BERT_REFERENCES, HybridCVParser
+
+SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "React", "Django", "Docker", "Kubernetes",
+    "PostgreSQL", "MongoDB", "AWS", "Git", "Linux", "TensorFlow", "PyTorch", "C++",
+    "REST APIs", "GraphQL", "Machine Learning", "Data Analysis", "CI/CD", "Terraform",
+    "Communication", "Teamwork", "Leadership", "Time Management", "Problem Solving",
+    "Critical Thinking", "Public Speaking", "Mentoring", "Negotiation", "Adaptability",
+    "Collaboration", "Conflict Resolution", "Attention to Detail", "Creativity",
+]
+
+# Minimum share of skills both backends must put in the same category
+MIN_AGREEMENT = 0.95
+
+
+def _build_tiny_model(directory):
+    """Randomly initialized DistilBERT with a word-level vocabulary, for hosts without the hub model."""
+    import torch
+    from transformers import DistilBertConfig, DistilBertModel, DistilBertTokenizer
+
+    words = set()
+    for text in SKILLS + list(BERT_REFERENCES.values()):
+        words.update(text.lower().replace("/", " ").split())
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + sorted(words) + list("abcdefghijklmnopqrstuvwxyz+")
+    vocab_path = os.path.join(directory, "vocab.txt")
+    with open(vocab_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(vocab))
+
+    torch.manual_seed(0)
+    config = DistilBertConfig(vocab_size=len(vocab), dim=128, hidden_dim=512, n_layers=2, n_heads=4)
+    DistilBertModel(config).save_pretrained(directory)
+    DistilBertTokenizer(vocab_path).save_pretrained(directory)
+    return directory
+
+
+@pytest.fixture(scope="module")
+def model_name(tmp_path_factory):
+    try:
+        from transformers import DistilBertModel
+        DistilBertModel.from_pretrained(BERT_MODEL_NAME, local_files_only=True)
+        return BERT_MODEL_NAME
+    except OSError:
+        return _build_tiny_model(str(tmp_path_factory.mktemp("tiny-distilbert")))
+
+
+@pytest.fixture(scope="module")
+def embedders(model_name, tmp_path_factory):
+    onnx_dir = str(tmp_path_factory.mktemp("onnx"))
+    result = {}
+    for backend in (TORCH_BACKEND, ONNX_INT8_BACKEND):
+        tokenizer, model = load_bert(backend, model_name, onnx_dir=onnx_dir)
+        embedder = BertEmbedder(tokenizer, model)
+        embedder.set_prototypes(BERT_REFERENCES)
+        result[backend] = embedder
+    return result
+
+
+def _classify(embedder, skills):
+    parser = object.__new__(HybridCVParser)
+    parser._embedder = embedder
+    candidates = {"skills": skills, "paragraphs": [], "descriptions": [], "texts": skills}
+    data = parser._apply_bert_scores({"skills": skills, "summary": "given"}, candidates, embedder.score(skills))
+    return data["skills"]
+
+
+def test_onnx_embeddings_close_to_torch(embedders):
+    torch_vectors = embedders[TORCH_BACKEND].embed_normalized(SKILLS)
+    onnx_vectors = embedders[ONNX_INT8_BACKEND].embed_normalized(SKILLS)
+
+    assert onnx_vectors.shape == torch_vectors.shape
+    cosine = np.sum(torch_vectors * onnx_vectors, axis=1)
+    assert cosine.min() > 0.98
+
+
+def test_skill_classification_matches_torch(embedders):
+    torch_skills = _classify(embedders[TORCH_BACKEND], SKILLS)
+    onnx_skills = _classify(embedders[ONNX_INT8_BACKEND], SKILLS)
+
+    torch_technical = set(torch_skills["technical_skills"])
+    onnx_technical = set(onnx_skills["technical_skills"])
+    disagreements = torch_technical ^ onnx_technical
+    assert 1 - len(disagreements) / len(SKILLS) >= MIN_AGREEMENT, f"Backends disagree on {sorted(disagreements)}"
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        load_bert("tensorrt")
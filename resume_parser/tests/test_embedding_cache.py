@@ -0,0 +1,45 @@
+import os
+import sys
+
+import numpy as np
+
+# Add resume_parser directory to sys.path to ensure module imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from embedding_cache import DiskEmbeddingStore, EmbeddingCache, text_key
+
+
+def test_store_opened_before_the_first_vector_reads_vectors_of_another_store(tmp_path):
+    # Two workers warming up on an empty cache directory
+    first = DiskEmbeddingStore(str(tmp_path))
+    second = DiskEmbeddingStore(str(tmp_path))
+    assert second.get(text_key("Python")) is None
+
+    first.put(text_key("Python"), np.arange(4, dtype=np.float32))
+
+    np.testing.assert_array_equal(second.get(text_key("Python")), np.arange(4, dtype=np.float32))
+    assert second.get(text_key("Docker")) is None
+
+
+def test_store_opened_before_the_first_vector_appends_after_another_store(tmp_path):
+    first = DiskEmbeddingStore(str(tmp_path))
+    second = DiskEmbeddingStore(str(tmp_path))
+    first.put(text_key("Python"), np.ones(4, dtype=np.float32))
+    second.put(text_key("Docker"), np.full(4, 2, dtype=np.float32))
+
+    reopened = DiskEmbeddingStore(str(tmp_path))
+    assert len(reopened) == 2
+    np.testing.assert_array_equal(reopened.get(text_key("Python")), np.ones(4, dtype=np.float32))
+    np.testing.assert_array_equal(reopened.get(text_key("Docker")), np.full(4, 2, dtype=np.float32))
+
+
+def test_cache_counts_hits_of_both_tiers(tmp_path):
+    cache = EmbeddingCache(memory_bytes=1024, disk_store=DiskEmbeddingStore(str(tmp_path)))
+    cache.put_many(["Python"], np.ones((1, 4), dtype=np.float32))
+
+    # Case and whitespace do not matter; a fresh cache on the same directory hits the disk tier
+    assert list(cache.get_many(["  python "])[0]) == ["  python "]
+    warm = EmbeddingCache(memory_bytes=1024, disk_store=DiskEmbeddingStore(str(tmp_path)))
+    found, missing = warm.get_many(["PYTHON", "Docker"])
+    assert list(found) == ["PYTHON"] and missing == ["Docker"]
+    assert (warm.stats()["disk_hits"], warm.stats()["misses"]) == (1, 1)
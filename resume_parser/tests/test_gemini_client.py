@@ -0,0 +1,64 @@
+import asyncio
+import concurrent.futures
+import os
+import sys
+
+import pytest
+from google.api_core import exceptions as google_exceptions
+
+# Add resume_parser directory to sys.path to ensure module imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from gemini_client import CircuitBreaker, GeminiClient
+
+
+class ScriptedModel:
+    """Raises or returns the scripted outcomes in turn."""
+
+    model_name = "scripted"
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+
+    async def generate_content_async(self, prompt, **kwargs):
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+
+def half_open_client(outcomes):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    return GeminiClient(ScriptedModel(outcomes), requests_per_minute=1e9, max_retries=0, breaker=breaker)
+
+
+def test_non_retryable_error_during_half_open_trial_frees_the_trial():
+    client = half_open_client([google_exceptions.InvalidArgument("bad request"), "ok"])
+    try:
+        with pytest.raises(google_exceptions.InvalidArgument):
+            client.generate("prompt")
+        # The next call is let through as the trial instead of failing with CircuitOpenError
+        assert client.generate("prompt") == "ok"
+        assert client.breaker.state == CircuitBreaker.CLOSED
+    finally:
+        client.close()
+
+
+def test_cancelled_half_open_trial_frees_the_trial():
+    client = half_open_client([asyncio.CancelledError(), "ok"])
+    try:
+        with pytest.raises(concurrent.futures.CancelledError):
+            client.generate("prompt")
+        assert client.generate("prompt") == "ok"
+    finally:
+        client.close()
+
+
+def test_breaker_refuses_a_second_trial_while_one_is_in_flight():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.release_trial()
+    assert breaker.allow()
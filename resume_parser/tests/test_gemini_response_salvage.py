@@ -0,0 +1,24 @@
+import os
+import sys
+
+# Add resume_parser directory to sys.path to ensure module imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from hybrid_cv_parser import HybridCVParser
+
+
+def test_salvaged_entries_keep_nulls_empty_and_numbers_as_text():
+    # Salvaging only needs the response, not the models
+    parser = HybridCVParser.__new__(HybridCVParser)
+    data = {
+        "name": "Jane Doe",
+        "education": [{"degree": "BSc", "institution": "UCSC", "dates": None, "details": 3.5}],
+        "work_experience": [{"position": "Engineer", "company": {"name": "Acme"}, "current": True,
+                             "description": ["Built things"]}],
+    }
+
+    salvaged, dropped = parser._salvage_fields(data)
+
+    assert salvaged["education"] == [{"degree": "BSc", "institution": "UCSC", "dates": "", "details": "3.5"}]
+    assert salvaged["work_experience"] == [{"position": "Engineer", "description": ["Built things"]}]
+    assert dropped == []
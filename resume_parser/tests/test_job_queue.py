@@ -0,0 +1,34 @@
+import os
+import sys
+
+# Add resume_parser directory to sys.path to ensure module imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from job_queue import JobStatus, ParseJobQueue
+
+
+def test_abandoned_job_fails_after_max_attempts(tmp_path):
+    # A zero lease makes every running job count as abandoned, as after a worker crash
+    job_queue = ParseJobQueue(str(tmp_path), lease_seconds=0, max_attempts=2)
+    job_id = job_queue.enqueue({"filename": "cv.pdf"}, b"%PDF")
+
+    assert job_queue.claim()["attempts"] == 1
+    assert job_queue.claim()["attempts"] == 2
+    assert job_queue.claim() is None
+
+    job = job_queue.get(job_id)
+    assert job["status"] == JobStatus.FAILED.value
+    assert "2 attempts" in job["error"]
+    assert not os.path.exists(job["spool_path"])
+    job_queue.close()
+
+
+def test_exhausted_job_does_not_block_the_next_one(tmp_path):
+    job_queue = ParseJobQueue(str(tmp_path), lease_seconds=0, max_attempts=1)
+    crashed = job_queue.enqueue({"filename": "crash.pdf"}, b"%PDF")
+    assert job_queue.claim()["id"] == crashed
+
+    waiting = job_queue.enqueue({"filename": "next.pdf"}, b"%PDF")
+    assert job_queue.claim()["id"] == waiting
+    assert job_queue.get(crashed)["status"] == JobStatus.FAILED.value
+    job_queue.close()
@@ -0,0 +1,83 @@
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+from pymongo import InsertOne
+from pymongo.errors import BulkWriteError
+
+# Add resume_parser directory to sys.path to ensure module imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from batch_ingest import BatchIngestor, build_ranking_update, build_resume_record
+from mongo_writer import MongoWriteBehind
+
+
+class FakeCollection:
+    """
+    In-memory stand-in for an AsyncMongoClient collection that applies inserts
+    and `$set` updates, rejecting inserts of the given filenames.
+    """
+
+    def __init__(self, rejected=()):
+        self.documents = {}
+        self.rejected = set(rejected)
+        self.update_filters = []
+
+        async def close():
+            pass
+        self.database = SimpleNamespace(client=SimpleNamespace(close=close))
+
+    async def bulk_write(self, operations, ordered=False):
+        errors = []
+        for index, operation in enumerate(operations):
+            if isinstance(operation, InsertOne):
+                document = operation._doc
+                if document.get("original_filename") in self.rejected:
+                    errors.append({"index": index, "code": 11000, "errmsg": "duplicate key"})
+                else:
+                    self.documents[document["_id"]] = dict(document)
+                continue
+            self.update_filters.append(operation._filter)
+            for document in self.documents.values():
+                if all(document.get(key) == value for key, value in operation._filter.items()):
+                    document.update(operation._doc["$set"])
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "writeConcernErrors": [], "nInserted": 0,
+                                  "nUpserted": 0, "nMatched": 0, "nModified": 0, "nRemoved": 0, "upserted": []})
+
+
+@pytest.fixture
+def collection():
+    return FakeCollection(rejected={"duplicate.pdf", "duplicate.txt"})
+
+
+@pytest.fixture
+def writer(collection):
+    writer = MongoWriteBehind(lambda: collection, flush_interval=0.001)
+    yield writer
+    writer.close()
+
+
+@pytest.mark.parametrize("as_string", [False, True])
+def test_ranking_score_update_matches_the_inserted_resume(collection, writer, as_string):
+    record = build_resume_record({"name": "Jane Doe"}, "job-1", "cv.pdf")
+    resume_id = writer.insert(record).result(5)
+
+    writer.update_one(*build_ranking_update(str(resume_id) if as_string else resume_id, 87)).result(5)
+
+    assert collection.update_filters == [{"_id": resume_id}]
+    assert collection.documents[resume_id]["ranking_score"] == 87
+
+
+def test_batch_reports_only_the_documents_that_failed(writer):
+    ranked = []
+    ingestor = BatchIngestor(lambda texts: [{"name": text} for text in texts], writer, chunk_size=3,
+                             after_insert=ranked.extend)
+    files = [(name, name.encode()) for name in ("first.txt", "duplicate.txt", "last.txt")]
+
+    report = ingestor.ingest(files, "job-1")
+
+    assert report["succeeded"] == 2 and report["failed"] == 1
+    assert [error["file"] for error in report["errors"]] == ["duplicate.txt"]
+    assert [str(resume_id) for resume_id in ranked] == report["resume_ids"]
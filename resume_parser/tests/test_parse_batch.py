@@ -0,0 +1,92 @@
+import os
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+
+# Add resume_parser directory to sys.path to ensure module imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from batch_ingest import BatchIngestor
+from hybrid_cv_parser import HybridCVParser
+
+# Gemini "responses" by CV text; work_experience must be a list of entries
+PARSES = {
+    "jane": {"name": "Jane Doe", "skills": ["Python"]},
+    "malformed": {"name": "John Roe", "work_experience": "Engineer at Acme"},
+    "embedder breaks": {"name": "Ann Poe", "skills": ["boom"]},
+    "john": {"name": "John Smith", "skills": ["Docker"]},
+}
+
+
+class FakeEmbedder:
+    """Scores every text as technical, failing on "boom"."""
+
+    prototype_names = ["technical"]
+
+    def __init__(self):
+        self.calls = 0
+
+    def score(self, texts):
+        self.calls += 1
+        if "boom" in texts:
+            raise RuntimeError("CUDA out of memory")
+        return np.ones((len(texts), 1))
+
+
+def make_parser():
+    # Batching only needs the stages around the models, not the models
+    parser = HybridCVParser.__new__(HybridCVParser)
+    parser.gemini_client = SimpleNamespace(generate_many=lambda prompts, **options: prompts)
+    parser.gemini_request_options = {}
+    parser._build_gemini_prompt = lambda cv_text: (cv_text, {})
+    parser._read_gemini_response = lambda response, compaction_stats: (dict(PARSES[response]), {})
+    parser.verify_many = lambda data, cv_texts, batch_size=16: data
+    parser._apply_bert_scores = lambda data, candidates, scores: data
+    parser._post_process_data = lambda data, **metadata: {"name": data["name"], "metadata": {}}
+    parser._embedder = FakeEmbedder()
+    return parser
+
+
+def test_failing_cvs_do_not_abort_the_batch():
+    parser = make_parser()
+
+    results = parser.parse_batch(list(PARSES))
+
+    assert [result["name"] for result in results if isinstance(result, dict)] == ["Jane Doe", "John Smith"]
+    assert isinstance(results[1], RuntimeError) and isinstance(results[2], RuntimeError)
+    assert "CUDA out of memory" in str(results[2])
+    # One batched call, then one per CV after it failed
+    assert parser._embedder.calls == 4
+
+
+def test_chunk_that_fails_to_parse_is_reported_per_file():
+    def parse_batch(texts):
+        raise BrokenPipeError("worker process died")
+
+    ingestor = BatchIngestor(parse_batch, collection=None, chunk_size=2)
+    files = [(name, name.encode()) for name in ("first.txt", "second.txt", "third.txt")]
+
+    report = ingestor.ingest(files, "job-1")
+
+    assert report["processed"] == 3 and report["failed"] == 3
+    assert [error["file"] for error in report["errors"]] == ["first.txt", "second.txt", "third.txt"]
+    assert all("worker process died" in error["error"] for error in report["errors"])
+
+
+def test_files_go_through_the_injected_extractor():
+    extracted = []
+
+    def extract_text(contents, file_extension):
+        extracted.append(file_extension)
+        if contents == b"crash":
+            raise RuntimeError("worker process died")
+        return contents.decode()
+
+    ingestor = BatchIngestor(lambda texts: [RuntimeError(f"not parsed: {text}") for text in texts],
+                             collection=None, extract_text=extract_text)
+
+    report = ingestor.ingest([("cv.pdf", b"Jane Doe"), ("broken.docx", b"crash")], "job-1")
+
+    assert extracted == [".pdf", ".docx"]
+    assert [error["error"] for error in report["errors"]] == ["worker process died", "not parsed: Jane Doe"]
@@ -0,0 +1,40 @@
+import os
+import sys
+
+# Add resume_parser directory to sys.path to ensure module imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import parse_cache
+from parse_cache import ParseResultCache
+
+
+def test_oldest_entries_are_evicted_beyond_max_entries(tmp_path):
+    cache = ParseResultCache(str(tmp_path), "1.0", max_entries=2)
+    for name in ("first", "second", "third"):
+        cache.put({"name": name}, file_hash=name)
+
+    assert cache.get(file_hash="first") is None
+    assert cache.get(file_hash="third")["name"] == "third"
+    assert cache.stats()["entries"] == 2
+
+
+def test_expired_entries_are_neither_returned_nor_kept(tmp_path, monkeypatch):
+    now = 1_000_000.0
+    monkeypatch.setattr(parse_cache.time, "time", lambda: now)
+    cache = ParseResultCache(str(tmp_path), "1.0", ttl_seconds=60)
+    cache.put({"name": "Jane Doe"}, file_hash="old", text_hash="old")
+    assert cache.get(file_hash="old")["name"] == "Jane Doe"
+
+    now += 61
+    assert cache.get(file_hash="old") is None
+    cache.put({"name": "John Roe"}, file_hash="new")
+    assert cache.stats()["entries"] == 1
+
+
+def test_cache_without_limits_keeps_every_entry(tmp_path):
+    cache = ParseResultCache(str(tmp_path), "1.0")
+    for name in ("first", "second", "third"):
+        cache.put({"name": name}, file_hash=name)
+
+    assert cache.get(file_hash="first")["name"] == "first"
+    assert cache.stats()["entries"] == 3
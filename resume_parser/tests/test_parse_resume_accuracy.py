@@ -0,0 +1,142 @@
+import json
+import os
+import re
+import sys
+from collections import defaultdict
+
+import pytest
+
+# Add resume_parser directory to sys.path to ensure module imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from main import ImprovedResumeParser, ResumeParserError
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+
+def load_fixtures(name):
+    with open(os.path.join(DATA_DIR, name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+# Labelled CVs the rules were written and tuned against: chronological, dates
+# first, sidebar, academic, form, column and company-first layouts, glued PDF
+# text, and the synthetic benchmark CVs as typed and as extracted from PDF
+FIXTURES = load_fixtures("parse_resume_fixtures.json")
+# Labelled CVs written after the rules and never used to tune them, from other
+# countries and professions: titles above employers, LinkedIn exports, two
+# columns, tables with column headers. A miss here is a gap in the rules, not
+# a reason to relabel or to tune against these CVs
+HELD_OUT_FIXTURES = load_fixtures("parse_resume_holdout.json")
+
+# Minimum share of fields parsed exactly, and F1 of the skills
+MIN_ACCURACY = {
+    "name": 0.95, "email": 0.95, "phone": 0.95, "location": 0.9,
+    "education": 0.9, "work_experience": 0.9, "skills": 0.9, "languages": 0.9,
+}
+MIN_HELD_OUT_ACCURACY = {
+    "name": 0.9, "email": 0.95, "phone": 0.9, "location": 0.9,
+    "education": 0.9, "work_experience": 0.85, "skills": 0.9, "languages": 0.9,
+}
+
+
+def normalize(value):
+    return re.sub(r'\s+', ' ', str(value or '')).strip(' .,').lower()
+
+
+@pytest.fixture(scope="module")
+def parser():
+    return ImprovedResumeParser()
+
+
+def score(parser, parsed, expected):
+    """Per field the list of exact matches, or the F1 for skills."""
+    scores = {
+        "name": [normalize(parsed["name"]) == normalize(expected["name"])],
+        "email": [normalize(parsed["email"]) == normalize(expected["email"])],
+        "phone": [re.sub(r'\D', '', parsed["phone"]) == re.sub(r'\D', '', expected["phone"])],
+    }
+    if "location" in expected:
+        scores["location"] = [normalize(parsed["location"]) == normalize(expected["location"])]
+
+    for section, keys in (("education", ("degree", "institution", "dates")),
+                          ("work_experience", ("position", "company", "dates"))):
+        found, wanted = parsed[section], expected[section]
+        scores[section] = [
+            i < len(found) and i < len(wanted) and normalize(found[i][key]) == normalize(wanted[i][key])
+            for i in range(max(len(found), len(wanted))) for key in keys
+        ]
+
+    def skill_names(skills):
+        return {normalize(parser.skill_taxonomy.canonical(skill) or skill)
+                for skill in skills["technical_skills"] + skills["soft_skills"]}
+    found, wanted = skill_names(parsed["skills"]), skill_names(expected["skills"])
+    scores["skills"] = [2 * len(found & wanted) / (len(found) + len(wanted)) if found or wanted else 1.0]
+
+    # Languages by name, with or without their level: "German (native)"
+    def language_names(skills):
+        return [normalize(language).split(' ')[0] for language in skills["languages"]]
+    scores["languages"] = [language_names(parsed["skills"]) == language_names(expected["skills"])]
+    return scores
+
+
+def accuracy(parser, fixtures):
+    """Per field the share of exact matches, or the mean F1 for skills, over all fixtures."""
+    totals = defaultdict(list)
+    for fixture in fixtures:
+        for field, values in score(parser, parser.parse_resume(fixture["text"]), fixture["expected"]).items():
+            totals[field].extend(values)
+    return {field: round(sum(values) / len(values), 3) for field, values in totals.items()}
+
+
+@pytest.mark.parametrize("fixtures, minimums", [
+    (FIXTURES, MIN_ACCURACY),
+    (HELD_OUT_FIXTURES, MIN_HELD_OUT_ACCURACY),
+], ids=["tuned", "held_out"])
+def test_parse_resume_accuracy_on_labelled_fixtures(parser, fixtures, minimums):
+    measured = accuracy(parser, fixtures)
+    assert all(measured[field] >= minimum for field, minimum in minimums.items()), measured
+
+
+def test_parse_resume_returns_the_gemini_shape(parser):
+    text = (
+        "Dilan Perera\n"
+        "Galle, Sri Lanka | dilan.perera@example.com | +94 77 123 4567\n"
+        "EXPERIENCE\n"
+        "DevOps Engineer, Calcey Technologies, Colombo | Jan 2022 - Present\n"
+        "- Moved the CI pipelines to GitHub Actions\n"
+        "EDUCATION\n"
+        "BSc in Computer Science, University of Ruhuna | 2017 - 2021\n"
+        "SKILLS\n"
+        "Terraform, Kubernetes, Teamwork\n"
+    )
+    parsed = parser.parse_resume(text)
+
+    assert parsed["name"] == "Dilan Perera"
+    assert parsed["location"] == "Galle, Sri Lanka"
+    assert parsed["work_experience"] == [{
+        "position": "DevOps Engineer", "company": "Calcey Technologies", "location": "Colombo",
+        "dates": "Jan 2022 - Present", "description": ["Moved the CI pipelines to GitHub Actions"],
+    }]
+    assert parsed["education"] == [{
+        "degree": "BSc in Computer Science", "institution": "University of Ruhuna", "dates": "2017 - 2021",
+        "details": "",
+    }]
+    assert parsed["skills"] == {
+        "technical_skills": ["Terraform", "Kubernetes", "GitHub Actions"], "soft_skills": ["Teamwork"], "languages": [],
+    }
+
+
+@pytest.mark.parametrize("line, degree, institution", [
+    ("MBA, Dubai, UAE | 2015 - 2017", "MBA", ""),
+    ("MS in Nursing, Boston, MA | 2015 - 2017", "MS in Nursing", ""),
+    ("Diploma in Nursing, UCLA, Los Angeles | 2012 - 2014", "Diploma in Nursing", "UCLA, Los Angeles"),
+])
+def test_education_tells_institution_initials_from_country_codes(parser, line, degree, institution):
+    education = parser.parse_resume(f"Jane Doe\nEDUCATION\n{line}\n")["education"]
+    assert [(entry["degree"], entry["institution"]) for entry in education] == [(degree, institution)]
+
+
+def test_parse_resume_rejects_empty_text(parser):
+    with pytest.raises(ResumeParserError):
+        parser.parse_resume("")
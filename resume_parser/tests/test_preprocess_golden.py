@@ -0,0 +1,37 @@
+import json
+import os
+import sys
+
+import pytest
+
+# Add resume_parser directory to sys.path to ensure module imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from main import ImprovedResumeParser
+
+# Inputs and the output _preprocess_text gave for them before it was rewritten:
+# the sample CV, synthetic CVs as typed and as extracted from PDF and DOCX,
+# hand-written edge cases and random mixes of headers, dates and punctuation.
+# expected_lines is the output with line breaks kept, which the layout parser reads
+GOLDEN_PATH = os.path.join(os.path.dirname(__file__), "data", "preprocess_golden.json")
+
+with open(GOLDEN_PATH, encoding="utf-8") as f:
+    GOLDEN = json.load(f)
+
+
+@pytest.fixture(scope="module")
+def parser():
+    # Preprocessing only needs the section tables, not the spaCy model
+    parser = ImprovedResumeParser.__new__(ImprovedResumeParser)
+    parser._initialize_section_headers()
+    return parser
+
+
+@pytest.mark.parametrize("case", GOLDEN, ids=[case["name"] for case in GOLDEN])
+def test_preprocess_text_matches_golden_output(parser, case):
+    assert parser._preprocess_text(case["input"]) == case["expected"]
+
+
+@pytest.mark.parametrize("case", GOLDEN, ids=[case["name"] for case in GOLDEN])
+def test_preprocess_text_keeping_lines_matches_golden_output(parser, case):
+    assert parser._preprocess_text(case["input"], keep_lines=True) == case["expected_lines"]
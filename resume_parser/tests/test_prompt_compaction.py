@@ -0,0 +1,30 @@
+import os
+import sys
+
+# Add resume_parser directory to sys.path to ensure module imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prompt_compaction import compact_cv_text
+
+
+def three_pages(header, footer=None):
+    pages = []
+    for page in range(1, 4):
+        body = [f"- Delivered feature {page}.{i} for the payments team" for i in range(20)]
+        pages.append("\n".join([header] + body + ([footer.format(page=page)] if footer else [])))
+    return "\n".join(pages)
+
+
+def test_contact_header_repeated_on_every_page_is_kept_once():
+    header = "Jane Doe | jane@x.com | +94 77 123 4567"
+    compacted, _ = compact_cv_text(three_pages(header), max_tokens=10_000)
+
+    assert compacted.count(header) == 1
+    assert compacted.startswith(header)
+
+
+def test_page_footers_are_dropped():
+    compacted, _ = compact_cv_text(three_pages("Jane Doe", footer="Page {page} of 3"), max_tokens=10_000)
+
+    assert "Page" not in compacted
+    assert compacted.count("Jane Doe") == 1
@@ -0,0 +1,115 @@
+import os
+import sys
+
+import pytest
+
+# Add resume_parser directory to sys.path to ensure module imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from main import ImprovedResumeParser
+from skill_taxonomy import SkillTaxonomy
+
+SKILLS = [
+    {"name": "React", "category": "technical", "aliases": ["reactjs", "react.js"]},
+    {"name": "React Native", "category": "technical"},
+    {"name": "Node.js", "category": "technical", "aliases": ["nodejs", "node js"]},
+    {"name": "Power BI", "category": "technical", "aliases": ["powerbi"]},
+    {"name": "C++", "category": "technical", "aliases": ["cpp"]},
+    {"name": "C#", "category": "technical"},
+    {"name": "C", "category": "technical", "aliases": ["ANSI C", "C programming"], "match_name": False},
+    {"name": "Go", "category": "technical", "aliases": ["golang"], "case_sensitive": True},
+    {"name": "AWS Lambda", "category": "technical", "case_sensitive_aliases": ["Lambda"]},
+    {"name": "Problem Solving", "category": "soft", "aliases": ["problem-solving"]},
+]
+
+
+@pytest.fixture(scope="module")
+def taxonomy():
+    return SkillTaxonomy(SKILLS)
+
+
+def test_extract_prefers_longest_match(taxonomy):
+    text = "Built apps in React Native and React; dashboards in Power  BI."
+    assert taxonomy.extract(text) == ["React Native", "React", "Power BI"]
+
+
+def test_extract_resolves_aliases_in_order_of_first_mention(taxonomy):
+    text = "APIs with Nodejs, cpp and ReactJS. Also node js and C# tooling, strong problem-solving."
+    assert taxonomy.extract(text) == ["Node.js", "C++", "React", "C#", "Problem Solving"]
+
+
+def test_extract_respects_case_sensitive_forms(taxonomy):
+    assert taxonomy.extract("Services in Go and golang; AWS Lambda and Lambda") == ["Go", "AWS Lambda"]
+    assert taxonomy.extract("ready to go, lambda calculus, grade C") == []
+    assert taxonomy.extract("Firmware in ANSI C") == ["C"]
+
+
+def test_extract_does_not_match_across_sentences_or_inside_words(taxonomy):
+    assert taxonomy.extract("I used React. Native speaker of Sinhala.") == ["React"]
+    assert taxonomy.extract("Reactive systems, Gopher, Nodejsx") == []
+
+
+def test_extract_does_not_match_across_list_separators_or_lines(taxonomy):
+    assert taxonomy.extract("React, Native bridges") == ["React"]
+    assert taxonomy.extract("Power; BI (Node\njs)") == []
+    assert taxonomy.extract("React:\nNative | Node js") == ["React", "Node.js"]
+
+
+def test_canonical_and_category_need_the_whole_name(taxonomy):
+    assert taxonomy.canonical("Nodejs") == "Node.js"
+    assert taxonomy.canonical("react native") == "React Native"
+    assert taxonomy.canonical("react, native") is None
+    assert taxonomy.canonical("React Native apps") is None
+    assert taxonomy.category("problem-solving") == "soft"
+    assert taxonomy.category("Haskell") is None
+
+
+@pytest.mark.parametrize("skills", [
+    [{"category": "technical"}],
+    [{"name": "React"}, {"name": "React"}],
+    [{"name": "Go", "aliases": ["golang"]}, {"name": "Golang", "aliases": ["GOLANG"]}],
+    [{"name": "Node.js", "aliases": ["()"]}],
+])
+def test_malformed_taxonomy_is_rejected(skills):
+    with pytest.raises(ValueError):
+        SkillTaxonomy(skills)
+
+
+def test_bundled_taxonomy_loads():
+    taxonomy = SkillTaxonomy.from_env()
+    assert taxonomy is SkillTaxonomy.from_env()
+    assert len(taxonomy) > 500
+    assert taxonomy.canonical("Nodejs") == "Node.js"
+
+
+@pytest.mark.parametrize("text, skills", [
+    ("part time, management of stock", []),
+    ("We rest on weekends", []),
+    ("Spring 2020 intern", []),
+    ("Java in Eclipse; eclipse glasses", ["Java", "Eclipse"]),
+    ("REST and RESTful APIs, Spring Framework", ["REST", "Spring"]),
+])
+def test_bundled_taxonomy_ignores_ordinary_words(text, skills):
+    assert SkillTaxonomy.from_env().extract(text) == skills
+
+
+def test_parser_adds_taxonomy_skills_named_outside_skill_lists(taxonomy):
+    # Skill extraction only needs the taxonomy, not the spaCy model
+    parser = ImprovedResumeParser.__new__(ImprovedResumeParser)
+    parser.skill_taxonomy = taxonomy
+    sections = {"summary": ["Mobile developer shipping React Native apps."], "skills": ["C#, Problem Solving"]}
+    # Entry headers are no prose: "Go Labs" is an employer
+    work_experience = [{"position": "Developer", "company": "Go Labs", "description": ["Backed the apps by Nodejs services"]}]
+    assert parser._extract_layout_skills(sections, "", work_experience) == {
+        "technical_skills": ["C#", "React Native", "Node.js"], "soft_skills": ["Problem Solving"], "languages": [],
+    }
+
+
+def test_parser_validates_skill_list_items_outside_the_taxonomy(taxonomy):
+    parser = ImprovedResumeParser.__new__(ImprovedResumeParser)
+    parser.skill_taxonomy = taxonomy
+    sections = {"skills": ["C, Nodejs, Fortran 77, Responsibilities, www.example.com",
+                           "Able to work under pressure in a fast paced team"]}
+    assert parser._extract_layout_skills(sections, "", []) == {
+        "technical_skills": ["C", "Node.js", "Fortran 77"], "soft_skills": [], "languages": [],
+    }
@@ -0,0 +1,192 @@
+"""
+Text extraction from uploaded resume files.
+
+Kept free of FastAPI and MongoDB imports so parser worker processes can use it.
+"""
+import io
+import logging
+import mmap
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, List, Optional, Tuple, Union
+
+import PyPDF2
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = {'.pdf', '.docx', '.doc', '.txt'}
+
+# PDFs larger than this are rejected before parsing
+PDF_MAX_BYTES = int(os.getenv("PDF_MAX_BYTES", str(20 * 1024 * 1024)))
+# PDFs with more pages than this are rejected; a CV is rarely more than a few pages
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "50"))
+# In-memory uploads above this size are spooled to a temp file and memory-mapped
+PDF_SPOOL_BYTES = int(os.getenv("PDF_SPOOL_BYTES", str(1024 * 1024)))
+# Worker processes used to extract pages in parallel (1 disables parallel extraction)
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Documents with fewer pages are extracted inline; process start-up would dominate
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "8"))
+
+_pdf_executor: Optional[ProcessPoolExecutor] = None
+_pdf_executor_lock = threading.Lock()
+
+
+class TextExtractionError(ValueError):
+    """Raised when an uploaded file cannot be turned into text"""
+    pass
+
+
+def _get_pdf_executor(workers: int) -> ProcessPoolExecutor:
+    global _pdf_executor
+    with _pdf_executor_lock:
+        if _pdf_executor is None:
+            # Spawn rather than fork, the host process may already run torch threads
+            _pdf_executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pdf_executor
+
+
+def shutdown_pdf_workers() -> None:
+    """Stop the page extraction worker processes, if any were started."""
+    global _pdf_executor
+    with _pdf_executor_lock:
+        if _pdf_executor is not None:
+            _pdf_executor.shutdown(wait=False, cancel_futures=True)
+            _pdf_executor = None
+
+
+@contextmanager
+def _map_file(path: str) -> Iterator[mmap.mmap]:
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        yield mapped
+    finally:
+        mapped.close()
+
+
+@contextmanager
+def _spool(contents: bytes) -> Iterator[str]:
+    """Write contents to a temp file and yield its path, removing it afterwards."""
+    spool = tempfile.NamedTemporaryFile(prefix="cv-", suffix=".pdf", delete=False)
+    try:
+        with spool:
+            spool.write(contents)
+        yield spool.name
+    finally:
+        os.remove(spool.name)
+
+
+@contextmanager
+def _open_pdf(pdf_file: Union[bytes, str]) -> Iterator[Tuple[Union[BinaryIO, mmap.mmap], Optional[str]]]:
+    """
+    Yield a readable stream over the PDF and the path of a file holding it, if any.
+
+    Paths are memory-mapped directly. Large in-memory uploads are spooled to a
+    temp file first so the page workers can map the same file instead of each
+    receiving a copy of the bytes.
+    """
+    if isinstance(pdf_file, str):
+        with _map_file(pdf_file) as mapped:
+            yield mapped, pdf_file
+        return
+
+    if len(pdf_file) <= PDF_SPOOL_BYTES:
+        yield io.BytesIO(pdf_file), None
+        return
+
+    with _spool(pdf_file) as path, _map_file(path) as mapped:
+        yield mapped, path
+
+
+def _extract_page_range(path: str, start: int, stop: int) -> List[str]:
+    """Worker entry point: extract pages [start, stop) of the PDF at `path`."""
+    with _map_file(path) as mapped:
+        pages = PyPDF2.PdfReader(mapped).pages
+        return [pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def _extract_pages_in_parallel(path: str, page_count: int, workers: int) -> List[str]:
+    executor = _get_pdf_executor(workers)
+    # One contiguous range per worker so each process parses the xref table only once
+    step = -(-page_count // workers)
+    futures = [
+        executor.submit(_extract_page_range, path, start, min(start + step, page_count))
+        for start in range(0, page_count, step)
+    ]
+    texts = []
+    for future in futures:
+        texts.extend(future.result())
+    return texts
+
+
+# Extract text from PDF
+def extract_text_from_pdf(pdf_file: Union[bytes, str], workers: Optional[int] = None) -> str:
+    """
+    Extract the text of a PDF given as bytes or as a path on disk.
+
+    Args:
+        pdf_file: PDF contents, or the path of a PDF file
+        workers: Page extraction processes; defaults to PDF_EXTRACT_WORKERS
+
+    Raises:
+        TextExtractionError: If the PDF is too large, has too many pages or cannot be read
+    """
+    workers = PDF_EXTRACT_WORKERS if workers is None else workers
+    size = os.path.getsize(pdf_file) if isinstance(pdf_file, str) else len(pdf_file)
+    if size > PDF_MAX_BYTES:
+        raise TextExtractionError(f"PDF is larger than {PDF_MAX_BYTES} bytes")
+
+    try:
+        with _open_pdf(pdf_file) as (stream, path):
+            pdf_reader = PyPDF2.PdfReader(stream)
+            page_count = len(pdf_reader.pages)
+            if page_count > PDF_MAX_PAGES:
+                raise TextExtractionError(f"PDF has {page_count} pages, the limit is {PDF_MAX_PAGES}")
+
+            if workers > 1 and page_count >= PDF_PARALLEL_MIN_PAGES:
+                try:
+                    if path is None:
+                        with _spool(pdf_file) as path:
+                            return "".join(_extract_pages_in_parallel(path, page_count, min(workers, page_count)))
+                    return "".join(_extract_pages_in_parallel(path, page_count, min(workers, page_count)))
+                except (OSError, BrokenProcessPool) as e:
+                    # e.g. the platform refuses to start more processes; fall back to this one
+                    shutdown_pdf_workers()
+                    logger.warning(f"Parallel PDF extraction unavailable, extracting inline: {e}")
+
+            return "".join([page.extract_text() or "" for page in pdf_reader.pages])
+    except TextExtractionError:
+        raise
+    except Exception as e:
+        raise TextExtractionError(f"Error processing PDF: {str(e)}")
+
+
+def extract_text_from_word(file_content: bytes) -> str:
+    try:
+        from docx import Document
+        document = Document(io.BytesIO(file_content))
+        text = []
+        for para in document.paragraphs:
+            text.append(para.text)
+        return "\n".join(text)
+    except Exception as e:
+        raise TextExtractionError(f"Error processing Word file: {str(e)}")
+
+
+def extract_text(contents: bytes, file_extension: str, pdf_workers: Optional[int] = None) -> str:
+    # Extract text based on file type
+    if file_extension == '.pdf':
+        return extract_text_from_pdf(contents, workers=pdf_workers)
+    elif file_extension in ['.docx', '.doc']:
+        return extract_text_from_word(contents)
+    elif file_extension == '.txt':
+        return contents.decode('utf-8')
+    raise TextExtractionError(f"Unsupported file format: {file_extension}")
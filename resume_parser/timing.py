@@ -0,0 +1,21 @@
+"""
+Per-stage wall-clock timings of the parsing pipeline.
+"""
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+
+@contextmanager
+def stage_timer(timings: Dict[str, float], stage: str) -> Iterator[None]:
+    """Add the seconds spent in the block to `timings[stage]`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - start
+
+
+def to_milliseconds(timings: Dict[str, float], divisor: int = 1) -> Dict[str, float]:
+    """Timings in milliseconds, optionally shared out over `divisor` items."""
+    return {stage: round(seconds * 1000 / divisor, 2) for stage, seconds in timings.items()}